@@ -26,10 +26,72 @@ class Settings:
         self.POSTGRES_HOST = os.getenv("POSTGRES_HOST", "db")
         self.POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
 
+        # DB 커넥션 풀 설정 (동기/비동기 엔진에 각각 적용)
+        self.DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))  # 유지하는 커넥션 수
+        self.DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "3"))  # 풀이 모두 사용 중일 때 추가로 여는 커넥션 수
+        self.DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # 커넥션 대기 시간 제한 (초)
+        self.DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # 꺼낼 때 끊어진 커넥션인지 확인
+        self.DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 이 시간(초)보다 오래된 커넥션은 다시 연결 (-1이면 사용 안 함)
+
+        # 파일 저장소 설정
+        self.STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "s3")  # s3, local (단일 노드 배포/오프라인 테스트용)
+        self.LOCAL_STORAGE_DIR = os.getenv("LOCAL_STORAGE_DIR", "/data/dat-storage")  # local 저장소 디렉터리
+        self.STORAGE_IO_WORKERS = int(os.getenv("STORAGE_IO_WORKERS", "16"))  # async 핸들러의 저장소 작업 전용 스레드 풀 크기
+        self.STORAGE_MAX_CONCURRENT_READS = int(os.getenv("STORAGE_MAX_CONCURRENT_READS", "12"))  # 동시 조회 수 (다운로드 청크 읽기 포함)
+        self.STORAGE_MAX_CONCURRENT_WRITES = int(os.getenv("STORAGE_MAX_CONCURRENT_WRITES", "4"))  # 동시 업로드 수
+        self.STORAGE_READ_TIMEOUT = float(os.getenv("STORAGE_READ_TIMEOUT", "30"))  # 조회 작업 시간 제한 (초, 슬롯 대기 포함)
+        self.STORAGE_WRITE_TIMEOUT = float(os.getenv("STORAGE_WRITE_TIMEOUT", "120"))  # 업로드 작업 시간 제한 (초, 슬롯 대기 포함)
+
         # S3 관련 설정
         self.S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME", "test-bucket")
         self.AWS_REGION = os.getenv("AWS_REGION", "ap-northeast-2")
         self.LOCALSTACK_ENDPOINT = os.getenv("LOCALSTACK_ENDPOINT", "http://localstack:4566")
+        self.S3_MULTIPART_THRESHOLD = int(os.getenv("S3_MULTIPART_THRESHOLD", str(8 * 1024 * 1024)))  # 초과 시 multipart 업로드 (bytes)
+        self.S3_MULTIPART_CHUNKSIZE = int(os.getenv("S3_MULTIPART_CHUNKSIZE", str(8 * 1024 * 1024)))  # multipart 파트 크기 (bytes, 최소 5MB)
+        self.S3_MAX_CONCURRENCY = int(os.getenv("S3_MAX_CONCURRENCY", "8"))  # 파일 하나당 동시 전송 파트 수
+        self.S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32"))  # 공유 botocore 커넥션 풀 크기
+        self.S3_CONNECT_TIMEOUT = float(os.getenv("S3_CONNECT_TIMEOUT", "5"))  # botocore 연결 시간 제한 (초)
+        self.S3_READ_TIMEOUT = float(os.getenv("S3_READ_TIMEOUT", "30"))  # botocore 응답 대기 시간 제한 (초)
+        self.S3_RETRY_MAX_ATTEMPTS = int(os.getenv("S3_RETRY_MAX_ATTEMPTS", "4"))  # 일시적 오류(연결, 5xx, 스로틀링) 재시도 포함 최대 시도 수
+        self.S3_RETRY_BASE_SECONDS = float(os.getenv("S3_RETRY_BASE_SECONDS", "0.2"))  # 재시도 지연 (지수 백오프 기준값, jitter 적용)
+        self.S3_RETRY_MAX_SECONDS = float(os.getenv("S3_RETRY_MAX_SECONDS", "5"))  # 재시도 지연 최대값
+        self.S3_RETRY_DEADLINE_SECONDS = float(os.getenv("S3_RETRY_DEADLINE_SECONDS", "60"))  # 호출 하나의 재시도 기한 (초)
+        self.S3_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("S3_CIRCUIT_FAILURE_THRESHOLD", "5"))  # 연속 실패 시 서킷을 여는 기준
+        self.S3_CIRCUIT_RESET_SECONDS = float(os.getenv("S3_CIRCUIT_RESET_SECONDS", "30"))  # 서킷을 연 뒤 시험 호출까지 대기 시간 (초)
+        self.S3_UPLOAD_URL_EXPIRATION = int(os.getenv("S3_UPLOAD_URL_EXPIRATION", "900"))  # VR 클라이언트 직접 업로드용 presigned URL 만료 시간 (초)
+        self.S3_UPLOAD_MAX_SIZE = int(os.getenv("S3_UPLOAD_MAX_SIZE", str(100 * 1024 * 1024)))  # 직접 업로드 결과 파일 최대 크기 (bytes)
+        self.S3_CONTENT_ENCODING = os.getenv("S3_CONTENT_ENCODING", "gzip")  # 업로드 시 압축 방식 (gzip, zstd, identity)
+
+        # 전처리 파일 로컬 디스크 캐시 설정
+        self.FILE_CACHE_DIR = os.getenv("FILE_CACHE_DIR", "/tmp/dat-file-cache")  # 캐시 디렉터리 (uvicorn 워커 간 공유)
+        self.FILE_CACHE_MAX_SIZE = int(os.getenv("FILE_CACHE_MAX_SIZE", str(1024 * 1024 * 1024)))  # 캐시 최대 크기 (bytes, 0이면 사용 안 함)
+
+        # 진단 결과 처리 설정
+        self.RESULT_CHUNK_ROWS = int(os.getenv("RESULT_CHUNK_ROWS", "50000"))  # 스트리밍 전처리 시 한 번에 읽을 행 수
+        self.RESULT_SPOOL_MAX_SIZE = int(os.getenv("RESULT_SPOOL_MAX_SIZE", str(8 * 1024 * 1024)))  # 초과 시 임시 파일로 전환 (bytes)
+        self.RESULT_PROCESS_WORKERS = int(os.getenv("RESULT_PROCESS_WORKERS", "2"))  # 전처리 프로세스 풀 크기 (0이면 스레드 풀 사용)
+        self.IO_THREAD_WORKERS = int(os.getenv("IO_THREAD_WORKERS", "8"))  # S3/DB 작업 스레드 풀 크기
+
+        # 진단 결과 처리 작업 큐 설정
+        self.INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "2"))  # 워커 프로세스당 동시 처리 작업 수
+        self.INGESTION_MAX_ATTEMPTS = int(os.getenv("INGESTION_MAX_ATTEMPTS", "5"))  # 초과 시 dead-letter 처리
+        self.INGESTION_RETRY_BASE_SECONDS = float(os.getenv("INGESTION_RETRY_BASE_SECONDS", "5"))  # 재시도 지연 (지수 백오프 기준값)
+        self.INGESTION_RETRY_MAX_SECONDS = float(os.getenv("INGESTION_RETRY_MAX_SECONDS", "300"))  # 재시도 지연 최대값
+        self.INGESTION_POLL_INTERVAL = float(os.getenv("INGESTION_POLL_INTERVAL", "1.0"))  # 대기 작업이 없을 때 폴링 간격 (초)
+        self.INGESTION_LOCK_TIMEOUT = int(os.getenv("INGESTION_LOCK_TIMEOUT", "600"))  # 처리 중 작업을 중단된 것으로 보는 시간 (초)
+        self.INGESTION_LOCK_RENEW_INTERVAL = float(os.getenv("INGESTION_LOCK_RENEW_INTERVAL", "60"))  # 처리 중 작업 잠금 갱신 간격 (초, LOCK_TIMEOUT보다 짧게)
+
+        # 진단 상태 SSE 설정
+        self.SSE_HEARTBEAT_INTERVAL = float(os.getenv("SSE_HEARTBEAT_INTERVAL", "15"))  # 프록시 연결 유지용 heartbeat 간격 (초)
+        self.SSE_RESYNC_INTERVAL = float(os.getenv("SSE_RESYNC_INTERVAL", "0"))  # 메시지 버스 유실 대비 DB 재조회 간격 (초, 기본값 0: 사용 안 함)
+
+        # 진단 만료 처리 설정
+        self.DIAGNOSIS_EXPIRY_SWEEP_INTERVAL = float(os.getenv("DIAGNOSIS_EXPIRY_SWEEP_INTERVAL", "30"))  # 만료 처리 간격 (초, 0이면 사용 안 함)
+
+        # 프로세스 간 메시지 버스 설정 (uvicorn 다중 워커 또는 ingestion 워커 실행 시 postgres/unix 사용)
+        self.MESSAGE_BUS_BACKEND = os.getenv("MESSAGE_BUS_BACKEND", "memory")  # memory, postgres, unix
+        self.MESSAGE_BUS_SOCKET_PATH = os.getenv("MESSAGE_BUS_SOCKET_PATH", "/tmp/dat-message-bus.sock")  # unix 브로커 소켓 경로
+        self.WS_PRESENCE_INTERVAL = float(os.getenv("WS_PRESENCE_INTERVAL", "10"))  # WebSocket 접속 현황 공유 간격 (초)
 
         # 토큰 및 보안
         self.ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
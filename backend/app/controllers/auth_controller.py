@@ -1,12 +1,12 @@
 from typing import Annotated
 
-from app.configs.database import get_db
+from app.configs.database import get_async_db
 from app.dtos.user_dto import UserDTO, UserLoginDTO, UserRegistrationInputDTO
 from app.schemas.auth_schema import TokenRefresh, TokenResponse, UserCreate, UserLogin, UserResponse
 from app.services.auth_service import AuthService
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 security = HTTPBearer(auto_error=False)
@@ -14,7 +14,7 @@ security = HTTPBearer(auto_error=False)
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-async def get_user_from_token(token: str = Depends(security), db: Session = Depends(get_db)) -> UserDTO:
+async def get_user_from_token(token: str = Depends(security), db: AsyncSession = Depends(get_async_db)) -> UserDTO:
     token_str = token.credentials if token else None
 
     if not token_str:
@@ -24,7 +24,7 @@ async def get_user_from_token(token: str = Depends(security), db: Session = Depe
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_dto = AuthService.get_user_from_token(db, token_str)
+    user_dto = await AuthService.get_user_from_token(db, token_str)
     if not user_dto:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -41,7 +41,7 @@ async def get_user_from_token(token: str = Depends(security), db: Session = Depe
     summary="사용자 회원가입",
     description="새로운 사용자를 등록합니다.",
 )
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """사용자 회원가입"""
     try:
         # Service로 전달할 DTO 생성
@@ -54,7 +54,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
 
         # Service의 register_user 호출 (이제 DTO를 받음)
-        created_user_dto = AuthService.register_user(db, registration_data)
+        created_user_dto = await AuthService.register_user(db, registration_data)
 
         # Service가 반환한 DTO를 사용하여 응답 생성
         return UserResponse(
@@ -77,10 +77,10 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     summary="사용자 로그인",
     description="JSON 형식으로 로그인 요청을 처리하고 Access Token을 반환합니다. Refresh Token은 HttpOnly 쿠키로 설정됩니다.",
 )
-async def login(response: Response, request: Request, user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(response: Response, request: Request, user_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """사용자 로그인"""
     login_input = UserLoginDTO(login_id=user_data.login_id, password=user_data.password)
-    user_dto = AuthService.authenticate_user(db, login_input)
+    user_dto = await AuthService.authenticate_user(db, login_input)
 
     if not user_dto:
         raise HTTPException(
@@ -92,22 +92,22 @@ async def login(response: Response, request: Request, user_data: UserLogin, db:
     client_ip = request.client.host if request.client else None
     user_agent = request.headers.get("user-agent")
 
-    tokens = AuthService.create_tokens(db, user_dto.id, client_ip, user_agent)
+    tokens = await AuthService.create_tokens(db, user_dto.id, client_ip, user_agent)
 
     return TokenResponse(access_token=tokens.access_token, refresh_token=tokens.refresh_token)
 
 
 @router.post("/logout", summary="로그아웃", description="현재 사용자의 모든 Refresh Token을 삭제하여 로그아웃 처리합니다.")
-async def logout(response: Response, current_user: Annotated[UserDTO, Depends(get_user_from_token)], db: Session = Depends(get_db)):
+async def logout(response: Response, current_user: Annotated[UserDTO, Depends(get_user_from_token)], db: AsyncSession = Depends(get_async_db)):
     """사용자 로그아웃"""
-    AuthService.logout_user(db, current_user.id)
+    await AuthService.logout_user(db, current_user.id)
     response.delete_cookie(key="refresh_token", path="/auth/refresh")
 
     return Response(status_code=status.HTTP_200_OK)
 
 
 @router.post("/refresh", response_model=TokenResponse, summary="Access Token 갱신", description="쿠키의 Refresh Token을 사용하여 새 Access Token을 발급합니다.")
-async def refresh_token(response: Response, request: Request, token_refresh: TokenRefresh, db: Session = Depends(get_db)):
+async def refresh_token(response: Response, request: Request, token_refresh: TokenRefresh, db: AsyncSession = Depends(get_async_db)):
     """Refresh Token으로 새 Access Token 발급"""
     refresh_token = token_refresh.refresh_token
     if not refresh_token:
@@ -120,7 +120,7 @@ async def refresh_token(response: Response, request: Request, token_refresh: Tok
     user_agent = request.headers.get("user-agent")
     client_ip = request.client.host if request.client else None
 
-    user_id = AuthService.verify_refresh_token(db, refresh_token, client_ip, user_agent)
+    user_id = await AuthService.verify_refresh_token(db, refresh_token, client_ip, user_agent)
     if not user_id:
         response.delete_cookie(key="refresh_token", path="/auth/refresh")
         raise HTTPException(
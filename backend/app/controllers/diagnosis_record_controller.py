@@ -1,34 +1,88 @@
 from datetime import datetime
-import io
-from typing import Annotated, List
+import re
+from typing import Annotated, List, Optional
 import urllib.parse
 
-from app.configs.database import get_db
+from app.configs.database import get_async_db
 from app.controllers.auth_controller import get_user_from_token
+from app.core.resilience import CircuitOpenError
 from app.dependency.dependency import get_diagnosis_service
+from app.dtos.diagnosis_dto import DiagnosisFileFormatDTO
 from app.dtos.user_dto import UserDTO, UserRoleDTO
 from app.schemas.diagnosis_schema import (
     DiagnosisRecordListResponse,
     DiagnosisRecordResponse,
 )
+from app.services.async_storage_service import AsyncStorageService, StorageTimeoutError
 from app.services.diagnosis_service import DiagnosisService
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from app.services.file_cache import CachedFile
+from app.services.storage_service import InvalidRangeError, ObjectStream
+from app.utils import accepts_encoding, iter_decompressed, iter_file_chunks
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 # 웹 인터페이스용 라우터 (JWT 기반 인증)
 router = APIRouter(prefix="/diagnosis/record", tags=["diagnosis_record"])
 
+# 진단 기록 목록 페이지네이션
+DEFAULT_RECORD_PAGE_SIZE = 50
+MAX_RECORD_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# 진단 파일 형식별 Content-Type
+FILE_MEDIA_TYPES = {
+    DiagnosisFileFormatDTO.CSV: "text/csv",
+    DiagnosisFileFormatDTO.PARQUET: "application/vnd.apache.parquet",
+}
+
+# 진단 파일 Range 요청 (단일 범위만 지원)
+BYTE_RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def parse_byte_range(range_header: Optional[str]) -> Optional[str]:
+    """단일 바이트 범위 Range 헤더만 S3로 전달 (다중 범위 등 지원하지 않는 형식은 무시하고 전체 파일 응답)"""
+    if not range_header:
+        return None
+    match = BYTE_RANGE_PATTERN.fullmatch(range_header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    if match.group(1) and match.group(2) and int(match.group(1)) > int(match.group(2)):
+        return None
+    return range_header.strip()
+
+
+def cached_file_response(file: CachedFile, headers: dict, media_type: str, accept_encoding: Optional[str]) -> Response:
+    """로컬 캐시 파일 응답 (압축된 파일은 클라이언트가 받을 수 있으면 그대로, 아니면 풀어서 전송)"""
+    if file.content_encoding and not accepts_encoding(accept_encoding, file.content_encoding):
+        headers["ETag"] = f"W/{file.etag}"
+        return StreamingResponse(content=iter_decompressed(iter_file_chunks(file.path), file.content_encoding), media_type=media_type, headers=headers)
+
+    # FileResponse가 Range 요청, Content-Length, Accept-Ranges를 처리 (압축된 파일은 압축된 바이트 기준)
+    headers["ETag"] = file.etag
+    if file.content_encoding:
+        headers["Content-Encoding"] = file.content_encoding
+    return FileResponse(file.path, media_type=media_type, headers=headers)
+
+
+def file_stream_response(file: ObjectStream, headers: dict, media_type: str, async_storage_service: AsyncStorageService) -> StreamingResponse:
+    """저장소 객체 스트림 응답 (압축을 풀어서 전달하는 경우 크기를 모르므로 Content-Length와 Range를 지원하지 않음)"""
+    headers["ETag"] = file.etag
+    if file.content_length is not None:
+        headers["Content-Length"] = str(file.content_length)
+        headers["Accept-Ranges"] = "bytes"
+    if file.content_encoding:
+        headers["Content-Encoding"] = file.content_encoding
+    if file.content_range:
+        headers["Content-Range"] = file.content_range
 
-# BytesIO에서 데이터를 읽어 비동기적으로 yield하는 제너레이터
-async def stream_from_bytesio(bytesio_obj: io.BytesIO):
-    chunk_size = 8192  # 적절한 청크 크기
-    # BytesIO는 동기 read를 가짐. 실제 사용 시 run_in_threadpool 고려
-    # from fastapi.concurrency import run_in_threadpool
-    while chunk := bytesio_obj.read(chunk_size):
-        # await run_in_threadpool(bytesio_obj.read, chunk_size) # 실제 사용 시
-        yield chunk
+    return StreamingResponse(
+        content=async_storage_service.iter_chunks(file),  # 청크마다 저장소 스레드 풀에서 읽음 (읽기 시간 제한 적용)
+        status_code=status.HTTP_206_PARTIAL_CONTENT if file.content_range else status.HTTP_200_OK,
+        media_type=media_type,
+        headers=headers,
+    )
 
 
 @router.get(
@@ -41,7 +95,7 @@ async def stream_from_bytesio(bytesio_obj: io.BytesIO):
 async def get_diagnosis_record_metadata(
     diagnosis_id: int,
     current_user: Annotated[UserDTO, Depends(get_user_from_token)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     service: DiagnosisService = Depends(get_diagnosis_service),
 ):
     """특정 진단 기록 메타데이터 조회"""
@@ -50,7 +104,7 @@ async def get_diagnosis_record_metadata(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="의사만 진단 기록을 조회할 수 있습니다.")
 
     # 진단 기록 메타데이터 조회
-    result = service.get_diagnosis_record_metadata(db, diagnosis_id)
+    result = await service.get_diagnosis_record_metadata(db, diagnosis_id)
     if not result:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="진단 기록을 찾을 수 없습니다.")
 
@@ -71,37 +125,54 @@ async def get_diagnosis_record_metadata(
 
 @router.get(
     "/{diagnosis_id}/file",
-    status_code=status.HTTP_302_FOUND,
+    status_code=status.HTTP_200_OK,
     summary="특정 진단 기록 파일 다운로드",
-    description="진단 ID로 특정 진단 기록의 CSV 파일을 다운로드합니다.",
+    description="진단 ID로 특정 진단 기록의 CSV 또는 Parquet 파일을 스트리밍으로 다운로드합니다. Range, Accept-Encoding(압축 전송)을 지원합니다.",
 )
 async def download_diagnosis_file(
     diagnosis_id: int,
     current_user: Annotated[UserDTO, Depends(get_user_from_token)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     service: DiagnosisService = Depends(get_diagnosis_service),
+    format: DiagnosisFileFormatDTO = Query(DiagnosisFileFormatDTO.CSV, description="파일 형식 (csv: 내보내기용, parquet: 분석용 열 기반 형식)"),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    accept_encoding: Optional[str] = Header(None, alias="Accept-Encoding"),
 ):
-    """특정 진단 기록 파일 다운로드"""
+    """특정 진단 기록 파일 다운로드
+
+    로컬 디스크 캐시에 있으면 캐시 파일을 보내고, 없으면 S3 응답 본문을 청크 단위로 그대로 전달하므로
+    파일 크기와 관계없이 다운로드당 메모리 사용량은 청크 크기 수준입니다.
+    압축 저장된 파일은 클라이언트가 해당 압축 방식을 받을 수 있으면 풀지 않고 그대로 전달합니다.
+    저장소 호출은 이벤트 루프 밖(저장소 전용 스레드 풀)에서 수행하며, 시간 제한을 넘기면 504를,
+    S3 장애로 서킷이 열려 있으면 503(Retry-After)을 반환합니다.
+    """
     # 의사 권한 확인
     if current_user.role != UserRoleDTO.DOCTOR:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="의사만 진단 기록을 다운로드할 수 있습니다.")
 
-    # 파일 데이터 조회
-    filename, file_bytes = service.get_diagnosis_file(db, diagnosis_id)
-    if not filename or not file_bytes:
+    # 파일 조회 (캐시되지 않은 파일의 Range 요청이면 S3에서도 해당 범위만 조회)
+    try:
+        filename, file = await service.get_diagnosis_file(db, diagnosis_id, parse_byte_range(range_header), accept_encoding, format)
+    except InvalidRangeError as e:
+        size = e.object_size if e.object_size is not None else "*"
+        return Response(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers={"Content-Range": f"bytes */{size}"})
+    except StorageTimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="저장소 응답 시간이 초과되었습니다.")
+    except CircuitOpenError as e:
+        headers = {"Retry-After": str(max(int(e.retry_after), 1))}
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="저장소를 일시적으로 사용할 수 없습니다.", headers=headers)
+    if not filename or not file:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="진단 파일을 찾을 수 없습니다.")
 
     # 한글 파일명을 위한 인코딩 처리
     encoded_filename = urllib.parse.quote(filename)
+    # 응답 본문이 Accept-Encoding에 따라 달라지므로 캐시가 구분하도록 Vary 지정
+    headers = {"Content-Disposition": f'attachment; filename="{encoded_filename}"', "Vary": "Accept-Encoding"}
 
-    return StreamingResponse(
-        content=stream_from_bytesio(file_bytes),  # BytesIO를 읽는 제너레이터 사용
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": f'attachment; filename="{encoded_filename}"'
-            # Content-Length: len(file_bytes)
-        },
-    )
+    media_type = FILE_MEDIA_TYPES[format]
+    if isinstance(file, CachedFile):
+        return cached_file_response(file, headers, media_type, accept_encoding)
+    return file_stream_response(file, headers, media_type, service.async_storage_service)
 
 
 @router.get(
@@ -109,23 +180,37 @@ async def download_diagnosis_file(
     response_model=List[DiagnosisRecordListResponse],
     status_code=status.HTTP_200_OK,
     summary="환자의 진단 기록 리스트 조회",
-    description="환자 ID와 기간으로 진단 기록 목록을 조회합니다.",
+    description="환자 ID와 기간으로 진단 기록 목록을 최신순으로 조회합니다. 다음 페이지 커서는 X-Next-Cursor 헤더로 반환합니다.",
 )
 async def get_patient_diagnosis_records(
     patient_id: int,
     start_date: datetime,
     end_date: datetime,
+    response: Response,
     current_user: Annotated[UserDTO, Depends(get_user_from_token)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     service: DiagnosisService = Depends(get_diagnosis_service),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_RECORD_PAGE_SIZE, description="페이지 크기 (limit, cursor 모두 없으면 전체 조회)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
 ):
-    """환자의 진단 기록 리스트 조회"""
+    """환자의 진단 기록 리스트 조회
+
+    limit이나 cursor가 주어지면 최신순으로 limit개씩(기본 DEFAULT_RECORD_PAGE_SIZE) 조회하고,
+    다음 페이지가 있으면 `X-Next-Cursor` 헤더로 커서를 반환합니다. 둘 다 없으면 기존처럼 전체 목록을 반환합니다.
+    """
     # 의사 권한 확인
     if current_user.role != UserRoleDTO.DOCTOR:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="의사만 진단 기록을 조회할 수 있습니다.")
 
     # 진단 기록 목록 조회
-    records = service.get_patient_diagnosis_records(db, patient_id, start_date, end_date)
+    if cursor and limit is None:
+        limit = DEFAULT_RECORD_PAGE_SIZE
+    try:
+        records, next_cursor = await service.get_patient_diagnosis_records(db, patient_id, start_date, end_date, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 커서입니다.")
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
     # 결과 변환
     response_list = []
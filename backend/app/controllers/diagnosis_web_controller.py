@@ -3,8 +3,10 @@ from datetime import timedelta
 import json
 from typing import Annotated
 
-from app.configs.database import get_db
+from app.configs.database import get_async_db, get_async_session_factory
+from app.configs.env_configs import settings
 from app.controllers.auth_controller import get_user_from_token
+from app.core.diagnosis_state_broker import DiagnosisStateEvent
 from app.core.ws_connection_manager import manager
 from app.dependency.dependency import get_diagnosis_service
 from app.dtos.diagnosis_dto import DiagnosisDTO, DiagnosisStateDTO
@@ -21,11 +23,10 @@ from app.services.doctor_service import DoctorService
 from app.utils import get_datetime_now
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import Response, StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 
 # TODO: 상수 별도 파일로 분리
-MONITOR_INTERVAL = 5  # 상태 조회 간격 (초)
 SESSION_DURATION = 30 * 60  # 세션 지속 시간 (초)
 
 # 웹 인터페이스용 라우터 (JWT 기반 인증)
@@ -42,7 +43,7 @@ router = APIRouter(prefix="/diagnosis", tags=["diagnosis_web"])
 async def start_diagnosis(
     diagnosis_data: DiagnosisCreate,
     current_user: Annotated[UserDTO, Depends(get_user_from_token)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     service: DiagnosisService = Depends(get_diagnosis_service),
 ):
     """진단 시작"""
@@ -51,20 +52,20 @@ async def start_diagnosis(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="의사만 진단을 시작할 수 있습니다.")
 
     # 현재 사용자의 의사 정보 조회
-    doctor = DoctorService.get_doctor_by_user_id(db, current_user.id)
+    doctor = await DoctorService.get_doctor_by_user_id(db, current_user.id)
     if not doctor:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="의사 정보를 찾을 수 없습니다.")
 
     # 환자가 로그인 상태인지 확인
-    if diagnosis_data.patient_id not in manager.active_connections:
+    if not manager.is_connected(diagnosis_data.patient_id):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="환자가 로그인 상태가 아닙니다.")
 
     # 진행중인 진단 세션이 있는지 확인
-    diagnosis = service.get_live_diagnosis_by_doctor_id(db, doctor.id)
+    diagnosis = await service.get_live_diagnosis_by_doctor_id(db, doctor.id)
     if diagnosis:
         raise HTTPException(status_code=400, detail="진행중인 진단 세션이 있습니다")
 
-    new_diagnosis: DiagnosisDTO = service.start_diagnosis(
+    new_diagnosis: DiagnosisDTO = await service.start_diagnosis(
         db,
         doctor_id=doctor.id,
         patient_id=diagnosis_data.patient_id,
@@ -98,7 +99,7 @@ async def start_diagnosis(
 )
 async def get_live_diagnosis(
     current_user: Annotated[UserDTO, Depends(get_user_from_token)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     service: DiagnosisService = Depends(get_diagnosis_service),
 ):
     """진행중인 진단 세션 확인"""
@@ -107,12 +108,12 @@ async def get_live_diagnosis(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="의사만 진단 세션을 확인할 수 있습니다.")
 
     # 현재 사용자의 의사 정보 조회
-    doctor = DoctorService.get_doctor_by_user_id(db, current_user.id)
+    doctor = await DoctorService.get_doctor_by_user_id(db, current_user.id)
     if not doctor:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="의사 정보를 찾을 수 없습니다.")
 
     # 진행중인 진단 세션 반환
-    diagnosis = service.get_live_diagnosis_by_doctor_id(db, doctor.id)
+    diagnosis = await service.get_live_diagnosis_by_doctor_id(db, doctor.id)
     if not diagnosis:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="진행중인 진단 세션을 찾을 수 없습니다.")
     return DiagnosisLiveResponse(
@@ -131,7 +132,7 @@ async def get_live_diagnosis(
 async def cancel_diagnosis(
     diagnosis_id: int,
     current_user: Annotated[UserDTO, Depends(get_user_from_token)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     service: DiagnosisService = Depends(get_diagnosis_service),
 ):
     """진단 취소"""
@@ -140,12 +141,12 @@ async def cancel_diagnosis(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="의사만 진단을 취소할 수 있습니다.")
 
     # 현재 사용자의 의사 정보 조회
-    doctor = DoctorService.get_doctor_by_user_id(db, current_user.id)
+    doctor = await DoctorService.get_doctor_by_user_id(db, current_user.id)
     if not doctor:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="의사 정보를 찾을 수 없습니다.")
 
     # 진단 정보 조회
-    diagnosis_dto = service.get_diagnosis_by_id(db, diagnosis_id)
+    diagnosis_dto = await service.get_diagnosis_by_id_async(db, diagnosis_id)
     if not diagnosis_dto:
         raise HTTPException(status_code=404, detail="진단을 찾을 수 없습니다")
 
@@ -155,7 +156,9 @@ async def cancel_diagnosis(
     if diagnosis_dto.state in [DiagnosisStateDTO.COMPLETED, DiagnosisStateDTO.FAILED, DiagnosisStateDTO.CANCELLED, DiagnosisStateDTO.EXPIRED]:
         raise HTTPException(status_code=400, detail="이미 완료된 진단입니다.")
 
-    service.update_diagnosis_state(db, diagnosis_id, DiagnosisStateDTO.CANCELLED)
+    # 조회 이후 다른 요청에서 종료된 경우 상태 전환이 거부됨
+    if not await service.update_diagnosis_state_async(db, diagnosis_id, DiagnosisStateDTO.CANCELLED):
+        raise HTTPException(status_code=400, detail="이미 완료된 진단입니다.")
 
     # WebSocket을 통해 VR 클라이언트에 진단 종료(취소) 알림
     message = WebSocketMessage(action=WebSocketMessageAction.S_STOP_DIAGNOSIS)
@@ -173,7 +176,8 @@ async def cancel_diagnosis(
 async def get_diagnosis_status(  # noqa: C901
     diagnosis_id: int,
     current_user: Annotated[UserDTO, Depends(get_user_from_token)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    session_factory: async_sessionmaker = Depends(get_async_session_factory),
     service: DiagnosisService = Depends(get_diagnosis_service),
 ):
     """진단 상태 변화를 SSE로 전송"""
@@ -183,46 +187,82 @@ async def get_diagnosis_status(  # noqa: C901
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="의사만 진단 상태를 확인할 수 있습니다.")
 
     # 현재 사용자의 의사 정보 조회
-    doctor = DoctorService.get_doctor_by_user_id(db, current_user.id)
+    doctor = await DoctorService.get_doctor_by_user_id(db, current_user.id)
     if not doctor:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="의사 정보를 찾을 수 없습니다.")
 
     # 진단 정보 조회
-    diagnosis_dto = service.get_diagnosis_by_id(db, diagnosis_id)
+    diagnosis_dto = await service.get_diagnosis_by_id_async(db, diagnosis_id)
     if not diagnosis_dto:
         raise HTTPException(status_code=404, detail="진단을 찾을 수 없습니다")
 
     if diagnosis_dto.doctor_id != doctor.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="해당 진단에 대한 권한이 없습니다.")
 
-    async def event_generator():
-        try:
-            while True:
-                # 최신 진단 상태 조회
-                diagnosis_dto = service.get_diagnosis_by_id(db, diagnosis_id)
-                if not diagnosis_dto:
+    async def event_generator():  # noqa: C901
+        loop = asyncio.get_running_loop()
+        terminal_states = [DiagnosisStateDTO.COMPLETED, DiagnosisStateDTO.FAILED, DiagnosisStateDTO.CANCELLED, DiagnosisStateDTO.EXPIRED]
+
+        # 구독 후에 현재 상태를 조회해야 그 사이의 상태 변경을 놓치지 않음
+        with service.state_broker.subscribe(diagnosis_id) as subscription:
+            try:
+                # 대기하는 동안 DB 커넥션을 점유하지 않도록 조회마다 세션을 열고 바로 반환
+                async with session_factory() as session:
+                    current = await service.get_diagnosis_by_id_async(session, diagnosis_id)
+                if not current:
                     yield f"data: {json.dumps({'error': '진단을 찾을 수 없습니다'})}\n\n"
-                    break
-
-                # 세션 만료 체크
-                if diagnosis_dto.expired_at < get_datetime_now():
-                    diagnosis_dto.state = service.update_diagnosis_state(db, diagnosis_id, DiagnosisStateDTO.EXPIRED)
-
-                # 상태 전송
-                state_data = {
-                    "id": diagnosis_dto.id,
-                    "state": diagnosis_dto.state.value,
-                    "timestamp": diagnosis_dto.updated_at.isoformat(),
-                }
-                yield f"data: {json.dumps(state_data)}\n\n"
-
-                # 종료 조건 확인
-                if diagnosis_dto.state in [DiagnosisStateDTO.COMPLETED, DiagnosisStateDTO.FAILED, DiagnosisStateDTO.CANCELLED, DiagnosisStateDTO.EXPIRED]:
-                    break
-
-                await asyncio.sleep(MONITOR_INTERVAL)
-        except asyncio.CancelledError:
-            pass
+                    return
+
+                expired_at = current.expired_at
+                event = DiagnosisStateEvent(id=current.id, state=DiagnosisStateDTO(current.state.value), timestamp=current.updated_at)
+                resync_at = loop.time() + settings.SSE_RESYNC_INTERVAL
+
+                while True:
+                    # 상태 전송
+                    yield f"data: {json.dumps(event.to_dict())}\n\n"
+
+                    # 종료 조건 확인
+                    if event.state in terminal_states:
+                        break
+
+                    # 다음 상태 변경 대기 (세션 만료, heartbeat, 재조회 시각 중 가장 빠른 시각까지)
+                    next_event = None
+                    while next_event is None:
+                        timeout = min(settings.SSE_HEARTBEAT_INTERVAL, max((expired_at - get_datetime_now()).total_seconds(), 0))
+                        if settings.SSE_RESYNC_INTERVAL > 0:
+                            timeout = min(timeout, max(resync_at - loop.time(), 0))
+
+                        next_event = await subscription.get(timeout)
+                        if next_event:
+                            break
+
+                        if expired_at <= get_datetime_now():
+                            # 세션 만료 (변경된 상태는 브로커를 통해 다음 이벤트로 수신)
+                            async with session_factory() as session:
+                                updated_state = await service.update_diagnosis_state_async(session, diagnosis_id, DiagnosisStateDTO.EXPIRED)
+                                if not updated_state:
+                                    # 다른 프로세스에서 먼저 전환된 경우 (만료 처리 작업, 완료/취소) 실제 상태를 전송
+                                    current = await service.get_diagnosis_by_id_async(session, diagnosis_id)
+                            if not updated_state:
+                                if not current:
+                                    yield f"data: {json.dumps({'error': '진단을 찾을 수 없습니다'})}\n\n"
+                                    return
+                                expired_at = current.expired_at
+                                if current.state != event.state:
+                                    next_event = DiagnosisStateEvent(id=current.id, state=DiagnosisStateDTO(current.state.value), timestamp=current.updated_at)
+                        elif settings.SSE_RESYNC_INTERVAL > 0 and loop.time() >= resync_at:
+                            # 안전장치: 메시지 버스로 전달되지 못한 상태 변경 반영 (postgres 버스 재연결 중 유실 등, 기본값은 사용 안 함)
+                            async with session_factory() as session:
+                                current = await service.get_diagnosis_by_id_async(session, diagnosis_id)
+                            resync_at = loop.time() + settings.SSE_RESYNC_INTERVAL
+                            if current and current.state != event.state:
+                                next_event = DiagnosisStateEvent(id=current.id, state=DiagnosisStateDTO(current.state.value), timestamp=current.updated_at)
+                        else:
+                            yield ": heartbeat\n\n"
+
+                    event = next_event
+            except asyncio.CancelledError:
+                pass
 
     return StreamingResponse(
         event_generator(),
@@ -1,24 +1,30 @@
 import io
-from typing import Annotated
+from typing import Optional
 
-from app.configs.database import get_db
+from app.configs.database import get_session_factory, session_scope
+from app.configs.env_configs import settings
 from app.core.ws_connection_manager import manager
 from app.dependency.dependency import get_diagnosis_service, get_patient_service
-from app.dtos.diagnosis_dto import DiagnosisStateDTO
+from app.dtos.diagnosis_dto import DiagnosisDTO, DiagnosisStateDTO
 from app.schemas.ws_schema import (
     ClientDiagnosisFailedData,
     ClientDiagnosisStartedData,
+    RequestUploadUrlData,
+    ResultUploadedData,
     UploadResultData,
+    UploadUrlData,
     WebSocketMessage,
     WebSocketMessageAction,
 )
+from app.services.async_storage_service import StorageTimeoutError
 from app.services.diagnosis_service import DiagnosisService
 from app.services.patient_service import PatientService
+from app.services.s3_service import PRESIGNED_UPLOAD_CONTENT_TYPE
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
 from fastapi.datastructures import UploadFile
 from loguru import logger
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 
 
 router = APIRouter(prefix="/ws", tags=["WebSocket"])
@@ -27,56 +33,165 @@ router = APIRouter(prefix="/ws", tags=["WebSocket"])
 MAX_FILE_SIZE_BYTES = 10 * 1024 * 1024  # 10MB
 
 
-def _handle_diagnosis_started(db: Session, message: WebSocketMessage, diagnosis_service: DiagnosisService):
+async def _handle_diagnosis_started(db: Session, message: WebSocketMessage, diagnosis_service: DiagnosisService):
     """C_DIAGNOSIS_STARTED 액션을 처리합니다."""
     start_data = ClientDiagnosisStartedData.model_validate(message.data)
-    diagnosis_service.update_diagnosis_state(db, start_data.diagnosis_id, DiagnosisStateDTO.STARTED)
+    await diagnosis_service.task_executor.run_io(diagnosis_service.update_diagnosis_state, db, start_data.diagnosis_id, DiagnosisStateDTO.STARTED)
     logger.info(f"Updated diagnosis {start_data.diagnosis_id} to STARTED")
 
 
-def _handle_diagnosis_failed(db: Session, message: WebSocketMessage, diagnosis_service: DiagnosisService):
+async def _handle_diagnosis_failed(db: Session, message: WebSocketMessage, diagnosis_service: DiagnosisService):
     """C_DIAGNOSIS_FAILED 액션을 처리합니다."""
     fail_data = ClientDiagnosisFailedData.model_validate(message.data)
-    diagnosis_service.update_diagnosis_state(db, fail_data.diagnosis_id, DiagnosisStateDTO.FAILED)
+    await diagnosis_service.task_executor.run_io(diagnosis_service.update_diagnosis_state, db, fail_data.diagnosis_id, DiagnosisStateDTO.FAILED)
     logger.info(f"Updated diagnosis {fail_data.diagnosis_id} to FAILED")
 
 
-def _handle_upload_result(
+def _get_patient_by_code(session_factory: sessionmaker, patient_service: PatientService, patient_code: str):
+    """접속한 헤드셋의 환자 조회 (스레드 풀에서 실행, 조회 후 바로 커넥션 반환)"""
+    with session_scope(session_factory) as db:
+        return patient_service.get_patient_by_code(db, patient_code)
+
+
+async def _get_patient_diagnosis(db: Session, diagnosis_service: DiagnosisService, diagnosis_id: int, patient_id: int) -> Optional[DiagnosisDTO]:
+    """접속한 환자의 진단인지 확인합니다.
+
+    뒤따르는 S3 업로드/확인 동안 커넥션을 점유하지 않도록 조회 트랜잭션을 끝내 커넥션을 풀에 반환합니다.
+    """
+    diagnosis_dto = await diagnosis_service.task_executor.run_io(diagnosis_service.get_diagnosis_by_id, db, diagnosis_id)
+    await diagnosis_service.task_executor.run_io(db.commit)
+    if not diagnosis_dto:
+        logger.error(f"Diagnosis not found: {diagnosis_id}")
+        return None
+    if diagnosis_dto.patient_id != patient_id:
+        logger.warning(f"Patient ID mismatch: {patient_id} vs {diagnosis_dto.patient_id}")
+        return None
+    return diagnosis_dto
+
+
+async def _handle_upload_result(
     db: Session,
     message: WebSocketMessage,
     diagnosis_service: DiagnosisService,
     patient_id: int,
 ):
-    """C_UPLOAD_RESULT 액션을 처리합니다."""
+    """C_UPLOAD_RESULT 액션을 처리합니다.
+
+    원본을 S3에 저장하고 처리 작업을 큐에 등록합니다. 전처리와 COMPLETED 전환은 ingestion 워커가 수행합니다.
+    """
     upload_data = UploadResultData.model_validate(message.data)
 
-    diagnosis_dto = diagnosis_service.get_diagnosis_by_id(db, upload_data.diagnosis_id)
+    diagnosis_dto = await _get_patient_diagnosis(db, diagnosis_service, upload_data.diagnosis_id, patient_id)
     if not diagnosis_dto:
-        logger.error(f"Diagnosis not found: {upload_data.diagnosis_id}")
-        return
-    if diagnosis_dto.patient_id != patient_id:
-        logger.warning(f"Patient ID mismatch: {patient_id} vs {diagnosis_dto.patient_id}")
         return
 
     file_content_bytes = upload_data.file_content.encode("utf-8")
 
     if len(file_content_bytes) > MAX_FILE_SIZE_BYTES:
         logger.error(f"Uploaded file for diagnosis {upload_data.diagnosis_id} exceeds size limit of {MAX_FILE_SIZE_BYTES / (1024 * 1024)}MB.")
-        diagnosis_service.update_diagnosis_state(db, upload_data.diagnosis_id, DiagnosisStateDTO.FAILED)
+        await diagnosis_service.task_executor.run_io(diagnosis_service.update_diagnosis_state, db, upload_data.diagnosis_id, DiagnosisStateDTO.FAILED)
         return
 
     file_object = io.BytesIO(file_content_bytes)
     temp_upload_file = UploadFile(file=file_object, filename=f"temp_result_{upload_data.diagnosis_id}.csv")
 
-    diagnosis_service.upload_diagnosis_result(
-        db,
-        diagnosis_dto.id,
-        diagnosis_dto.type,
-        diagnosis_dto.level,
-        temp_upload_file,
+    job = await diagnosis_service.enqueue_diagnosis_result(db, diagnosis_dto.id, diagnosis_dto.type, diagnosis_dto.level, temp_upload_file)
+    if not job:
+        await diagnosis_service.task_executor.run_io(diagnosis_service.update_diagnosis_state, db, diagnosis_dto.id, DiagnosisStateDTO.FAILED)
+        return
+    logger.info(f"Enqueued result processing job {job.id} for diagnosis_id: {diagnosis_dto.id}")
+
+
+async def _handle_request_upload_url(
+    db: Session,
+    message: WebSocketMessage,
+    diagnosis_service: DiagnosisService,
+    patient_id: int,
+    websocket: WebSocket,
+):
+    """C_REQUEST_UPLOAD_URL 액션을 처리합니다.
+
+    결과 원본을 S3에 직접 업로드할 presigned PUT URL을 S_UPLOAD_URL로 응답합니다.
+    클라이언트는 업로드 후 C_RESULT_UPLOADED로 키와 ETag를 알려야 합니다.
+    """
+    request_data = RequestUploadUrlData.model_validate(message.data)
+
+    diagnosis_dto = await _get_patient_diagnosis(db, diagnosis_service, request_data.diagnosis_id, patient_id)
+    if not diagnosis_dto:
+        return
+
+    try:
+        upload_url = await diagnosis_service.create_result_upload_url(diagnosis_dto.id, diagnosis_dto.type, diagnosis_dto.level)
+    except StorageTimeoutError:
+        upload_url = None
+    if not upload_url:
+        logger.error(f"Failed to create upload URL for diagnosis_id: {diagnosis_dto.id}")
+        return
+
+    key, url = upload_url
+    response = WebSocketMessage(
+        action=WebSocketMessageAction.S_UPLOAD_URL,
+        data=UploadUrlData(
+            diagnosis_id=diagnosis_dto.id,
+            key=key,
+            url=url,
+            headers={"Content-Type": PRESIGNED_UPLOAD_CONTENT_TYPE},
+            expires_in=settings.S3_UPLOAD_URL_EXPIRATION,
+        ).model_dump(),
     )
-    diagnosis_service.update_diagnosis_state(db, diagnosis_dto.id, DiagnosisStateDTO.COMPLETED)
-    logger.info(f"Successfully processed result for diagnosis_id: {diagnosis_dto.id}")
+    await websocket.send_json(response.model_dump())
+
+
+async def _handle_result_uploaded(
+    db: Session,
+    message: WebSocketMessage,
+    diagnosis_service: DiagnosisService,
+    patient_id: int,
+):
+    """C_RESULT_UPLOADED 액션을 처리합니다.
+
+    S3에 직접 업로드된 원본을 확인하고 처리 작업을 큐에 등록합니다. ingestion 워커는 S3에서 원본을 읽습니다.
+    """
+    uploaded_data = ResultUploadedData.model_validate(message.data)
+
+    diagnosis_dto = await _get_patient_diagnosis(db, diagnosis_service, uploaded_data.diagnosis_id, patient_id)
+    if not diagnosis_dto:
+        return
+
+    job = await diagnosis_service.enqueue_uploaded_diagnosis_result(db, diagnosis_dto.id, uploaded_data.key, uploaded_data.etag)
+    if not job:
+        await diagnosis_service.task_executor.run_io(diagnosis_service.update_diagnosis_state, db, diagnosis_dto.id, DiagnosisStateDTO.FAILED)
+        return
+    logger.info(f"Enqueued result processing job {job.id} for uploaded diagnosis_id: {diagnosis_dto.id}")
+
+
+async def _dispatch_message(
+    db: Session,
+    message: WebSocketMessage,
+    diagnosis_service: DiagnosisService,
+    patient_id: int,
+    websocket: WebSocket,
+):
+    """클라이언트 메시지를 액션별 핸들러로 전달합니다."""
+    if message.action == WebSocketMessageAction.C_DIAGNOSIS_STARTED:
+        logger.info(f"Received diagnosis start acknowledgement for patient_id: {patient_id}")
+        await _handle_diagnosis_started(db, message, diagnosis_service)
+
+    elif message.action == WebSocketMessageAction.C_DIAGNOSIS_FAILED:
+        logger.info(f"Received diagnosis failure report for patient_id: {patient_id}")
+        await _handle_diagnosis_failed(db, message, diagnosis_service)
+
+    elif message.action == WebSocketMessageAction.C_UPLOAD_RESULT:
+        logger.info(f"Received upload result request for patient_id: {patient_id}")
+        await _handle_upload_result(db, message, diagnosis_service, patient_id)
+
+    elif message.action == WebSocketMessageAction.C_REQUEST_UPLOAD_URL:
+        logger.info(f"Received upload URL request for patient_id: {patient_id}")
+        await _handle_request_upload_url(db, message, diagnosis_service, patient_id, websocket)
+
+    elif message.action == WebSocketMessageAction.C_RESULT_UPLOADED:
+        logger.info(f"Received uploaded result confirmation for patient_id: {patient_id}")
+        await _handle_result_uploaded(db, message, diagnosis_service, patient_id)
 
 
 @router.websocket("/diagnosis/{patient_code}")
@@ -84,10 +199,11 @@ async def websocket_endpoint(
     websocket: WebSocket,
     patient_code: str,
     patient_service: PatientService = Depends(get_patient_service),
-    db: Annotated[Session, Depends(get_db)] = None,
+    session_factory: sessionmaker = Depends(get_session_factory),
     diagnosis_service: DiagnosisService = Depends(get_diagnosis_service),
 ):
-    patient = patient_service.get_patient_by_code(db, patient_code)
+    # 헤드셋은 몇 시간씩 연결되어 있으므로 연결 동안 세션을 유지하지 않고, 메시지마다 세션을 열어 커넥션을 바로 반환
+    patient = await diagnosis_service.task_executor.run_io(_get_patient_by_code, session_factory, patient_service, patient_code)
     if not patient:
         logger.warning(f"Patient with code '{patient_code}' not found. Closing WebSocket.")
         await websocket.close(code=4004)  # Custom close code for not found
@@ -101,24 +217,13 @@ async def websocket_endpoint(
             data = await websocket.receive_json()
             try:
                 message = WebSocketMessage.model_validate(data)
-
-                if message.action == WebSocketMessageAction.C_DIAGNOSIS_STARTED:
-                    logger.info(f"Received diagnosis start acknowledgement for patient_id: {patient_id}")
-                    _handle_diagnosis_started(db, message, diagnosis_service)
-
-                elif message.action == WebSocketMessageAction.C_DIAGNOSIS_FAILED:
-                    logger.info(f"Received diagnosis failure report for patient_id: {patient_id}")
-                    _handle_diagnosis_failed(db, message, diagnosis_service)
-
-                elif message.action == WebSocketMessageAction.C_UPLOAD_RESULT:
-                    logger.info(f"Received upload result request for patient_id: {patient_id}")
-                    _handle_upload_result(db, message, diagnosis_service, patient_id)
-
+                with session_scope(session_factory) as db:
+                    await _dispatch_message(db, message, diagnosis_service, patient_id, websocket)
             except ValidationError as e:
                 logger.error(f"WebSocket validation error for patient_id {patient_id}: {e}")
             except Exception as e:
                 logger.error(f"Error processing WebSocket message for patient_id {patient_id}: {e}")
 
     except WebSocketDisconnect:
-        manager.disconnect(patient_id)
+        await manager.disconnect(patient_id)
         logger.info(f"WebSocket disconnected for patient_id: {patient_id} (code: {patient_code})")
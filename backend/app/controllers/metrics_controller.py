@@ -0,0 +1,15 @@
+from typing import Annotated, Any, Dict
+
+from app.controllers.auth_controller import get_user_from_token
+from app.core.metrics import metrics
+from app.dtos.user_dto import UserDTO
+from fastapi import APIRouter, Depends
+
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("", summary="서버 지표 조회", description="작업 대기열, 워커 사용률 등 프로세스 내 지표를 조회합니다. 로그인한 사용자만 조회할 수 있습니다.")
+def get_metrics(current_user: Annotated[UserDTO, Depends(get_user_from_token)]) -> Dict[str, Dict[str, Any]]:
+    """서버 지표 조회 (큐 길이, 커넥션 풀, S3 호출 수 등 내부 정보이므로 인증 필요)"""
+    return metrics.collect()
@@ -0,0 +1,65 @@
+"""DB 커넥션 풀 지표
+
+SQLAlchemy 풀 이벤트에는 커넥션을 기다리기 시작하는 시점이 없으므로, 풀 클래스를 감싸 커넥션을 얻는 데 걸린 시간(대기 시간)과
+`pool_timeout` 초과 횟수를 기록합니다. 사용 중/overflow 커넥션 수는 조회 시점의 풀 상태를 그대로 반환합니다.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Type
+
+from app.core.metrics import LatencyHistogram
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+# 커넥션 대기 시간 히스토그램 구간 상한 (초), 대부분 즉시 반환되므로 낮은 구간을 촘촘하게 둠
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+
+class PoolMonitor:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wait = LatencyHistogram(POOL_WAIT_BUCKETS)
+        self.timeouts = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self._wait.observe(seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def pool_class(self, base: Type[QueuePool] = QueuePool) -> Type[QueuePool]:
+        """커넥션 대기 시간을 기록하는 풀 클래스를 반환합니다.
+
+        engine.dispose() 시 풀은 같은 클래스로 다시 만들어지므로(recreate) 기록이 이어집니다.
+        """
+        monitor = self
+
+        class MonitoredPool(base):
+            def _do_get(self):
+                started = time.perf_counter()
+                try:
+                    connection = super()._do_get()
+                except PoolTimeoutError:
+                    monitor.record_wait(time.perf_counter() - started, timed_out=True)
+                    raise
+                monitor.record_wait(time.perf_counter() - started)
+                return connection
+
+        MonitoredPool.__name__ = f"Monitored{base.__name__}"
+        return MonitoredPool
+
+    def snapshot(self, pool: QueuePool) -> Dict[str, Any]:
+        with self._lock:
+            wait = self._wait.snapshot()
+            timeouts = self.timeouts
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            # 풀이 아직 채워지지 않았으면 음수가 반환됨
+            "overflow": max(pool.overflow(), 0),
+            "timeouts": timeouts,
+            "wait_seconds": wait,
+        }
@@ -0,0 +1,130 @@
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+import threading
+from typing import Any, Dict, Optional, Set
+
+from app.core.message_bus import MessageBus, get_process_id, message_bus
+from app.core.metrics import metrics
+from app.dtos.diagnosis_dto import DiagnosisStateDTO
+
+
+STATE_CHANNEL = "diagnosis_state"
+
+
+@dataclass(frozen=True)
+class DiagnosisStateEvent:
+    id: int
+    state: DiagnosisStateDTO
+    timestamp: datetime
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "state": self.state.value, "timestamp": self.timestamp.isoformat()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DiagnosisStateEvent":
+        return cls(id=data["id"], state=DiagnosisStateDTO(data["state"]), timestamp=datetime.fromisoformat(data["timestamp"]))
+
+
+class DiagnosisStateSubscription:
+    """한 진단 ID에 대한 상태 변경 구독 (구독한 이벤트 루프의 큐로 전달)"""
+
+    def __init__(self, broker: "DiagnosisStateBroker", diagnosis_id: int):
+        self.broker = broker
+        self.diagnosis_id = diagnosis_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[DiagnosisStateEvent] = asyncio.Queue()
+
+    def put(self, event: DiagnosisStateEvent):
+        # 스레드 풀(run_io)에서 발행될 수 있으므로 구독한 루프로 넘겨서 큐에 넣음
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self.loop:
+            self.queue.put_nowait(event)
+        elif not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[DiagnosisStateEvent]:
+        """다음 이벤트를 기다립니다. timeout 내에 이벤트가 없으면 None을 반환합니다."""
+        if not self.queue.empty():
+            return self.queue.get_nowait()
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def __enter__(self) -> "DiagnosisStateSubscription":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DiagnosisStateBroker:
+    """진단 상태 변경 브로커
+
+    `DiagnosisService.update_diagnosis_state`가 상태 변경을 발행하면, 해당 진단을 구독 중인 SSE 스트림에 즉시 전달합니다.
+    구독자는 이벤트가 올 때까지 대기하므로 DB를 주기적으로 조회하지 않습니다.
+    메시지 버스가 주어지면 다른 프로세스(다른 uvicorn 워커, ingestion 워커)에서 발행한 상태 변경도 전달합니다.
+    """
+
+    def __init__(self, bus: Optional[MessageBus] = None, origin: Optional[str] = None):
+        self._subscriptions: Dict[int, Set[DiagnosisStateSubscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._published = 0
+        self.bus = bus
+        self.origin = origin or get_process_id()
+        if bus is not None:
+            bus.subscribe(STATE_CHANNEL, self._on_remote_event)
+
+    def subscribe(self, diagnosis_id: int) -> DiagnosisStateSubscription:
+        """이벤트 루프 안에서 호출해야 합니다."""
+        subscription = DiagnosisStateSubscription(self, diagnosis_id)
+        with self._lock:
+            self._subscriptions[diagnosis_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: DiagnosisStateSubscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.diagnosis_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.diagnosis_id]
+
+    def publish(self, event: DiagnosisStateEvent):
+        with self._lock:
+            self._published += 1
+        self._deliver(event)
+        if self.bus is not None:
+            self.bus.publish_nowait(STATE_CHANNEL, {"origin": self.origin, **event.to_dict()})
+
+    def _deliver(self, event: DiagnosisStateEvent):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(event.id, ()))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+    async def _on_remote_event(self, payload: Dict[str, Any]):
+        if payload["origin"] != self.origin:
+            self._deliver(DiagnosisStateEvent.from_dict(payload))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "diagnoses": len(self._subscriptions),
+                "subscribers": sum(len(subscriptions) for subscriptions in self._subscriptions.values()),
+                "published": self._published,
+            }
+
+
+state_broker = DiagnosisStateBroker(bus=message_bus)
+metrics.register("diagnosis_state_broker", state_broker.get_metrics)
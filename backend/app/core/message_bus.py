@@ -0,0 +1,347 @@
+"""프로세스 간 메시지 버스
+
+uvicorn 워커(및 ingestion 워커) 프로세스 사이에 JSON 메시지를 주고받습니다.
+모든 백엔드는 발행한 프로세스 자신에게도 메시지를 전달하므로, 핸들러는 필요한 경우 발신자(origin)를 확인해야 합니다.
+
+- `memory`: 단일 프로세스용 (프로세스 내부에서만 전달)
+- `postgres`: PostgreSQL LISTEN/NOTIFY
+- `unix`: Unix 소켓 브로커 (`UnixSocketBroker`, 테스트/로컬 개발용)
+"""
+
+from abc import ABC, abstractmethod
+import asyncio
+from collections import defaultdict
+from contextlib import suppress
+import json
+import logging
+import os
+import socket
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.configs.env_configs import settings
+import psycopg2
+
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# PostgreSQL NOTIFY payload 최대 크기 (bytes)
+POSTGRES_NOTIFY_MAX_BYTES = 8000
+
+
+def get_process_id() -> str:
+    """메시지 발신자 식별용 프로세스 ID"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class MessageBus(ABC):
+    def __init__(self):
+        self._handlers: Dict[str, List[MessageHandler]] = defaultdict(list)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # 이벤트 루프는 태스크를 약한 참조로만 들고 있으므로, 끝나기 전에 GC되지 않도록 참조 유지
+        self._tasks: Set[asyncio.Task] = set()
+
+    def subscribe(self, channel: str, handler: MessageHandler):
+        """채널 핸들러 등록 (start 이전에 등록해야 합니다)"""
+        self._handlers[channel].append(handler)
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        await self._start()
+
+    async def stop(self):
+        # 커넥션을 닫기 전에 진행 중인 발행/전달이 끝날 때까지 대기
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._stop()
+        self.loop = None
+
+    def _create_task(self, coro: Awaitable[None]) -> asyncio.Task:
+        task = self.loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    @abstractmethod
+    async def publish(self, channel: str, payload: Dict[str, Any]):
+        pass
+
+    def publish_nowait(self, channel: str, payload: Dict[str, Any]):
+        """결과를 기다리지 않고 발행합니다. 스레드 풀 등 다른 스레드에서도 호출할 수 있습니다."""
+        if self.loop is None or self.loop.is_closed():
+            return
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self.loop:
+            self._create_task(self._publish_logged(channel, payload))
+        else:
+            asyncio.run_coroutine_threadsafe(self._publish_logged(channel, payload), self.loop)
+
+    async def _publish_logged(self, channel: str, payload: Dict[str, Any]):
+        try:
+            await self.publish(channel, payload)
+        except Exception as e:
+            logger.error(f"메시지 발행 실패: 채널={channel}, 오류={e}")
+
+    async def _dispatch(self, channel: str, payload: Dict[str, Any]):
+        for handler in self._handlers.get(channel, ()):
+            try:
+                await handler(payload)
+            except Exception as e:
+                logger.error(f"메시지 처리 중 오류 발생: 채널={channel}, 오류={e}", exc_info=True)
+
+    async def _start(self):
+        pass
+
+    async def _stop(self):
+        pass
+
+
+class InMemoryMessageBus(MessageBus):
+    """단일 프로세스용 버스 (발행 즉시 같은 프로세스의 핸들러로 전달)"""
+
+    async def publish(self, channel: str, payload: Dict[str, Any]):
+        await self._dispatch(channel, json.loads(json.dumps(payload)))
+
+
+class PostgresMessageBus(MessageBus):
+    """PostgreSQL LISTEN/NOTIFY 기반 버스
+
+    수신 전용 커넥션 하나를 이벤트 루프에 등록해 알림을 받고, 발행은 별도 커넥션에서 `pg_notify`로 수행합니다.
+    psycopg2는 blocking 드라이버이므로 연결, LISTEN, 종료는 스레드 풀에서 실행하고, 이벤트 루프에서는 이미 도착한 알림만 읽습니다.
+    수신 커넥션이 끊기면 지수 백오프로 재연결합니다. (끊긴 동안의 메시지는 유실되므로 필요하면 `SSE_RESYNC_INTERVAL`로 보완합니다.)
+    """
+
+    RECONNECT_MAX_SECONDS = 30.0
+
+    def __init__(self, dsn: str):
+        super().__init__()
+        self.dsn = dsn
+        self._listen_conn = None
+        self._publish_conn = None
+        self._publish_lock = threading.Lock()
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    def _connect(self):
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    async def _start(self):
+        await self._listen()
+
+    def _connect_listener(self, channels: List[str]):
+        conn = self._connect()
+        try:
+            with conn.cursor() as cursor:
+                for channel in channels:
+                    cursor.execute(f'LISTEN "{channel}"')
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    async def _listen(self):
+        self._listen_conn = await self.loop.run_in_executor(None, self._connect_listener, list(self._handlers))
+        self.loop.add_reader(self._listen_conn.fileno(), self._on_readable)
+        logger.info(f"PostgreSQL LISTEN 시작: 채널={list(self._handlers)}")
+
+    def _on_readable(self):
+        try:
+            self._listen_conn.poll()
+        except Exception as e:
+            logger.error(f"PostgreSQL LISTEN 커넥션 오류: {e}")
+            self._close_listen_conn()
+            if self._reconnect_task is None:
+                self._reconnect_task = self.loop.create_task(self._reconnect())
+            return
+
+        while self._listen_conn.notifies:
+            notify = self._listen_conn.notifies.pop(0)
+            try:
+                payload = json.loads(notify.payload)
+            except ValueError:
+                logger.warning(f"잘못된 알림 payload: 채널={notify.channel}")
+                continue
+            self._create_task(self._dispatch(notify.channel, payload))
+
+    async def _reconnect(self):
+        delay = 0.5
+        try:
+            while True:
+                await asyncio.sleep(delay)
+                try:
+                    await self._listen()
+                    return
+                except Exception as e:
+                    logger.error(f"PostgreSQL LISTEN 재연결 실패: {e}")
+                    delay = min(delay * 2, self.RECONNECT_MAX_SECONDS)
+        finally:
+            self._reconnect_task = None
+
+    def _close_listen_conn(self) -> Optional[asyncio.Future]:
+        if self._listen_conn is None:
+            return None
+        conn, self._listen_conn = self._listen_conn, None
+        with suppress(Exception):
+            self.loop.remove_reader(conn.fileno())
+        # 종료 메시지 전송이 이벤트 루프를 막지 않도록 스레드 풀에서 닫음
+        return self.loop.run_in_executor(None, self._close_quietly, conn)
+
+    @staticmethod
+    def _close_quietly(conn):
+        with suppress(Exception):
+            conn.close()
+
+    def _notify(self, channel: str, data: str):
+        with self._publish_lock:
+            for attempt in range(2):
+                try:
+                    if self._publish_conn is None or self._publish_conn.closed:
+                        self._publish_conn = self._connect()
+                    with self._publish_conn.cursor() as cursor:
+                        cursor.execute("SELECT pg_notify(%s, %s)", (channel, data))
+                    return
+                except Exception:
+                    # 끊긴 커넥션이면 한 번 다시 연결해서 재시도
+                    with suppress(Exception):
+                        self._publish_conn.close()
+                    self._publish_conn = None
+                    if attempt:
+                        raise
+
+    async def publish(self, channel: str, payload: Dict[str, Any]):
+        data = json.dumps(payload)
+        if len(data.encode("utf-8")) >= POSTGRES_NOTIFY_MAX_BYTES:
+            raise ValueError(f"NOTIFY payload가 너무 큽니다: {len(data)} bytes")
+        await asyncio.get_running_loop().run_in_executor(None, self._notify, channel, data)
+
+    def _close_publish_conn(self):
+        with self._publish_lock:
+            if self._publish_conn is not None:
+                self._close_quietly(self._publish_conn)
+                self._publish_conn = None
+
+    async def _stop(self):
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        closing = self._close_listen_conn()
+        # 발행 중인 스레드가 잠금을 쥐고 있을 수 있으므로 스레드 풀에서 대기
+        await self.loop.run_in_executor(None, self._close_publish_conn)
+        if closing is not None:
+            await closing
+
+
+class UnixSocketBroker:
+    """Unix 소켓 메시지 브로커
+
+    접속한 모든 클라이언트에 수신한 메시지(한 줄의 JSON)를 그대로 전달합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+
+    async def start(self):
+        with suppress(FileNotFoundError):
+            os.remove(self.path)
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.path)
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        with suppress(FileNotFoundError):
+            os.remove(self.path)
+
+    async def serve_forever(self):
+        await self.start()
+        await self._server.serve_forever()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._writers.add(writer)
+        try:
+            while line := await reader.readline():
+                for client in list(self._writers):
+                    try:
+                        client.write(line)
+                        await client.drain()
+                    except ConnectionError:
+                        self._writers.discard(client)
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+class UnixSocketMessageBus(MessageBus):
+    """`UnixSocketBroker`에 접속하는 버스"""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+
+    async def _start(self):
+        self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+        self._write_lock = asyncio.Lock()
+        self._read_task = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self):
+        while line := await self._reader.readline():
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            await self._dispatch(message["channel"], message["payload"])
+
+    async def publish(self, channel: str, payload: Dict[str, Any]):
+        data = json.dumps({"channel": channel, "payload": payload}).encode("utf-8") + b"\n"
+        async with self._write_lock:
+            self._writer.write(data)
+            await self._writer.drain()
+
+    async def _stop(self):
+        if self._read_task is not None:
+            self._read_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._read_task
+        if self._writer is not None:
+            self._writer.close()
+            with suppress(ConnectionError):
+                await self._writer.wait_closed()
+
+
+def create_message_bus(backend: Optional[str] = None) -> MessageBus:
+    backend = backend or settings.MESSAGE_BUS_BACKEND
+    if backend == "postgres":
+        dsn = f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
+        return PostgresMessageBus(dsn)
+    if backend == "unix":
+        return UnixSocketMessageBus(settings.MESSAGE_BUS_SOCKET_PATH)
+    if backend == "memory":
+        return InMemoryMessageBus()
+    raise ValueError(f"지원하지 않는 메시지 버스: {backend}")
+
+
+message_bus = create_message_bus()
+
+
+if __name__ == "__main__":
+    # Unix 소켓 브로커 실행: python -m app.core.message_bus
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(UnixSocketBroker(settings.MESSAGE_BUS_SOCKET_PATH).serve_forever())
@@ -0,0 +1,84 @@
+from bisect import bisect_left
+from itertools import accumulate
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+
+class MetricsRegistry:
+    """프로세스 내 지표 수집기 레지스트리
+
+    각 컴포넌트가 현재 지표를 dict로 반환하는 수집 함수를 등록하면, `/metrics` 요청 시 한 번에 모아서 반환합니다.
+    """
+
+    def __init__(self):
+        self._collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def register(self, name: str, collector: Callable[[], Dict[str, Any]]):
+        self._collectors[name] = collector
+
+    def unregister(self, name: str):
+        self._collectors.pop(name, None)
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        return {name: collector() for name, collector in self._collectors.items()}
+
+
+# 지연 시간 히스토그램 구간 상한 (초)
+DEFAULT_LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """지연 시간 누적 히스토그램 (Prometheus histogram과 같은 `le` 누적 구간)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막은 +Inf
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = list(accumulate(self.counts))
+        buckets = {str(bound): count for bound, count in zip(self.buckets, cumulative)}
+        buckets["+Inf"] = cumulative[-1]
+        return {"count": self.count, "sum": round(self.total, 6), "buckets": buckets}
+
+
+class OperationMetrics:
+    """작업별 호출 수, 실패 수, 재시도 수, 지연 시간 히스토그램 (여러 스레드에서 기록 가능)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations: Dict[str, Dict[str, Any]] = {}
+
+    def _get(self, operation: str) -> Dict[str, Any]:
+        if operation not in self._operations:
+            self._operations[operation] = {"calls": 0, "failures": 0, "retries": 0, "rejected": 0, "latency": LatencyHistogram()}
+        return self._operations[operation]
+
+    def record(self, operation: str, seconds: float, ok: bool):
+        """요청 한 번(재시도 포함 각 시도)의 결과 기록"""
+        with self._lock:
+            stats = self._get(operation)
+            stats["calls"] += 1
+            if not ok:
+                stats["failures"] += 1
+            stats["latency"].observe(seconds)
+
+    def increment(self, operation: str, counter: str):
+        with self._lock:
+            self._get(operation)[counter] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                operation: {**{key: value for key, value in stats.items() if key != "latency"}, "latency_seconds": stats["latency"].snapshot()}
+                for operation, stats in self._operations.items()
+            }
+
+
+metrics = MetricsRegistry()
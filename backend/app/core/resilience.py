@@ -0,0 +1,158 @@
+"""외부 서비스 호출 재시도와 서킷 브레이커
+
+- `RetryPolicy`: 지수 백오프 + jitter 재시도. 호출 전체(모든 시도와 대기)에 기한(deadline)을 둡니다.
+- `CircuitBreaker`: 연속 실패가 기준을 넘으면 일정 시간 동안 호출하지 않고 바로 실패(`CircuitOpenError`)합니다.
+  대기 시간이 지나면 한 번만 시험 호출(half-open)을 허용하고, 성공하면 다시 정상 상태로 돌아갑니다.
+"""
+
+from dataclasses import dataclass
+import random
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 호출하지 않은 경우"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open (retry after {retry_after:.1f}s)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 4
+    base_delay: float = 0.2  # 초
+    max_delay: float = 5.0  # 초
+    deadline: float = 60.0  # 호출 전체 기한 (초), 다음 시도를 시작할 수 있는지 판단하는 기준
+
+    def delay(self, attempt: int) -> float:
+        """attempt번째 시도가 실패한 뒤 기다릴 시간 (지수 백오프 + jitter)"""
+        backoff = min(self.base_delay * 2 ** max(attempt - 1, 0), self.max_delay)
+        return random.uniform(backoff / 2, backoff)
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.opened_count = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_call(self):
+        """호출 가능 여부 확인
+
+        Raises:
+            CircuitOpenError: 서킷이 열려 있거나, half-open 상태에서 이미 시험 호출이 진행 중인 경우
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            elapsed = self.clock() - self._opened_at
+            if elapsed < self.reset_timeout or self._trial_in_flight:
+                raise CircuitOpenError(self.name, max(self.reset_timeout - elapsed, 0.0))
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.opened_count += 1
+                self._state = self.OPEN
+                self._opened_at = self.clock()
+
+    def snapshot(self) -> dict:
+        state = self.state
+        with self._lock:
+            return {"state": state, "consecutive_failures": self._failures, "opened": self.opened_count}
+
+
+def call_with_retry(
+    func: Callable[[], Any],
+    policy: RetryPolicy,
+    is_retryable: Callable[[Exception], bool],
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    on_attempt: Optional[Callable[[float, Optional[Exception]], None]] = None,
+    on_retry: Optional[Callable[[int, Exception, float], None]] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Any:
+    """func를 재시도 정책에 따라 호출합니다.
+
+    재시도할 수 있는 오류(is_retryable)만 서킷 브레이커의 실패로 기록합니다. (객체 없음 등은 서비스가 정상인 것으로 봄)
+    다음 시도까지 기다리면 기한을 넘기는 경우 더 시도하지 않고 마지막 오류를 그대로 발생시킵니다.
+
+    Args:
+        on_attempt: 시도마다 (소요 시간, 오류 또는 None)로 호출
+        on_retry: 재시도 전에 (실패한 시도 번호, 오류, 대기 시간)으로 호출
+
+    Raises:
+        CircuitOpenError: 서킷이 열려 있는 경우
+    """
+    deadline = time.monotonic() + policy.deadline
+    attempt = 0
+    while True:
+        attempt += 1
+        if circuit_breaker is not None:
+            circuit_breaker.before_call()
+
+        started = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            retryable = is_retryable(e)
+            _record_attempt(circuit_breaker, on_attempt, time.perf_counter() - started, e, healthy=not retryable)
+
+            delay = policy.delay(attempt)
+            if not retryable or attempt >= policy.max_attempts or time.monotonic() + delay >= deadline:
+                raise
+            if on_retry is not None:
+                on_retry(attempt, e, delay)
+            sleep(delay)
+            continue
+
+        _record_attempt(circuit_breaker, on_attempt, time.perf_counter() - started, None, healthy=True)
+        return result
+
+
+def _record_attempt(
+    circuit_breaker: Optional[CircuitBreaker],
+    on_attempt: Optional[Callable[[float, Optional[Exception]], None]],
+    seconds: float,
+    error: Optional[Exception],
+    healthy: bool,
+):
+    if circuit_breaker is not None:
+        if healthy:
+            circuit_breaker.record_success()
+        else:
+            circuit_breaker.record_failure()
+    if on_attempt is not None:
+        on_attempt(seconds, error)
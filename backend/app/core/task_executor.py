@@ -0,0 +1,118 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+import multiprocessing
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.configs.env_configs import settings
+from app.core.metrics import metrics
+
+
+def _timed_call(func: Callable, *args) -> Tuple[bool, Any, float]:
+    """워커에서 실행되어 (성공 여부, 결과 또는 예외, 실행 시간)을 반환합니다."""
+    started = time.perf_counter()
+    try:
+        return True, func(*args), time.perf_counter() - started
+    except Exception as e:
+        return False, e, time.perf_counter() - started
+
+
+@dataclass
+class PoolStats:
+    max_workers: int
+    created_at: float = field(default_factory=time.monotonic)
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    busy_seconds: float = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        uptime = max(time.monotonic() - self.created_at, 1e-9)
+        return {
+            "max_workers": self.max_workers,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "running": min(self.in_flight, self.max_workers),
+            "queue_depth": max(self.in_flight - self.max_workers, 0),
+            "busy_seconds": round(self.busy_seconds, 6),
+            "utilization": round(min(self.busy_seconds / (self.max_workers * uptime), 1.0), 6),
+        }
+
+
+class TaskExecutor:
+    """이벤트 루프를 막는 작업을 워커 풀로 넘겨 실행합니다.
+
+    - CPU 작업(전처리 등): 프로세스 풀 (`RESULT_PROCESS_WORKERS`, 0이면 스레드 풀에서 실행)
+    - I/O 작업(S3, DB 등): 스레드 풀 (`IO_THREAD_WORKERS`)
+
+    풀은 처음 사용할 때 생성되며, 대기열 길이와 워커 사용률 지표를 제공합니다.
+    """
+
+    def __init__(self, process_workers: Optional[int] = None, thread_workers: Optional[int] = None):
+        self.process_workers = settings.RESULT_PROCESS_WORKERS if process_workers is None else process_workers
+        self.thread_workers = thread_workers or settings.IO_THREAD_WORKERS
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._stats: Dict[str, PoolStats] = {
+            "cpu": PoolStats(max_workers=self.process_workers or self.thread_workers),
+            "io": PoolStats(max_workers=self.thread_workers),
+        }
+
+    def _get_process_pool(self) -> Executor:
+        if not self.process_workers:
+            return self._get_thread_pool()
+        if self._process_pool is None:
+            # 멀티스레드 프로세스에서 fork 시 교착 위험이 있으므로 spawn 사용
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._process_pool
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="io-worker")
+        return self._thread_pool
+
+    async def run_cpu(self, func: Callable, *args) -> Any:
+        """CPU 작업을 프로세스 풀에서 실행합니다. func와 인자는 pickle 가능해야 합니다."""
+        return await self._run("cpu", self._get_process_pool(), func, *args)
+
+    async def run_io(self, func: Callable, *args) -> Any:
+        """블로킹 I/O 작업을 스레드 풀에서 실행합니다."""
+        return await self._run("io", self._get_thread_pool(), func, *args)
+
+    async def _run(self, name: str, pool: Executor, func: Callable, *args) -> Any:
+        stats = self._stats[name]
+        stats.submitted += 1
+        stats.in_flight += 1
+        try:
+            ok, result, elapsed = await asyncio.get_running_loop().run_in_executor(pool, partial(_timed_call, func, *args))
+        except Exception:
+            stats.failed += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+
+        stats.busy_seconds += elapsed
+        if not ok:
+            stats.failed += 1
+            raise result
+        stats.completed += 1
+        return result
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {name: stats.snapshot() for name, stats in self._stats.items()}
+
+    def shutdown(self, wait: bool = True):
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait)
+            self._process_pool = None
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=wait)
+            self._thread_pool = None
+
+
+executor = TaskExecutor()
+metrics.register("task_executor", executor.get_metrics)
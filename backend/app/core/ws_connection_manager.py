@@ -1,21 +1,132 @@
+import asyncio
+from contextlib import suppress
+import logging
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.configs.env_configs import settings
+from app.core.message_bus import MessageBus, get_process_id, message_bus
+from app.core.metrics import metrics
 from fastapi import WebSocket
 
 
+logger = logging.getLogger(__name__)
+
+PRESENCE_CHANNEL = "ws_presence"
+MESSAGE_CHANNEL = "ws_message"
+
+
 class ConnectionManager:
-    def __init__(self):
+    """WebSocket 커넥션 관리
+
+    소켓은 접속을 받은 프로세스에만 존재하므로, 메시지 버스로 프로세스 간 접속 현황(presence)을 공유하고
+    다른 프로세스가 가진 소켓으로 보낼 메시지를 전달합니다. 이를 통해 uvicorn을 여러 워커로 실행할 수 있습니다.
+
+    각 프로세스는 `WS_PRESENCE_INTERVAL`마다 자신의 접속 목록을 발행하며,
+    3회 연속 갱신되지 않은 프로세스(비정상 종료 등)의 접속 정보는 무시합니다.
+    """
+
+    def __init__(self, bus: Optional[MessageBus] = None, worker_id: Optional[str] = None, presence_interval: Optional[float] = None):
         self.active_connections: dict[int, WebSocket] = {}
+        self.bus = bus
+        self.worker_id = worker_id or get_process_id()
+        self.presence_interval = presence_interval or settings.WS_PRESENCE_INTERVAL
+        self._remote_connections: Dict[str, Tuple[Set[int], float]] = {}
+        self._presence_task: Optional[asyncio.Task] = None
+        if bus is not None:
+            bus.subscribe(PRESENCE_CHANNEL, self._on_presence)
+            bus.subscribe(MESSAGE_CHANNEL, self._on_message)
+
+    async def start(self):
+        """접속 현황 동기화 시작 (메시지 버스 start 이후 호출)"""
+        if self.bus is None:
+            return
+        await self._publish_presence("sync")
+        self._presence_task = asyncio.create_task(self._presence_loop())
+
+    async def stop(self):
+        if self._presence_task is not None:
+            self._presence_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._presence_task
+            self._presence_task = None
+        if self.bus is not None:
+            with suppress(Exception):
+                await self._publish_presence("shutdown")
 
     async def connect(self, patient_id: int, websocket: WebSocket):
         await websocket.accept()
         self.active_connections[patient_id] = websocket
+        await self._publish_presence("update")
 
-    def disconnect(self, patient_id: int):
+    async def disconnect(self, patient_id: int):
         if patient_id in self.active_connections:
             del self.active_connections[patient_id]
+            await self._publish_presence("update")
+
+    def is_connected(self, patient_id: int) -> bool:
+        """환자가 어느 프로세스에든 접속되어 있는지 확인"""
+        return patient_id in self.active_connections or self._find_remote_worker(patient_id) is not None
 
     async def send_personal_message(self, message: dict, patient_id: int):
         if patient_id in self.active_connections:
             await self.active_connections[patient_id].send_json(message)
+            return
+
+        worker_id = self._find_remote_worker(patient_id)
+        if worker_id is not None:
+            await self.bus.publish(MESSAGE_CHANNEL, {"worker_id": worker_id, "patient_id": patient_id, "message": message})
+
+    def _find_remote_worker(self, patient_id: int) -> Optional[str]:
+        expires_before = time.monotonic() - self.presence_interval * 3
+        for worker_id, (patient_ids, last_seen) in self._remote_connections.items():
+            if last_seen >= expires_before and patient_id in patient_ids:
+                return worker_id
+        return None
+
+    async def _presence_loop(self):
+        while True:
+            await asyncio.sleep(self.presence_interval)
+            try:
+                await self._publish_presence("update")
+            except Exception as e:
+                logger.error(f"WebSocket 접속 현황 발행 실패: {e}")
+
+    async def _publish_presence(self, type: str):
+        if self.bus is None:
+            return
+        await self.bus.publish(PRESENCE_CHANNEL, {"type": type, "worker_id": self.worker_id, "patient_ids": list(self.active_connections)})
+
+    async def _on_presence(self, payload: Dict[str, Any]):
+        worker_id = payload["worker_id"]
+        if worker_id == self.worker_id:
+            return
+
+        if payload["type"] == "shutdown":
+            self._remote_connections.pop(worker_id, None)
+            return
+
+        self._remote_connections[worker_id] = (set(payload["patient_ids"]), time.monotonic())
+        if payload["type"] == "sync":
+            # 새로 시작한 프로세스에 현재 접속 목록 전달
+            await self._publish_presence("update")
+
+    async def _on_message(self, payload: Dict[str, Any]):
+        if payload["worker_id"] != self.worker_id:
+            return
+        websocket = self.active_connections.get(payload["patient_id"])
+        if websocket is not None:
+            await websocket.send_json(payload["message"])
+
+    def get_metrics(self) -> Dict[str, Any]:
+        expires_before = time.monotonic() - self.presence_interval * 3
+        remote = [patient_ids for patient_ids, last_seen in self._remote_connections.values() if last_seen >= expires_before]
+        return {
+            "local_connections": len(self.active_connections),
+            "remote_workers": len(remote),
+            "remote_connections": sum(len(patient_ids) for patient_ids in remote),
+        }
 
 
-manager = ConnectionManager()
+manager = ConnectionManager(bus=message_bus)
+metrics.register("ws_connections", manager.get_metrics)
@@ -1,11 +1,21 @@
 from functools import lru_cache
+from typing import Optional
 
-from app.repositories.diagnosis_repository import DiagnosisRepository
+from app.configs.env_configs import settings
+from app.core.diagnosis_state_broker import DiagnosisStateBroker, state_broker
+from app.core.metrics import metrics
+from app.core.task_executor import TaskExecutor, executor
+from app.repositories.diagnosis_repository import AsyncDiagnosisRepository, DiagnosisRepository
+from app.repositories.ingestion_job_repository import IngestionJobRepository
+from app.services.async_storage_service import AsyncStorageService
 from app.services.diagnosis_password_manager import DiagnosisPasswordManager
 from app.services.diagnosis_result_process import DiagnosisResultProcessor
 from app.services.diagnosis_service import DiagnosisService
+from app.services.file_cache import FileCache
+from app.services.local_storage_service import LocalStorageService
 from app.services.patient_service import PatientService
 from app.services.s3_service import S3Service
+from app.services.storage_service import StorageService
 from fastapi import Depends
 
 
@@ -15,10 +25,59 @@ def get_diagnosis_repository() -> DiagnosisRepository:
     return DiagnosisRepository()
 
 
-# S3 서비스 의존성 제공 함수
+# 비동기 리포지토리 의존성 제공 함수 (async 컨트롤러용)
 @lru_cache()
-def get_s3_service() -> S3Service:
-    return S3Service()
+def get_async_diagnosis_repository() -> AsyncDiagnosisRepository:
+    return AsyncDiagnosisRepository()
+
+
+# 진단 결과 처리 작업 리포지토리 의존성 제공 함수
+@lru_cache()
+def get_ingestion_job_repository() -> IngestionJobRepository:
+    return IngestionJobRepository()
+
+
+# 전처리 파일 로컬 디스크 캐시 의존성 제공 함수
+@lru_cache()
+def get_file_cache() -> Optional[FileCache]:
+    if settings.FILE_CACHE_MAX_SIZE <= 0:
+        return None
+    file_cache = FileCache(settings.FILE_CACHE_DIR, settings.FILE_CACHE_MAX_SIZE)
+    metrics.register("file_cache", file_cache.get_metrics)
+    return file_cache
+
+
+# 파일 저장소 의존성 제공 함수 (STORAGE_BACKEND에 따라 S3 또는 로컬 파일 시스템)
+@lru_cache()
+def get_storage_service() -> StorageService:
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorageService(settings.LOCAL_STORAGE_DIR)
+    if settings.STORAGE_BACKEND == "s3":
+        s3_service = S3Service(file_cache=get_file_cache())
+        metrics.register("s3", s3_service.get_metrics)
+        return s3_service
+    raise ValueError(f"지원하지 않는 저장소: {settings.STORAGE_BACKEND}")
+
+
+# async 핸들러용 저장소 파사드 의존성 제공 함수 (전용 스레드 풀, 작업별 동시 실행 수/시간 제한)
+# 저장소 인스턴스별로 하나만 생성 (테스트에서 get_storage_service를 바꾸면 그 저장소의 파사드를 사용)
+@lru_cache()
+def get_async_storage_service(storage_service: StorageService = Depends(get_storage_service)) -> AsyncStorageService:
+    async_storage_service = AsyncStorageService(storage_service)
+    metrics.register("storage", async_storage_service.get_metrics)
+    return async_storage_service
+
+
+# 프로세스 종료 시 저장소 스레드 풀 정리 (아직 생성되지 않은 저장소는 새로 만들지 않음)
+def shutdown_storage_services():
+    if not get_storage_service.cache_info().currsize:
+        return
+    storage_service = get_storage_service()
+    if get_async_storage_service.cache_info().currsize:
+        get_async_storage_service(storage_service).shutdown()
+    storage_service.shutdown()
+    get_async_storage_service.cache_clear()
+    get_storage_service.cache_clear()
 
 
 # 진단 비밀번호 관리자 의존성 제공 함수
@@ -33,14 +92,39 @@ def get_diagnosis_result_processor() -> DiagnosisResultProcessor:
     return DiagnosisResultProcessor()
 
 
+# 작업 실행기(프로세스/스레드 풀) 의존성 제공 함수
+def get_task_executor() -> TaskExecutor:
+    return executor
+
+
+# 진단 상태 변경 브로커 의존성 제공 함수
+def get_diagnosis_state_broker() -> DiagnosisStateBroker:
+    return state_broker
+
+
 # 진단 서비스 의존성 제공 함수
 def get_diagnosis_service(
     repository: DiagnosisRepository = Depends(get_diagnosis_repository),
-    s3_service: S3Service = Depends(get_s3_service),
+    storage_service: StorageService = Depends(get_storage_service),
     password_manager: DiagnosisPasswordManager = Depends(get_diagnosis_password_manager),
     result_processor: DiagnosisResultProcessor = Depends(get_diagnosis_result_processor),
+    task_executor: TaskExecutor = Depends(get_task_executor),
+    ingestion_job_repository: IngestionJobRepository = Depends(get_ingestion_job_repository),
+    state_broker: DiagnosisStateBroker = Depends(get_diagnosis_state_broker),
+    async_storage_service: AsyncStorageService = Depends(get_async_storage_service),
+    async_repository: AsyncDiagnosisRepository = Depends(get_async_diagnosis_repository),
 ) -> DiagnosisService:
-    return DiagnosisService(repository=repository, s3_service=s3_service, password_manager=password_manager, result_processor=result_processor)
+    return DiagnosisService(
+        repository=repository,
+        storage_service=storage_service,
+        password_manager=password_manager,
+        result_processor=result_processor,
+        task_executor=task_executor,
+        ingestion_job_repository=ingestion_job_repository,
+        state_broker=state_broker,
+        async_storage_service=async_storage_service,
+        async_repository=async_repository,
+    )
 
 
 def get_patient_service() -> PatientService:
@@ -21,6 +21,11 @@ class DiagnosisTypeDTO(str, Enum):
     TENNISBALL = "TENNISBALL"
 
 
+class DiagnosisFileFormatDTO(str, Enum):
+    CSV = "csv"  # 전처리 결과 CSV (다운로드/내보내기용)
+    PARQUET = "parquet"  # 전처리 결과 Parquet (float32, event 사전 인코딩)
+
+
 @dataclass
 class DiagnosisDTO:
     id: int
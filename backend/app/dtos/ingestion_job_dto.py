@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+
+class IngestionJobStateDTO(str, Enum):
+    PENDING = "PENDING"  # 처리 대기 (재시도 대기 포함)
+    RUNNING = "RUNNING"  # 워커가 처리 중
+    SUCCEEDED = "SUCCEEDED"  # 처리 완료
+    DEAD = "DEAD"  # 최대 재시도 초과 (dead-letter)
+
+
+@dataclass
+class IngestionJobDTO:
+    id: int
+    diagnosis_id: int
+    original_file_path: str
+    processed_file_path: str
+    state: IngestionJobStateDTO
+    attempts: int
+    max_attempts: int
+    available_at: datetime
+    last_error: Optional[str]
+
+    @classmethod
+    def from_entity(cls, entity):
+        if not entity:
+            return None
+        return cls(
+            id=entity.id,
+            diagnosis_id=entity.diagnosis_id,
+            original_file_path=entity.original_file_path,
+            processed_file_path=entity.processed_file_path,
+            state=IngestionJobStateDTO(entity.state.value),
+            attempts=entity.attempts,
+            max_attempts=entity.max_attempts,
+            available_at=entity.available_at,
+            last_error=entity.last_error,
+        )
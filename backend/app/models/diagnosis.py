@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum
 
 from app.models.base_model import BaseModel
-from sqlalchemy import Enum as SQLAlchemyEnum, ForeignKey
+from sqlalchemy import Enum as SQLAlchemyEnum, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 
@@ -22,12 +22,21 @@ class DiagnosisState(str, Enum):
     EXPIRED = "EXPIRED"  # 만료
 
 
+# 진행중(READY, STARTED) 진단만 포함하는 부분 인덱스 조건
+LIVE_DIAGNOSIS_CONDITION = text("state IN ('READY', 'STARTED')")
+
+
 class Diagnosis(BaseModel):
     __tablename__ = "diagnoses"
+    __table_args__ = (
+        Index("ix_diagnoses_patient_id_state_created_at", "patient_id", "state", "created_at"),  # 환자별 진단 기록 조회
+        Index("ix_diagnoses_doctor_id_state", "doctor_id", "state"),  # 의사별 진행중 진단 조회
+        Index("ix_diagnoses_live_expired_at", "expired_at", postgresql_where=LIVE_DIAGNOSIS_CONDITION, sqlite_where=LIVE_DIAGNOSIS_CONDITION),  # 만료 대상 조회
+    )
 
     doctor_id: Mapped[int] = mapped_column(ForeignKey("doctors.id"), nullable=False)
     patient_id: Mapped[int] = mapped_column(ForeignKey("patients.id"), nullable=False)
-    code: Mapped[str] = mapped_column(nullable=False)
+    code: Mapped[str] = mapped_column(nullable=False, index=True)
     type: Mapped[DiagnosisType] = mapped_column(SQLAlchemyEnum(DiagnosisType), default=DiagnosisType.NONE, nullable=False)
     level: Mapped[int] = mapped_column(nullable=False)
     state: Mapped[DiagnosisState] = mapped_column(SQLAlchemyEnum(DiagnosisState), default=DiagnosisState.READY, nullable=False)
@@ -52,7 +61,7 @@ class Diagnosis(BaseModel):
 class DiagnosisResult(BaseModel):
     __tablename__ = "diagnosis_results"
 
-    diagnosis_id: Mapped[int] = mapped_column(ForeignKey("diagnoses.id"), nullable=False)
+    diagnosis_id: Mapped[int] = mapped_column(ForeignKey("diagnoses.id"), nullable=False, unique=True, index=True)
     original_file_path: Mapped[str] = mapped_column(nullable=False)
     processed_file_path: Mapped[str] = mapped_column(nullable=True)
     score: Mapped[float] = mapped_column(nullable=True)
@@ -0,0 +1,48 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from app.models.base_model import BaseModel
+from sqlalchemy import Enum as SQLAlchemyEnum, ForeignKey, Index, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class IngestionJobState(str, Enum):
+    PENDING = "PENDING"  # 처리 대기 (재시도 대기 포함)
+    RUNNING = "RUNNING"  # 워커가 처리 중
+    SUCCEEDED = "SUCCEEDED"  # 처리 완료
+    DEAD = "DEAD"  # 최대 재시도 초과 (dead-letter)
+
+
+class IngestionJob(BaseModel):
+    __tablename__ = "ingestion_jobs"
+    __table_args__ = (Index("ix_ingestion_jobs_state_available_at", "state", "available_at"),)
+
+    diagnosis_id: Mapped[int] = mapped_column(ForeignKey("diagnoses.id"), nullable=False, index=True)
+    original_file_path: Mapped[str] = mapped_column(nullable=False)
+    processed_file_path: Mapped[str] = mapped_column(nullable=False)
+    state: Mapped[IngestionJobState] = mapped_column(SQLAlchemyEnum(IngestionJobState), default=IngestionJobState.PENDING, nullable=False)
+    attempts: Mapped[int] = mapped_column(default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(nullable=False)
+    available_at: Mapped[datetime] = mapped_column(nullable=False)
+    locked_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    locked_by: Mapped[Optional[str]] = mapped_column(nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    def to_dict(self) -> dict:
+        base_dict = super().to_dict()
+        base_dict.update(
+            {
+                "diagnosis_id": self.diagnosis_id,
+                "original_file_path": self.original_file_path,
+                "processed_file_path": self.processed_file_path,
+                "state": self.state.value,
+                "attempts": self.attempts,
+                "max_attempts": self.max_attempts,
+                "available_at": self.available_at,
+                "locked_at": self.locked_at,
+                "locked_by": self.locked_by,
+                "last_error": self.last_error,
+            }
+        )
+        return base_dict
@@ -1,16 +1,105 @@
 from datetime import datetime
 import logging
-from typing import List, Optional, Tuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from app.dtos.diagnosis_dto import DiagnosisStateDTO, DiagnosisTypeDTO
-from app.models.diagnosis import Diagnosis, DiagnosisResult, DiagnosisState, DiagnosisType
+from app.models.diagnosis import LIVE_DIAGNOSIS_CONDITION, Diagnosis, DiagnosisResult, DiagnosisState, DiagnosisType
 from app.utils import get_datetime_now
+from sqlalchemy import Select, Update, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
 logger = logging.getLogger(__name__)
 
 
+# 진단 상태 전환 규칙: 전환할 상태 -> 전환 가능한 현재 상태
+# 종료 상태(COMPLETED, CANCELLED)에서는 다른 상태로 바뀌지 않습니다.
+# 만료 이후에도 만료 전에 올라온 결과의 처리 결과(COMPLETED/FAILED)는 반영합니다.
+ALLOWED_STATE_TRANSITIONS: Dict[DiagnosisState, FrozenSet[DiagnosisState]] = {
+    DiagnosisState.READY: frozenset(),
+    DiagnosisState.STARTED: frozenset({DiagnosisState.READY}),
+    DiagnosisState.CANCELLED: frozenset({DiagnosisState.READY, DiagnosisState.STARTED}),
+    DiagnosisState.EXPIRED: frozenset({DiagnosisState.READY, DiagnosisState.STARTED}),
+    DiagnosisState.FAILED: frozenset({DiagnosisState.READY, DiagnosisState.STARTED, DiagnosisState.EXPIRED}),
+    DiagnosisState.COMPLETED: frozenset({DiagnosisState.READY, DiagnosisState.STARTED, DiagnosisState.EXPIRED}),
+}
+
+
+# 동기/비동기 리포지토리가 같은 SQL을 실행하도록 조회문을 공유
+def _live_diagnosis_statement(doctor_id: int) -> Select:
+    return select(Diagnosis).where(Diagnosis.doctor_id == doctor_id, Diagnosis.state.in_([DiagnosisState.STARTED, DiagnosisState.READY])).limit(1)
+
+
+def _diagnosis_record_statement(diagnosis_id: int) -> Select:
+    return (
+        select(Diagnosis, DiagnosisResult)
+        .join(DiagnosisResult, DiagnosisResult.diagnosis_id == Diagnosis.id)
+        .where(Diagnosis.id == diagnosis_id)
+        .order_by(DiagnosisResult.id)
+        .limit(1)
+    )
+
+
+def _patient_records_statement(
+    patient_id: int, start_date: datetime, end_date: datetime, limit: Optional[int], cursor: Optional[Tuple[datetime, int]]
+) -> Select:
+    statement = (
+        select(Diagnosis, DiagnosisResult)
+        .join(DiagnosisResult, DiagnosisResult.diagnosis_id == Diagnosis.id)
+        .where(
+            Diagnosis.patient_id == patient_id,
+            Diagnosis.created_at >= start_date,
+            Diagnosis.created_at <= end_date,
+            Diagnosis.state == DiagnosisState.COMPLETED,  # 완료된 진단만 조회
+        )
+    )
+    if cursor:
+        statement = statement.where(tuple_(Diagnosis.created_at, Diagnosis.id) < tuple_(*cursor))
+    statement = statement.order_by(Diagnosis.created_at.desc(), Diagnosis.id.desc())
+    if limit:
+        statement = statement.limit(limit)
+    return statement
+
+
+def _state_transition_statement(diagnosis_id: int, state: DiagnosisStateDTO) -> Update:
+    """현재 상태가 전환 가능한 경우에만 상태를 바꾸는 UPDATE ... RETURNING (조회 없이 한 번에 compare-and-set)"""
+    model_state = DiagnosisState[state.value]
+    return (
+        update(Diagnosis)
+        .where(Diagnosis.id == diagnosis_id, Diagnosis.state.in_(ALLOWED_STATE_TRANSITIONS[model_state]))
+        .values(state=model_state, updated_at=get_datetime_now())
+        .returning(Diagnosis)
+    )
+
+
+def _expire_overdue_statement(now: datetime) -> Update:
+    """만료 시각이 지난 진행중(READY, STARTED) 진단을 한 번에 EXPIRED로 전환 (ix_diagnoses_live_expired_at 부분 인덱스 사용)
+
+    상태 조건을 바인드 파라미터로 보내면 플래너가 부분 인덱스 조건과 같은지 알 수 없으므로 인덱스 조건(LIVE_DIAGNOSIS_CONDITION)을 그대로 사용합니다.
+    (ALLOWED_STATE_TRANSITIONS[EXPIRED]와 같은 상태 집합)
+    """
+    return (
+        update(Diagnosis)
+        .where(Diagnosis.expired_at < now, LIVE_DIAGNOSIS_CONDITION)
+        .values(state=DiagnosisState.EXPIRED, updated_at=now)
+        .returning(Diagnosis.id, Diagnosis.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _new_diagnosis(doctor_id: int, patient_id: int, code: str, type: DiagnosisTypeDTO, state: DiagnosisStateDTO, level: int, expired_at: datetime) -> Diagnosis:
+    return Diagnosis(
+        doctor_id=doctor_id,
+        patient_id=patient_id,
+        code=code,
+        type=DiagnosisType[type.value],
+        state=DiagnosisState[state.value],
+        level=level,
+        expired_at=expired_at,
+    )
+
+
 class DiagnosisRepository:
     def __init__(self):
         pass
@@ -27,15 +116,7 @@ class DiagnosisRepository:
         expired_at: datetime,
     ) -> Diagnosis:
         """새로운 진단 생성"""
-        diagnosis = Diagnosis(
-            doctor_id=doctor_id,
-            patient_id=patient_id,
-            code=code,
-            type=DiagnosisType[type.value],
-            state=DiagnosisState[state.value],
-            level=level,
-            expired_at=expired_at,
-        )
+        diagnosis = _new_diagnosis(doctor_id, patient_id, code, type, state, level, expired_at)
         db.add(diagnosis)
         db.commit()
         db.refresh(diagnosis)
@@ -56,23 +137,22 @@ class DiagnosisRepository:
 
     def get_live_diagnosis_by_doctor_id(self, db: Session, doctor_id: int) -> Optional[Diagnosis]:
         """의사 ID로 진행중인 진단 조회"""
-        diagnosis = db.query(Diagnosis).filter(Diagnosis.doctor_id == doctor_id, Diagnosis.state.in_([DiagnosisState.STARTED, DiagnosisState.READY])).first()
+        diagnosis = db.scalars(_live_diagnosis_statement(doctor_id)).first()
         if not diagnosis:
             logger.info(f"진단 자체가 없음... doctor_id: {doctor_id}")
             return None
         return diagnosis
 
     def update_state(self, db: Session, diagnosis_id: int, state: DiagnosisStateDTO) -> Optional[Diagnosis]:
-        """진단 상태 업데이트"""
-        diagnosis = self.get_diagnosis_by_id(db, diagnosis_id)
-        if not diagnosis:
-            return None
+        """진단 상태 전환 (UPDATE ... RETURNING 한 번으로 처리)
 
-        model_state = DiagnosisState[state.value]
-        diagnosis.state = model_state
-        diagnosis.updated_at = get_datetime_now()
+        진단이 없거나 현재 상태에서 전환할 수 없으면(ALLOWED_STATE_TRANSITIONS) 아무것도 바꾸지 않고 None을 반환합니다.
+        """
+        diagnosis = db.scalars(_state_transition_statement(diagnosis_id, state)).first()
+        if diagnosis:
+            # commit 시 속성이 만료되어 다시 조회하지 않도록 세션에서 분리 (RETURNING으로 받은 값 그대로 사용)
+            db.expunge(diagnosis)
         db.commit()
-        db.refresh(diagnosis)
         return diagnosis
 
     def create_diagnosis_result(
@@ -99,49 +179,135 @@ class DiagnosisRepository:
         db.refresh(result)
         return result
 
+    def complete_with_result(
+        self,
+        db: Session,
+        diagnosis_id: int,
+        original_file_path: str,
+        processed_file_path: str,
+        score: float,
+        time_spent: float,
+        fps: float,
+    ) -> Optional[Diagnosis]:
+        """진단 결과 파일 정보 저장과 COMPLETED 전환을 한 트랜잭션으로 처리
+
+        결과만 저장되고 상태는 그대로 남는 경우가 없도록 함께 commit합니다.
+        결과는 항상 저장하며, 현재 상태에서 COMPLETED로 전환할 수 없으면(ALLOWED_STATE_TRANSITIONS) None을 반환합니다.
+        """
+        db.add(
+            DiagnosisResult(
+                diagnosis_id=diagnosis_id,
+                original_file_path=original_file_path,
+                processed_file_path=processed_file_path,
+                score=score,
+                time_spent=time_spent,
+                fps=fps,
+            )
+        )
+        db.flush()
+        diagnosis = db.scalars(_state_transition_statement(diagnosis_id, DiagnosisStateDTO.COMPLETED)).first()
+        if diagnosis:
+            db.expunge(diagnosis)
+        db.commit()
+        return diagnosis
+
     def get_results_by_diagnosis_id(self, db: Session, diagnosis_id: int) -> List[DiagnosisResult]:
         """진단 ID로 결과 목록 조회"""
         return db.query(DiagnosisResult).filter(DiagnosisResult.diagnosis_id == diagnosis_id).all()
 
     def get_diagnosis_record(self, db: Session, diagnosis_id: int) -> Optional[Tuple[Diagnosis, DiagnosisResult]]:
         """특정 진단 기록 상세 조회"""
-        diagnosis = self.get_diagnosis_by_id(db, diagnosis_id)
-        if not diagnosis:
-            return None
-
-        # 진단 결과 조회 (첫 번째 결과만 반환)
-        result = db.query(DiagnosisResult).filter(DiagnosisResult.diagnosis_id == diagnosis_id).first()
-        if not result:
+        record = db.execute(_diagnosis_record_statement(diagnosis_id)).first()
+        if not record:
             return None
 
-        return diagnosis, result
+        return tuple(record)
 
     def get_diagnosis_records_by_patient(
-        self, db: Session, patient_id: int, start_date: datetime, end_date: datetime
+        self,
+        db: Session,
+        patient_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None,
+        cursor: Optional[Tuple[datetime, int]] = None,
     ) -> List[Tuple[Diagnosis, DiagnosisResult]]:
-        """환자의 진단 기록 리스트 조회"""
+        """환자의 진단 기록 리스트 조회 (진단과 결과를 한 번의 JOIN 쿼리로 조회)
+
+        최신순((created_at, id) 내림차순)으로 정렬하며, cursor가 주어지면 해당 (created_at, id) 이후의 기록부터 limit개를 조회합니다.
+        """
         try:
-            # 환자의 진단 목록 조회
-            diagnoses = (
-                db.query(Diagnosis)
-                .filter(
-                    Diagnosis.patient_id == patient_id,
-                    Diagnosis.created_at >= start_date,
-                    Diagnosis.created_at <= end_date,
-                    Diagnosis.state == DiagnosisState.COMPLETED,  # 완료된 진단만 조회
-                )
-                .order_by(Diagnosis.created_at.desc())
-                .all()
-            )
+            return [tuple(record) for record in db.execute(_patient_records_statement(patient_id, start_date, end_date, limit, cursor)).all()]
+        except Exception as e:
+            logger.error(f"환자 진단 기록 조회 중 오류 발생: {e}")
+            return []
 
-            result_list = []
-            for diagnosis in diagnoses:
-                # 각 진단의 결과 조회
-                result = db.query(DiagnosisResult).filter(DiagnosisResult.diagnosis_id == diagnosis.id).first()
-                if result:
-                    result_list.append((diagnosis, result))
 
-            return result_list
+class AsyncDiagnosisRepository:
+    """async 핸들러용 진단 리포지토리 (AsyncSession, 조회문은 DiagnosisRepository와 같음)"""
+
+    async def create_diagnosis(
+        self,
+        db: AsyncSession,
+        doctor_id: int,
+        patient_id: int,
+        code: str,
+        type: DiagnosisTypeDTO,
+        state: DiagnosisStateDTO,
+        level: int,
+        expired_at: datetime,
+    ) -> Diagnosis:
+        """새로운 진단 생성"""
+        diagnosis = _new_diagnosis(doctor_id, patient_id, code, type, state, level, expired_at)
+        db.add(diagnosis)
+        await db.commit()
+        await db.refresh(diagnosis)
+        return diagnosis
+
+    async def get_diagnosis_by_id(self, db: AsyncSession, diagnosis_id: int) -> Optional[Diagnosis]:
+        """ID로 진단 조회"""
+        return (await db.scalars(select(Diagnosis).where(Diagnosis.id == diagnosis_id))).first()
+
+    async def get_live_diagnosis_by_doctor_id(self, db: AsyncSession, doctor_id: int) -> Optional[Diagnosis]:
+        """의사 ID로 진행중인 진단 조회"""
+        return (await db.scalars(_live_diagnosis_statement(doctor_id))).first()
+
+    async def update_state(self, db: AsyncSession, diagnosis_id: int, state: DiagnosisStateDTO) -> Optional[Diagnosis]:
+        """진단 상태 전환 (DiagnosisRepository.update_state 참고)"""
+        diagnosis = (await db.scalars(_state_transition_statement(diagnosis_id, state))).first()
+        await db.commit()
+        return diagnosis
+
+    async def expire_overdue(self, db: AsyncSession) -> List[Tuple[int, datetime]]:
+        """만료 시각이 지난 진행중 진단을 EXPIRED로 일괄 전환하고 (진단 ID, 변경 시각) 목록을 반환합니다.
+
+        여러 프로세스에서 동시에 실행해도 조건부 UPDATE이므로 각 진단은 한 프로세스에서만 반환됩니다.
+        """
+        result = await db.execute(_expire_overdue_statement(get_datetime_now()))
+        expired = [tuple(row) for row in result.all()]
+        await db.commit()
+        return expired
+
+    async def get_diagnosis_record(self, db: AsyncSession, diagnosis_id: int) -> Optional[Tuple[Diagnosis, DiagnosisResult]]:
+        """특정 진단 기록 상세 조회"""
+        record = (await db.execute(_diagnosis_record_statement(diagnosis_id))).first()
+        if not record:
+            return None
+        return tuple(record)
+
+    async def get_diagnosis_records_by_patient(
+        self,
+        db: AsyncSession,
+        patient_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None,
+        cursor: Optional[Tuple[datetime, int]] = None,
+    ) -> List[Tuple[Diagnosis, DiagnosisResult]]:
+        """환자의 진단 기록 리스트 조회 (최신순, DiagnosisRepository.get_diagnosis_records_by_patient 참고)"""
+        try:
+            result = await db.execute(_patient_records_statement(patient_id, start_date, end_date, limit, cursor))
+            return [tuple(record) for record in result.all()]
         except Exception as e:
             logger.error(f"환자 진단 기록 조회 중 오류 발생: {e}")
             return []
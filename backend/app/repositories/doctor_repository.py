@@ -1,6 +1,8 @@
 from typing import Union
 
 from app.models.doctor import Doctor
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
@@ -40,3 +42,43 @@ class DoctorRepository:
         doctor.is_deleted = True
         db.commit()
         return True
+
+
+class AsyncDoctorRepository:
+    """async 핸들러용 의사 리포지토리 (AsyncSession)"""
+
+    @staticmethod
+    async def create(db: AsyncSession, doctor: Doctor) -> Doctor:
+        """의사 생성"""
+        db.add(doctor)
+        await db.commit()
+        await db.refresh(doctor)
+        return doctor
+
+    @staticmethod
+    async def find_by_id(db: AsyncSession, doctor_id: int) -> Union[Doctor, None]:
+        """ID로 의사 찾기"""
+        return (await db.scalars(select(Doctor).where(Doctor.id == doctor_id, Doctor.is_deleted.is_(False)))).first()
+
+    @staticmethod
+    async def find_by_user_id(db: AsyncSession, user_id: int) -> Union[Doctor, None]:
+        """사용자 ID로 의사 찾기"""
+        return (await db.scalars(select(Doctor).where(Doctor.user_id == user_id, Doctor.is_deleted.is_(False)))).first()
+
+    @staticmethod
+    async def update(db: AsyncSession, doctor: Doctor, updates: dict) -> Doctor:
+        """의사 정보 업데이트"""
+        for key, value in updates.items():
+            if hasattr(doctor, key) and key != "id" and key != "user_id":
+                setattr(doctor, key, value)
+
+        await db.commit()
+        await db.refresh(doctor)
+        return doctor
+
+    @staticmethod
+    async def delete(db: AsyncSession, doctor: Doctor) -> bool:
+        """의사 삭제"""
+        doctor.is_deleted = True
+        await db.commit()
+        return True
@@ -0,0 +1,159 @@
+from datetime import datetime, timedelta
+import logging
+from typing import List, Optional
+
+from app.models.ingestion_job import IngestionJob, IngestionJobState
+from app.utils import get_datetime_now
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionJobRepository:
+    def __init__(self):
+        pass
+
+    def create_job(self, db: Session, diagnosis_id: int, original_file_path: str, processed_file_path: str, max_attempts: int) -> IngestionJob:
+        """진단 결과 처리 작업 등록"""
+        job = IngestionJob(
+            diagnosis_id=diagnosis_id,
+            original_file_path=original_file_path,
+            processed_file_path=processed_file_path,
+            state=IngestionJobState.PENDING,
+            attempts=0,
+            max_attempts=max_attempts,
+            available_at=get_datetime_now(),
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def get_job_by_id(self, db: Session, job_id: int) -> Optional[IngestionJob]:
+        """ID로 작업 조회"""
+        return db.query(IngestionJob).filter(IngestionJob.id == job_id).first()
+
+    def claim_next_job(self, db: Session, worker_id: str, lock_timeout: timedelta) -> Optional[IngestionJob]:
+        """처리 가능한 작업 하나를 가져와 RUNNING 상태로 잠급니다.
+
+        `SELECT ... FOR UPDATE SKIP LOCKED`로 여러 워커가 동시에 같은 작업을 가져가지 않도록 합니다.
+        잠금 후 `lock_timeout`이 지나도록 끝나지 않은 RUNNING 작업은 워커가 중단된 것으로 보고 다시 가져옵니다.
+        (시도 횟수를 모두 사용한 작업은 다시 가져오지 않고 `dead_letter_stale_jobs`에서 dead-letter 처리)
+        (SQLite는 행 잠금을 지원하지 않으므로 FOR UPDATE 절이 생략됩니다.)
+        """
+        now = get_datetime_now()
+        query = (
+            select(IngestionJob)
+            .where(
+                or_(
+                    and_(IngestionJob.state == IngestionJobState.PENDING, IngestionJob.available_at <= now),
+                    and_(
+                        IngestionJob.state == IngestionJobState.RUNNING,
+                        IngestionJob.locked_at < now - lock_timeout,
+                        IngestionJob.attempts < IngestionJob.max_attempts,
+                    ),
+                )
+            )
+            .order_by(IngestionJob.available_at, IngestionJob.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job = db.execute(query).scalars().first()
+        if not job:
+            db.rollback()
+            return None
+
+        job.state = IngestionJobState.RUNNING
+        job.attempts += 1
+        job.locked_at = now
+        job.locked_by = worker_id
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def dead_letter_stale_jobs(self, db: Session, lock_timeout: timedelta) -> List[IngestionJob]:
+        """시도 횟수를 모두 사용한 채 중단된 RUNNING 작업을 dead-letter 상태로 전환합니다.
+
+        처리 중 워커가 죽는 작업(OOM 등)은 `mark_failed`를 거치지 않으므로, 다시 가져오지 않고 여기서 정리합니다.
+        """
+        now = get_datetime_now()
+        query = (
+            select(IngestionJob)
+            .where(
+                IngestionJob.state == IngestionJobState.RUNNING,
+                IngestionJob.locked_at < now - lock_timeout,
+                IngestionJob.attempts >= IngestionJob.max_attempts,
+            )
+            .with_for_update(skip_locked=True)
+        )
+        jobs = list(db.execute(query).scalars().all())
+        for job in jobs:
+            job.state = IngestionJobState.DEAD
+            job.last_error = f"worker {job.locked_by} stopped while processing (attempt {job.attempts}/{job.max_attempts})"
+            job.locked_at = None
+            job.locked_by = None
+        db.commit()
+        return jobs
+
+    def _get_owned_job(self, db: Session, job_id: int, worker_id: str, attempts: int) -> Optional[IngestionJob]:
+        """worker_id가 attempts번째 시도로 가져간 RUNNING 작업 조회 (잠금이 만료되어 다른 워커가 다시 가져갔으면 None)"""
+        query = (
+            select(IngestionJob)
+            .where(
+                IngestionJob.id == job_id,
+                IngestionJob.state == IngestionJobState.RUNNING,
+                IngestionJob.locked_by == worker_id,
+                IngestionJob.attempts == attempts,
+            )
+            .with_for_update()
+        )
+        return db.execute(query).scalars().first()
+
+    def renew_lock(self, db: Session, job_id: int, worker_id: str, attempts: int) -> bool:
+        """처리 중인 작업의 잠금 시각 갱신
+
+        처리가 `lock_timeout`보다 오래 걸려도 다른 워커가 중단된 작업으로 보고 다시 가져가지 않도록 주기적으로 호출합니다.
+        이미 다른 워커가 가져간 작업이면 False를 반환합니다.
+        """
+        job = self._get_owned_job(db, job_id, worker_id, attempts)
+        if not job:
+            db.rollback()
+            return False
+
+        job.locked_at = get_datetime_now()
+        db.commit()
+        return True
+
+    def mark_succeeded(self, db: Session, job_id: int, worker_id: str, attempts: int) -> Optional[IngestionJob]:
+        """작업 완료 처리 (해당 워커가 가져간 시도가 아니면 변경하지 않고 None 반환)"""
+        job = self._get_owned_job(db, job_id, worker_id, attempts)
+        if not job:
+            db.rollback()
+            return None
+
+        job.state = IngestionJobState.SUCCEEDED
+        job.locked_at = None
+        job.locked_by = None
+        job.last_error = None
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def mark_failed(self, db: Session, job_id: int, worker_id: str, attempts: int, error: str, retry_at: Optional[datetime]) -> Optional[IngestionJob]:
+        """작업 실패 처리 (retry_at이 없으면 dead-letter 상태로 전환, 해당 워커가 가져간 시도가 아니면 변경하지 않고 None 반환)"""
+        job = self._get_owned_job(db, job_id, worker_id, attempts)
+        if not job:
+            db.rollback()
+            return None
+
+        job.state = IngestionJobState.PENDING if retry_at else IngestionJobState.DEAD
+        if retry_at:
+            job.available_at = retry_at
+        job.locked_at = None
+        job.locked_by = None
+        job.last_error = error
+        db.commit()
+        db.refresh(job)
+        return job
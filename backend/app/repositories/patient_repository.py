@@ -1,6 +1,8 @@
 from typing import List, Union
 
 from app.models.patient import Patient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
@@ -50,3 +52,53 @@ class PatientRepository:
         patient.is_deleted = True
         db.commit()
         return True
+
+
+class AsyncPatientRepository:
+    """async 핸들러용 환자 리포지토리 (AsyncSession)"""
+
+    @staticmethod
+    async def create(db: AsyncSession, patient: Patient) -> Patient:
+        """환자 생성"""
+        db.add(patient)
+        await db.commit()
+        await db.refresh(patient)
+        return patient
+
+    @staticmethod
+    async def find_by_id(db: AsyncSession, patient_id: int) -> Union[Patient, None]:
+        """ID로 환자 찾기"""
+        return (await db.scalars(select(Patient).where(Patient.id == patient_id, Patient.is_deleted.is_(False)))).first()
+
+    @staticmethod
+    async def find_by_code(db: AsyncSession, code: str) -> Union[Patient, None]:
+        """코드로 환자 찾기"""
+        return (await db.scalars(select(Patient).where(Patient.code == code, Patient.is_deleted.is_(False)))).first()
+
+    @staticmethod
+    async def find_by_doctor_id(db: AsyncSession, doctor_id: int) -> List[Patient]:
+        """의사가 등록한 환자 목록 찾기"""
+        return list(await db.scalars(select(Patient).where(Patient.created_by == doctor_id, Patient.is_deleted.is_(False))))
+
+    @staticmethod
+    async def count_by_doctor_id(db: AsyncSession, doctor_id: int) -> int:
+        """의사가 등록한 환자 수 찾기"""
+        return await db.scalar(select(func.count()).select_from(Patient).where(Patient.created_by == doctor_id, Patient.is_deleted.is_(False)))
+
+    @staticmethod
+    async def update(db: AsyncSession, patient: Patient, updates: dict) -> Patient:
+        """환자 정보 업데이트"""
+        for key, value in updates.items():
+            if hasattr(patient, key) and key != "id" and key != "code" and key != "created_by":
+                setattr(patient, key, value)
+
+        await db.commit()
+        await db.refresh(patient)
+        return patient
+
+    @staticmethod
+    async def delete(db: AsyncSession, patient: Patient) -> bool:
+        """환자 삭제"""
+        patient.is_deleted = True
+        await db.commit()
+        return True
@@ -1,6 +1,8 @@
 from typing import List, Optional
 
 from app.models.token import Token
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
@@ -50,3 +52,53 @@ class TokenRepository:
         result = db.query(Token).filter(Token.id == token_id, Token.user_id == user_id).delete(synchronize_session=False)
         db.commit()
         return result > 0
+
+
+class AsyncTokenRepository:
+    """async 핸들러용 토큰 리포지토리 (AsyncSession)"""
+
+    @staticmethod
+    async def delete_all_tokens_for_user(db: AsyncSession, user_id: int) -> bool:
+        """사용자의 모든 리프레시 토큰 삭제"""
+        await db.execute(delete(Token).where(Token.user_id == user_id))
+        await db.commit()
+        return True
+
+    @staticmethod
+    async def delete_tokens_from_other_ip(db: AsyncSession, user_id: int, current_ip: str) -> bool:
+        """현재 IP를 제외한 다른 모든 IP의 리프레시 토큰 삭제"""
+        await db.execute(delete(Token).where(Token.user_id == user_id, Token.ip_address != current_ip))
+        await db.commit()
+        return True
+
+    @staticmethod
+    async def find_token(db: AsyncSession, token: str) -> Optional[Token]:
+        """리프레시 토큰 찾기"""
+        return (await db.scalars(select(Token).where(Token.refresh_token == token))).first()
+
+    @staticmethod
+    async def get_active_sessions(db: AsyncSession, user_id: int) -> List[Token]:
+        """사용자의 활성 세션 목록 조회"""
+        return list(await db.scalars(select(Token).where(Token.user_id == user_id)))
+
+    @staticmethod
+    async def create_token(db: AsyncSession, refresh_token: str, user_id: int, ip_address: str = None, user_agent: str = None) -> Token:
+        """새 리프레시 토큰 생성"""
+        new_token = Token(refresh_token=refresh_token, user_id=user_id, ip_address=ip_address, user_agent=user_agent)
+        db.add(new_token)
+        await db.commit()
+        return new_token
+
+    @staticmethod
+    async def delete_token(db: AsyncSession, refresh_token: str) -> bool:
+        """특정 리프레시 토큰 삭제"""
+        result = await db.execute(delete(Token).where(Token.refresh_token == refresh_token))
+        await db.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    async def delete_token_by_id(db: AsyncSession, token_id: int, user_id: int) -> bool:
+        """특정 ID의 리프레시 토큰 삭제"""
+        result = await db.execute(delete(Token).where(Token.id == token_id, Token.user_id == user_id))
+        await db.commit()
+        return result.rowcount > 0
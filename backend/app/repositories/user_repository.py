@@ -1,6 +1,8 @@
 from typing import Union
 
 from app.models.user import User
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
@@ -45,3 +47,48 @@ class UserRepository:
         user.is_deleted = True
         db.commit()
         return True
+
+
+class AsyncUserRepository:
+    """async 핸들러용 사용자 리포지토리 (AsyncSession)"""
+
+    @staticmethod
+    async def find_by_login_id(db: AsyncSession, login_id: str) -> Union[User, None]:
+        return (await db.scalars(select(User).where(User.login_id == login_id, User.is_deleted.is_(False)))).first()
+
+    @staticmethod
+    async def create(db: AsyncSession, user: User) -> User:
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+        return user
+
+    @staticmethod
+    async def find_by_id(db: AsyncSession, user_id: int) -> Union[User, None]:
+        return (await db.scalars(select(User).where(User.id == user_id, User.is_deleted.is_(False)))).first()
+
+    @staticmethod
+    async def update(db: AsyncSession, user: User, updates: dict) -> User:
+        """사용자 정보 업데이트"""
+        for key, value in updates.items():
+            if hasattr(user, key) and key != "id" and key != "hashed_password":
+                setattr(user, key, value)
+
+        await db.commit()
+        await db.refresh(user)
+        return user
+
+    @staticmethod
+    async def update_password(db: AsyncSession, user: User, hashed_password: str) -> User:
+        """사용자 비밀번호 업데이트"""
+        user.hashed_password = hashed_password
+        await db.commit()
+        await db.refresh(user)
+        return user
+
+    @staticmethod
+    async def delete(db: AsyncSession, user: User) -> bool:
+        """사용자 삭제"""
+        user.is_deleted = True
+        await db.commit()
+        return True
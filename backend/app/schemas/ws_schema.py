@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional
+from typing import Dict, Optional
 
 from app.dtos.diagnosis_dto import DiagnosisTypeDTO
 from pydantic import BaseModel, Field
@@ -10,11 +10,14 @@ class WebSocketMessageAction(str, Enum):
     S_START_DIAGNOSIS = "s_start_diagnosis"
     S_STOP_DIAGNOSIS = "s_stop_diagnosis"
     S_FORCE_DISCONNECT = "s_force_disconnect"
+    S_UPLOAD_URL = "s_upload_url"
 
     # Client -> Server
     C_UPLOAD_RESULT = "c_upload_result"
     C_DIAGNOSIS_STARTED = "c_diagnosis_started"
     C_DIAGNOSIS_FAILED = "c_diagnosis_failed"
+    C_REQUEST_UPLOAD_URL = "c_request_upload_url"
+    C_RESULT_UPLOADED = "c_result_uploaded"
 
 
 class WebSocketMessage(BaseModel):
@@ -33,6 +36,25 @@ class UploadResultData(BaseModel):
     file_content: str = Field(..., description="CSV 파일 내용 (문자열)")
 
 
+class RequestUploadUrlData(BaseModel):
+    diagnosis_id: int = Field(..., description="진단 ID")
+
+
+class UploadUrlData(BaseModel):
+    diagnosis_id: int = Field(..., description="진단 ID")
+    key: str = Field(..., description="업로드할 S3 객체 키 (c_result_uploaded에 그대로 전달)")
+    url: str = Field(..., description="presigned PUT URL")
+    method: str = Field("PUT", description="HTTP 메서드")
+    headers: Dict[str, str] = Field(default_factory=dict, description="업로드 요청에 포함해야 하는 헤더")
+    expires_in: int = Field(..., description="URL 만료 시간 (초)")
+
+
+class ResultUploadedData(BaseModel):
+    diagnosis_id: int = Field(..., description="진단 ID")
+    key: str = Field(..., description="업로드한 S3 객체 키")
+    etag: str = Field(..., description="업로드 응답의 ETag 헤더 값")
+
+
 class ClientDiagnosisStartedData(BaseModel):
     diagnosis_id: int = Field(..., description="진단 ID")
 
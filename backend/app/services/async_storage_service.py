@@ -0,0 +1,173 @@
+"""비동기 저장소 파사드
+
+async 핸들러(다운로드 API, WebSocket)에서 블로킹 저장소 클라이언트(boto3 등)를 이벤트 루프 밖에서 호출합니다.
+
+- 저장소 전용 스레드 풀(`STORAGE_IO_WORKERS`)을 사용하므로 느린 S3 요청이 DB 작업용 풀(`IO_THREAD_WORKERS`)을 점유하지 않습니다.
+- 작업 종류(read/write)별로 동시 실행 수와 시간 제한을 둡니다. 시간 제한은 실행 슬롯을 기다리는 시간을 포함합니다.
+- 시간 제한을 넘기면 `StorageTimeoutError`가 발생합니다. 이미 실행 중인 스레드는 중단할 수 없으므로 끝날 때까지 슬롯을 반환하지 않습니다.
+"""
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass
+import logging
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Optional
+from weakref import WeakKeyDictionary
+
+from app.configs.env_configs import settings
+from app.services.file_cache import CachedFile
+from app.services.storage_service import ObjectStream, StorageService
+
+
+logger = logging.getLogger(__name__)
+
+READ = "read"
+WRITE = "write"
+
+
+class StorageTimeoutError(Exception):
+    """저장소 작업이 시간 제한 안에 끝나지 않은 경우"""
+
+    def __init__(self, operation: str, timeout: float):
+        super().__init__(f"Storage {operation} timed out after {timeout}s")
+        self.operation = operation
+        self.timeout = timeout
+
+
+@dataclass(frozen=True)
+class OperationLimit:
+    max_concurrency: int
+    timeout: float  # 초
+
+
+@dataclass
+class OperationStats:
+    calls: int = 0
+    in_flight: int = 0
+    failed: int = 0
+    timeouts: int = 0
+
+
+class AsyncStorageService:
+    def __init__(self, storage_service: StorageService, max_workers: Optional[int] = None, limits: Optional[Dict[str, OperationLimit]] = None):
+        self.storage_service = storage_service
+        self.max_workers = max_workers or settings.STORAGE_IO_WORKERS
+        self.limits = limits or {
+            READ: OperationLimit(settings.STORAGE_MAX_CONCURRENT_READS, settings.STORAGE_READ_TIMEOUT),
+            WRITE: OperationLimit(settings.STORAGE_MAX_CONCURRENT_WRITES, settings.STORAGE_WRITE_TIMEOUT),
+        }
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # asyncio.Semaphore는 이벤트 루프에 묶이므로 루프별로 생성
+        self._semaphores: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = WeakKeyDictionary()
+        self._stats = {operation: OperationStats() for operation in self.limits}
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="storage-io")
+        return self._pool
+
+    def _get_semaphore(self, operation: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.get(loop)
+        if semaphores is None:
+            semaphores = {name: asyncio.Semaphore(limit.max_concurrency) for name, limit in self.limits.items()}
+            self._semaphores[loop] = semaphores
+        return semaphores[operation]
+
+    async def run(self, operation: str, func: Callable, *args) -> Any:
+        """저장소 작업을 스레드 풀에서 실행합니다.
+
+        Raises:
+            StorageTimeoutError: 슬롯 대기와 실행을 합쳐 작업 종류의 시간 제한을 넘긴 경우
+        """
+        limit = self.limits[operation]
+        stats = self._stats[operation]
+        stats.calls += 1
+        try:
+            return await asyncio.wait_for(self._run(operation, func, *args), limit.timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            logger.error(f"저장소 작업 시간 초과: 종류={operation}, 제한={limit.timeout}초, 작업={getattr(func, '__name__', func)}")
+            raise StorageTimeoutError(operation, limit.timeout) from None
+        except Exception:
+            stats.failed += 1
+            raise
+
+    async def _run(self, operation: str, func: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        semaphore = self._get_semaphore(operation)
+        stats = self._stats[operation]
+        await semaphore.acquire()
+        stats.in_flight += 1
+
+        def release():
+            stats.in_flight -= 1
+            semaphore.release()
+
+        def on_done(_: Future):
+            # 시간 초과로 기다리지 않게 된 작업도 스레드에서 실제로 끝난 뒤에 슬롯을 반환
+            with suppress(RuntimeError):
+                loop.call_soon_threadsafe(release)
+
+        try:
+            future = self._get_pool().submit(func, *args)
+        except BaseException:
+            release()
+            raise
+        future.add_done_callback(on_done)
+        return await asyncio.wrap_future(future)
+
+    async def upload_file(self, file_path: str, file: BinaryIO) -> bool:
+        return await self.run(WRITE, self.storage_service.upload_file, file_path, file)
+
+    async def upload_files(self, files: Dict[str, BinaryIO]) -> bool:
+        return await self.run(WRITE, self.storage_service.upload_files, files)
+
+    async def head_file(self, file_path: str) -> Optional[Dict[str, Any]]:
+        return await self.run(READ, self.storage_service.head_file, file_path)
+
+    async def generate_presigned_url(self, object_name: str, expiration: int = 3600) -> Optional[str]:
+        # 서명은 로컬에서 계산하지만 처음 호출 시 자격 증명 조회(IMDS 등)로 블로킹될 수 있음
+        return await self.run(READ, self.storage_service.generate_presigned_url, object_name, expiration)
+
+    async def get_cached_file(self, file_path: str) -> Optional[CachedFile]:
+        return await self.run(READ, self.storage_service.get_cached_file, file_path)
+
+    async def get_file_stream(self, file_path: str, byte_range: Optional[str] = None, accept_encoding: Optional[str] = None) -> Optional[ObjectStream]:
+        return await self.run(READ, self.storage_service.get_file_stream, file_path, byte_range, accept_encoding)
+
+    async def iter_chunks(self, file_stream: ObjectStream) -> AsyncIterator[bytes]:
+        """객체 스트림을 청크마다 스레드 풀에서 읽습니다. (청크 하나를 읽는 동안만 read 슬롯을 사용)"""
+        chunks = file_stream.iter_chunks()
+        completed = False
+        try:
+            while True:
+                chunk = await self.run(READ, next, chunks, None)
+                if chunk is None:
+                    completed = True
+                    return
+                yield chunk
+        finally:
+            if not completed:
+                # 읽는 중에 시간 초과된 경우 제너레이터가 아직 실행 중일 수 있음
+                with suppress(ValueError):
+                    chunks.close()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            operation: {
+                "max_concurrency": self.limits[operation].max_concurrency,
+                "timeout": self.limits[operation].timeout,
+                "calls": stats.calls,
+                "in_flight": stats.in_flight,
+                "failed": stats.failed,
+                "timeouts": stats.timeouts,
+            }
+            for operation, stats in self._stats.items()
+        }
+
+    def shutdown(self, wait: bool = True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
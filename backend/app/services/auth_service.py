@@ -4,13 +4,13 @@ from typing import Union
 from app.configs.env_configs import get_settings
 from app.dtos.user_dto import TokenPairDTO, UserDTO, UserLoginDTO, UserRegistrationInputDTO, UserRoleDTO
 from app.models.user import User, UserRole
-from app.repositories.token_repository import TokenRepository
-from app.repositories.user_repository import UserRepository
+from app.repositories.token_repository import AsyncTokenRepository
+from app.repositories.user_repository import AsyncUserRepository
 from app.services.doctor_service import DoctorService
 from app.utils import get_datetime_from_timestamp, get_datetime_now, get_datetime_now_plus_timedelta
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 # 비밀번호 해싱을 위한 설정
@@ -37,8 +37,8 @@ class AuthService:
         return pwd_context.hash(password)
 
     @staticmethod
-    def authenticate_user(db: Session, login_input: UserLoginDTO) -> Union[UserDTO, None]:
-        user = UserRepository.find_by_login_id(db, login_input.login_id)
+    async def authenticate_user(db: AsyncSession, login_input: UserLoginDTO) -> Union[UserDTO, None]:
+        user = await AsyncUserRepository.find_by_login_id(db, login_input.login_id)
         if not user:
             return None
         if not AuthService.verify_password(login_input.password, user.hashed_password):
@@ -62,26 +62,26 @@ class AuthService:
         return encoded_jwt
 
     @staticmethod
-    def create_tokens(db: Session, user_id: int, ip_address: str = None, user_agent: str = None) -> TokenPairDTO:
+    async def create_tokens(db: AsyncSession, user_id: int, ip_address: str = None, user_agent: str = None) -> TokenPairDTO:
         """액세스 토큰과 리프레시 토큰 생성"""
         access_token = AuthService.create_access_token(user_id)
         refresh_token = AuthService.create_refresh_token(user_id)
 
         if settings.ALLOW_MULTIPLE_SESSIONS:
             if ip_address:
-                existing_tokens = TokenRepository.get_active_sessions(db, user_id)
+                existing_tokens = await AsyncTokenRepository.get_active_sessions(db, user_id)
                 for token in existing_tokens:
                     if token.ip_address == ip_address:
-                        TokenRepository.delete_token(db, token.refresh_token)
+                        await AsyncTokenRepository.delete_token(db, token.refresh_token)
         else:
-            TokenRepository.delete_all_tokens_for_user(db, user_id)
+            await AsyncTokenRepository.delete_all_tokens_for_user(db, user_id)
 
-        TokenRepository.create_token(db, refresh_token, user_id, ip_address, user_agent)
+        await AsyncTokenRepository.create_token(db, refresh_token, user_id, ip_address, user_agent)
 
         return TokenPairDTO(access_token=access_token, refresh_token=refresh_token)
 
     @staticmethod
-    def get_user_from_token(db: Session, token: str) -> Union[UserDTO, None]:
+    async def get_user_from_token(db: AsyncSession, token: str) -> Union[UserDTO, None]:
         """현재 인증된 사용자 정보 조회"""
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -99,7 +99,7 @@ class AuthService:
                 return None
 
             # 사용자 정보 조회
-            user = UserRepository.find_by_id(db, user_id)
+            user = await AsyncUserRepository.find_by_id(db, user_id)
             if user is None:
                 return None
 
@@ -110,7 +110,7 @@ class AuthService:
             return None
 
     @staticmethod
-    def verify_refresh_token(db: Session, refresh_token: str, ip_address: str = None, user_agent: str = None) -> Union[int, None]:
+    async def verify_refresh_token(db: AsyncSession, refresh_token: str, ip_address: str = None, user_agent: str = None) -> Union[int, None]:
         """리프레시 토큰 검증 및 사용자 ID 반환"""
         try:
             # 토큰 디코딩 및 기본 검증
@@ -118,7 +118,7 @@ class AuthService:
             user_id = int(payload.get("sub"))
 
             # 데이터베이스에서 토큰 검증
-            token_record = TokenRepository.find_token(db, refresh_token)
+            token_record = await AsyncTokenRepository.find_token(db, refresh_token)
 
             if not token_record:
                 return None
@@ -126,13 +126,13 @@ class AuthService:
             # IP 주소 검증
             if ip_address and token_record.ip_address and token_record.ip_address != ip_address:
                 # IP가 변경된 경우 토큰 삭제
-                TokenRepository.delete_token(db, refresh_token)
+                await AsyncTokenRepository.delete_token(db, refresh_token)
                 return None
 
             # 사용자 에이전트 검증
             if user_agent and token_record.user_agent and token_record.user_agent != user_agent:
                 # 사용자 에이전트가 변경된 경우 토큰 삭제
-                TokenRepository.delete_token(db, refresh_token)
+                await AsyncTokenRepository.delete_token(db, refresh_token)
                 return None
 
             # 타입 및 만료 검증
@@ -143,11 +143,11 @@ class AuthService:
 
             # 토큰 만료 검증
             if get_datetime_now() > get_datetime_from_timestamp(exp):
-                TokenRepository.delete_token(db, refresh_token)
+                await AsyncTokenRepository.delete_token(db, refresh_token)
                 return None
 
             # 사용자 확인
-            user = UserRepository.find_by_id(db, user_id)
+            user = await AsyncUserRepository.find_by_id(db, user_id)
             if user is None or user.is_deleted:
                 return None
 
@@ -156,17 +156,17 @@ class AuthService:
             return None
 
     @staticmethod
-    def logout_user(db: Session, user_id: int) -> bool:
+    async def logout_user(db: AsyncSession, user_id: int) -> bool:
         """사용자 로그아웃 처리"""
-        return TokenRepository.delete_all_tokens_for_user(db, user_id)
+        return await AsyncTokenRepository.delete_all_tokens_for_user(db, user_id)
 
     @staticmethod
-    def register_user(db: Session, registration_data: UserRegistrationInputDTO) -> UserDTO:
+    async def register_user(db: AsyncSession, registration_data: UserRegistrationInputDTO) -> UserDTO:
         """사용자 등록"""
         if registration_data.admin_code != settings.ADMIN_CODE:
             raise ValueError("관리자 코드가 일치하지 않습니다")
 
-        if UserRepository.find_by_login_id(db, registration_data.login_id):
+        if await AsyncUserRepository.find_by_login_id(db, registration_data.login_id):
             raise ValueError("이미 사용 중인 로그인 ID입니다")
 
         # 비밀번호 해싱
@@ -181,11 +181,11 @@ class AuthService:
         )
 
         # 사용자 저장
-        created_user = UserRepository.create(db, new_user)  # 이제 User 객체 전달
+        created_user = await AsyncUserRepository.create(db, new_user)  # 이제 User 객체 전달
 
         try:
             if registration_data.role == UserRoleDTO.DOCTOR:
-                DoctorService.create_doctor(db, created_user.id)
+                await DoctorService.create_doctor(db, created_user.id)
             elif registration_data.role == UserRoleDTO.PATIENT:
                 raise ValueError("환자 단독 가입 불가")
 
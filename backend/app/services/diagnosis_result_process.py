@@ -1,13 +1,26 @@
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, field
 import io
-from typing import Tuple
+import os
+from tempfile import NamedTemporaryFile, SpooledTemporaryFile
+from typing import BinaryIO, Dict, Optional, Set, Tuple
 
+from app.configs.env_configs import settings
 from app.dtos.diagnosis_dto import DiagnosisTypeDTO
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from sklearn.preprocessing import MinMaxScaler
 
 
+# Parquet 출력 설정
+PARQUET_COMPRESSION = "zstd"
+# 값 종류가 적어 사전(dictionary) 인코딩하는 컬럼
+PARQUET_DICTIONARY_COLUMNS = {"event"}
+# float32로 줄이지 않는 컬럼 (세션 경과 시간은 밀리초 이하 정밀도 유지)
+PARQUET_FLOAT64_COLUMNS = {"time (second)"}
+
+
 @dataclass
 class DiagnosisScore:
     score: float
@@ -15,52 +28,209 @@ class DiagnosisScore:
     fps: float
 
 
+@dataclass
+class _StreamSummary:
+    """스트리밍 전처리 1차 패스에서 수집한 파일 요약 정보"""
+
+    rows: int = 0
+    first_time: Optional[float] = None
+    last_time: Optional[float] = None
+    last_score: Optional[float] = None
+    dtypes: Dict[str, Set[np.dtype]] = field(default_factory=dict)
+
+
 class DiagnosisResultProcessor:
-    def __init__(self):
-        pass
+    TIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+    def __init__(self, chunk_rows: int = None, spool_max_size: int = None):
+        self.chunk_rows = chunk_rows or settings.RESULT_CHUNK_ROWS
+        self.spool_max_size = spool_max_size or settings.RESULT_SPOOL_MAX_SIZE
 
     def preprocess(self, type: DiagnosisTypeDTO, file: bytes) -> Tuple[bytes, DiagnosisScore]:
+        df, score = self._preprocess_frame(type, pd.read_csv(io.BytesIO(file)))
+
+        # DataFrame to bytes
+        preprocessed_file = df.to_csv(index=False).encode("utf-8")
+
+        return preprocessed_file, score
+
+    def _preprocess_frame(self, type: DiagnosisTypeDTO, df: pd.DataFrame) -> Tuple[pd.DataFrame, DiagnosisScore]:
         # preprocess
-        df = pd.read_csv(io.BytesIO(file))
-        df = self._preprocess_time(df)
+        times = self._convert_to_seconds(df["current_time"])
+        df = self._preprocess_time(df, times)
         if type == DiagnosisTypeDTO.TENNISBALL:
             df = self._preprocess_tennisball(df)
         df = self._sort_columns_alphabetically(df)
 
         # 점수 추출
-        score = self._extract_score(df)
+        score = self._extract_score(df, times)
 
-        # DataFrame to bytes
-        preprocessed_file = df.to_csv(index=False).encode("utf-8")
+        return df, score
 
-        return preprocessed_file, score
+    def preprocess_stream(
+        self, type: DiagnosisTypeDTO, file: BinaryIO, output: Optional[BinaryIO] = None, parquet_output: Optional[BinaryIO] = None
+    ) -> Tuple[BinaryIO, DiagnosisScore]:
+        """CSV를 행 단위 청크로 읽어 전처리하고, 결과를 임시 파일에 순차적으로 기록합니다.
 
-    def _preprocess_time(self, df: pd.DataFrame) -> pd.DataFrame:
-        # 점수 로깅은 state로만 판단, but
-        df["time_in_seconds"] = df["current_time"].apply(self._convert_to_seconds)
+        `preprocess`와 동일한 결과를 만들면서 메모리 사용량은 세션 길이가 아닌 청크 크기에 비례합니다.
+        입력 파일은 두 번 읽으므로 seek 가능해야 하며, 반환된 파일은 호출한 쪽에서 닫아야 합니다.
+
+        Args:
+            type: 진단 콘텐츠 타입
+            file: 원본 CSV 파일 객체
+            output: 결과를 기록할 파일 객체 (없으면 SpooledTemporaryFile 생성)
+            parquet_output: 주어지면 같은 결과를 Parquet으로도 기록 (청크마다 row group 하나, 처음 위치로 되감음)
+
+        Returns:
+            Tuple[BinaryIO, DiagnosisScore]: (처음 위치로 되감긴 전처리 결과 파일, 점수)
+        """
+        if output is None:
+            output = SpooledTemporaryFile(max_size=self.spool_max_size, mode="w+b")
+
+        # TENNISBALL은 전체 데이터 기준 MinMax 스케일링이 필요하므로 메모리에서 처리
+        if type == DiagnosisTypeDTO.TENNISBALL:
+            df, score = self._preprocess_frame(type, pd.read_csv(file))
+            output.write(df.to_csv(index=False).encode("utf-8"))
+            output.seek(0)
+            if parquet_output is not None:
+                pq.write_table(self.to_arrow_table(df), parquet_output, compression=PARQUET_COMPRESSION)
+                parquet_output.seek(0)
+            return output, score
+
+        # 1차 패스: 행 수, 시작/종료 시간, 최종 점수, 청크별 컬럼 타입 수집
+        summary = self._summarize_stream(file)
 
-        df["event"] = ""
-        df["spend_time"] = ""
+        # 청크마다 추론된 타입이 달라도 전체를 한 번에 읽었을 때와 같은 형식으로 기록되도록 통일
+        dtypes = {column: self._unify_dtypes(column_dtypes) for column, column_dtypes in summary.dtypes.items()}
 
-        start_time = df["time_in_seconds"][0]
+        # 2차 패스: 청크 경계를 넘어 직전 State와 구간 시작 시간을 이어가며 전처리
+        file.seek(0)
+        previous_state = None
+        start_time = summary.first_time
+        parquet_writer = None
+        for i, chunk in enumerate(pd.read_csv(file, chunksize=self.chunk_rows)):
+            chunk = chunk.astype(dtypes, copy=False)
+            times = self._convert_to_seconds(chunk["current_time"])
+            states = chunk["State"].to_numpy()
 
-        for i in range(1, len(df)):
-            if df["State"][i] < df["State"][i - 1]:
-                fail_time = df["time_in_seconds"][i]
-                df.loc[i, "event"] = "Fail"
-                df.loc[i, "spend_time"] = f"{fail_time - start_time}ms"
-                start_time = fail_time
-            elif df["State"][i] > df["State"][i - 1]:
-                fail_time = df["time_in_seconds"][i]
-                df.loc[i, "event"] = "Success"
-                df.loc[i, "spend_time"] = f"{fail_time - start_time}ms"
+            chunk = self._preprocess_time(chunk, times, previous_state=previous_state, start_time=start_time, first_time=summary.first_time)
+            chunk = self._sort_columns_alphabetically(chunk)
+            output.write(chunk.to_csv(index=False, header=i == 0).encode("utf-8"))
+            if parquet_output is not None:
+                table = self.to_arrow_table(chunk)
+                if parquet_writer is None:
+                    parquet_writer = pq.ParquetWriter(parquet_output, table.schema, compression=PARQUET_COMPRESSION)
+                parquet_writer.write_table(table)
 
-        start = df["time_in_seconds"][0]
-        df["time (second)"] = df["time_in_seconds"] - start
-        df = df.drop(columns=["time_in_seconds"])
+            fail_rows = np.flatnonzero(chunk["event"].to_numpy() == "Fail")
+            if len(fail_rows):
+                start_time = times[fail_rows[-1]]
+            previous_state = states[-1]
+
+        output.seek(0)
+        if parquet_writer is not None:
+            parquet_writer.close()
+            parquet_output.seek(0)
+
+        time_spent = summary.last_time - summary.first_time
+        score = DiagnosisScore(
+            score=float(summary.last_score),
+            time_spent=float(time_spent),
+            fps=float(summary.rows / time_spent),
+        )
+        return output, score
+
+    def to_arrow_table(self, df: pd.DataFrame) -> pa.Table:
+        """전처리 결과를 Parquet 저장용 Arrow 테이블로 변환합니다.
+
+        실수 컬럼은 float32, `event`는 사전 인코딩 문자열로 저장합니다.
+        빈 문자열은 CSV를 `pd.read_csv`로 읽었을 때와 같도록 null로 저장합니다.
+        """
+        arrays = []
+        for name, column in df.items():
+            if column.dtype == object:
+                array = pa.array(column.mask(column.eq("")).astype("string"), type=pa.string(), from_pandas=True)
+                if name in PARQUET_DICTIONARY_COLUMNS:
+                    array = array.dictionary_encode()
+            elif column.dtype.kind == "f" and name not in PARQUET_FLOAT64_COLUMNS:
+                array = pa.array(column.to_numpy(dtype=np.float32), from_pandas=True)
+            else:
+                array = pa.array(column, from_pandas=True)
+            arrays.append(array)
+        return pa.table(arrays, names=list(df.columns))
+
+    def _summarize_stream(self, file: BinaryIO) -> _StreamSummary:
+        summary = _StreamSummary()
+        for chunk in pd.read_csv(file, chunksize=self.chunk_rows):
+            if summary.first_time is None:
+                summary.first_time = self._convert_to_seconds(chunk["current_time"].iloc[:1])[0]
+            summary.last_time = self._convert_to_seconds(chunk["current_time"].iloc[-1:])[0]
+            summary.last_score = chunk["Score"].iloc[-1]
+            summary.rows += len(chunk)
+            for column, dtype in chunk.dtypes.items():
+                summary.dtypes.setdefault(column, set()).add(dtype)
+        return summary
+
+    def _unify_dtypes(self, dtypes: Set[np.dtype]) -> np.dtype:
+        if len(dtypes) == 1:
+            return next(iter(dtypes))
+        if all(dtype.kind in "iuf" for dtype in dtypes):
+            return np.dtype(np.float64)
+        return np.dtype(object)
+
+    def _preprocess_time(
+        self,
+        df: pd.DataFrame,
+        times: np.ndarray,
+        previous_state: Optional[float] = None,
+        start_time: Optional[float] = None,
+        first_time: Optional[float] = None,
+    ) -> pd.DataFrame:
+        # 점수 로깅은 state로만 판단, but
+        event, spend_time = self._detect_events(df["State"].to_numpy(), times, previous_state=previous_state, start_time=start_time)
+        df["event"] = event
+        df["spend_time"] = spend_time
+        df["time (second)"] = times - (times[0] if first_time is None else first_time)
 
         return df
 
+    def _detect_events(
+        self, states: np.ndarray, times: np.ndarray, previous_state: Optional[float] = None, start_time: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """State 변화로 Success/Fail 이벤트와 구간 소요 시간을 계산합니다.
+
+        State가 증가하면 Success, 감소하면 Fail 이며, 소요 시간은 직전 Fail 시점
+        (없으면 첫 행)부터 측정합니다. 행 단위 반복 없이 배열 연산으로 처리합니다.
+        청크 단위로 처리할 때는 이전 청크의 마지막 State와 구간 시작 시간을 넘겨받습니다.
+        """
+        n = len(states)
+        event = np.full(n, "", dtype=object)
+        spend_time = np.full(n, "", dtype=object)
+        if n == 0:
+            return event, spend_time
+
+        if previous_state is None:
+            previous_state = states[0]
+        if start_time is None:
+            start_time = times[0]
+
+        delta = np.diff(states, prepend=previous_state)
+        is_fail = delta < 0
+        is_success = delta > 0
+        event[is_success] = "Success"
+        event[is_fail] = "Fail"
+
+        # 각 행 직전까지의 마지막 Fail 위치 (Fail 행 자신은 제외, 없으면 -1)
+        last_fail = np.maximum.accumulate(np.where(is_fail, np.arange(n), -1))
+        previous_fail = np.concatenate(([-1], last_fail[:-1]))
+        segment_start_time = np.where(previous_fail >= 0, times[previous_fail], start_time)
+
+        is_event = is_fail | is_success
+        elapsed = times[is_event] - segment_start_time[is_event]
+        spend_time[is_event] = [f"{value}ms" for value in elapsed.tolist()]
+
+        return event, spend_time
+
     def _preprocess_tennisball(self, df: pd.DataFrame) -> pd.DataFrame:
         df = self._scale_pose(df)
         df = self._extract_position(df)
@@ -81,9 +251,9 @@ class DiagnosisResultProcessor:
         df = df.drop(["Position"], axis=1)
         return df
 
-    def _extract_score(self, df: pd.DataFrame) -> DiagnosisScore:
+    def _extract_score(self, df: pd.DataFrame, times: np.ndarray) -> DiagnosisScore:
         score = self._score_report(df)
-        time_spent = self._time_report(df)
+        time_spent = self._time_report(times)
         fps = df.shape[0] / time_spent
 
         return DiagnosisScore(
@@ -92,26 +262,42 @@ class DiagnosisResultProcessor:
             fps=float(fps),
         )
 
-    def _convert_to_seconds(self, datetime_str: str) -> float:
-        # 문자열을 datetime 객체로 변환
-        dt = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S.%f")
+    def _convert_to_seconds(self, datetime_column: pd.Series) -> np.ndarray:
+        """current_time 컬럼 전체를 한 번에 파싱하여 epoch 기준 초 단위 배열로 변환합니다.
 
-        # 기준 날짜 및 시간 (예: 1970-01-01 00:00:00.0)
-        epoch = datetime(1970, 1, 1)
-
-        # 두 datetime 객체의 차이를 계산하고, 총 초 단위로 변환
-        total_seconds = (dt - epoch).total_seconds()
-
-        return total_seconds
+        마이크로초 정수를 1e6으로 나누므로 기존 `(dt - epoch).total_seconds()` 결과와 동일합니다.
+        """
+        nanoseconds = pd.to_datetime(datetime_column, format=self.TIME_FORMAT).to_numpy().astype(np.int64)
+        return (nanoseconds // 1000) / 1e6
 
     def _score_report(self, df: pd.DataFrame) -> float:
         return df.iloc[-1]["Score"]
 
-    def _time_report(self, df: pd.DataFrame) -> float:
-        time_spent = self._convert_to_seconds(df.iloc[-1]["current_time"]) - self._convert_to_seconds(df.iloc[0]["current_time"])
+    def _time_report(self, times: np.ndarray) -> float:
+        time_spent = times[-1] - times[0]
         return time_spent
 
     def _sort_columns_alphabetically(self, df: pd.DataFrame) -> pd.DataFrame:
         sorted_columns = sorted(df.columns)
         df = df[sorted_columns]
         return df
+
+
+def preprocess_file(processor: DiagnosisResultProcessor, type: DiagnosisTypeDTO, input_path: str) -> Tuple[str, str, DiagnosisScore]:
+    """디스크의 원본 CSV를 전처리하여 CSV/Parquet 임시 파일로 저장하고 그 경로를 반환합니다.
+
+    프로세스 풀 워커에서 실행되므로 파일 내용 대신 경로만 주고받습니다. 반환된 파일은 호출한 쪽에서 삭제해야 합니다.
+    """
+    with (
+        open(input_path, "rb") as source,
+        NamedTemporaryFile(suffix=".csv", delete=False) as output,
+        NamedTemporaryFile(suffix=".parquet", delete=False) as parquet_output,
+    ):
+        try:
+            _, score = processor.preprocess_stream(type, source, output=output, parquet_output=parquet_output)
+        except Exception:
+            for temp_file in (output, parquet_output):
+                temp_file.close()
+                os.remove(temp_file.name)
+            raise
+    return output.name, parquet_output.name, score
@@ -1,16 +1,28 @@
+import base64
+from contextlib import ExitStack, suppress
 from datetime import datetime, timedelta
-import io
 import logging
-from typing import List, Optional, Tuple
+import os
+from tempfile import NamedTemporaryFile
+from typing import Dict, List, Optional, Tuple, Union
 import uuid
 
-from app.dtos.diagnosis_dto import DiagnosisDTO, DiagnosisResultDTO, DiagnosisStateDTO, DiagnosisTypeDTO
-from app.repositories.diagnosis_repository import DiagnosisRepository
+from app.configs.env_configs import settings
+from app.core.diagnosis_state_broker import DiagnosisStateBroker, DiagnosisStateEvent
+from app.core.task_executor import TaskExecutor
+from app.dtos.diagnosis_dto import DiagnosisDTO, DiagnosisFileFormatDTO, DiagnosisResultDTO, DiagnosisStateDTO, DiagnosisTypeDTO
+from app.dtos.ingestion_job_dto import IngestionJobDTO
+from app.models.diagnosis import Diagnosis
+from app.repositories.diagnosis_repository import AsyncDiagnosisRepository, DiagnosisRepository
+from app.repositories.ingestion_job_repository import IngestionJobRepository
+from app.services.async_storage_service import AsyncStorageService, StorageTimeoutError
 from app.services.diagnosis_password_manager import DiagnosisPasswordManager
-from app.services.diagnosis_result_process import DiagnosisResultProcessor
-from app.services.s3_service import S3Service
+from app.services.diagnosis_result_process import DiagnosisResultProcessor, preprocess_file
+from app.services.file_cache import CachedFile
+from app.services.storage_service import ObjectStream, StorageService
 from app.utils import get_datetime_from_timestamp, get_datetime_now, get_datetime_now_plus_timedelta, get_timestamp_now
 from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
@@ -25,14 +37,26 @@ class DiagnosisService:
     def __init__(
         self,
         repository: DiagnosisRepository,
-        s3_service: S3Service,
+        storage_service: StorageService,
         password_manager: DiagnosisPasswordManager,
         result_processor: DiagnosisResultProcessor,
+        task_executor: TaskExecutor,
+        ingestion_job_repository: IngestionJobRepository,
+        state_broker: DiagnosisStateBroker,
+        async_storage_service: Optional[AsyncStorageService] = None,
+        async_repository: Optional[AsyncDiagnosisRepository] = None,
     ):
         self.repository = repository
-        self.s3_service = s3_service
+        # async 컨트롤러는 AsyncSession과 비동기 리포지토리로 조회 (동기 세션은 WebSocket 핸들러와 워커에서 사용)
+        self.async_repository = async_repository or AsyncDiagnosisRepository()
+        self.storage_service = storage_service
+        # async 경로(API, WebSocket)의 저장소 호출은 전용 스레드 풀과 시간 제한을 거침
+        self.async_storage_service = async_storage_service or AsyncStorageService(storage_service)
         self.password_manager = password_manager
         self.result_processor = result_processor
+        self.task_executor = task_executor
+        self.ingestion_job_repository = ingestion_job_repository
+        self.state_broker = state_broker
 
     def is_session_expired(self, session_id: str) -> bool:
         """세션 ID에서 만료 시간을 파싱하여, 현재 세션이 만료되었는지 확인합니다.
@@ -64,11 +88,11 @@ class DiagnosisService:
             logger.error(f"세션 만료 확인 중 오류 발생: {e}")
             return True  # 오류 발생 시 만료된 것으로 처리
 
-    def start_diagnosis(
-        self, db: Session, doctor_id: int, patient_id: int, type: DiagnosisTypeDTO, level: int, session_duration: timedelta = timedelta(minutes=30)
+    async def start_diagnosis(
+        self, db: AsyncSession, doctor_id: int, patient_id: int, type: DiagnosisTypeDTO, level: int, session_duration: timedelta = timedelta(minutes=30)
     ) -> DiagnosisDTO:
         """새 진단 시작"""
-        diagnosis = self.repository.create_diagnosis(
+        diagnosis = await self.async_repository.create_diagnosis(
             db,
             doctor_id=doctor_id,
             patient_id=patient_id,
@@ -80,9 +104,9 @@ class DiagnosisService:
         )
         return DiagnosisDTO.from_entity(diagnosis)
 
-    def get_live_diagnosis_by_doctor_id(self, db: Session, doctor_id: int) -> Optional[DiagnosisDTO]:
+    async def get_live_diagnosis_by_doctor_id(self, db: AsyncSession, doctor_id: int) -> Optional[DiagnosisDTO]:
         """의사 ID로 진행중인 진단 조회"""
-        diagnosis = self.repository.get_live_diagnosis_by_doctor_id(db, doctor_id)
+        diagnosis = await self.async_repository.get_live_diagnosis_by_doctor_id(db, doctor_id)
         if not diagnosis:
             logger.info(f"세션을 찾을 수 없음: 의사ID={doctor_id}")
             return None
@@ -96,6 +120,14 @@ class DiagnosisService:
             return None
         return DiagnosisDTO.from_entity(diagnosis)
 
+    async def get_diagnosis_by_id_async(self, db: AsyncSession, diagnosis_id: int) -> Optional[DiagnosisDTO]:
+        """진단 조회 (async 컨트롤러용)"""
+        diagnosis = await self.async_repository.get_diagnosis_by_id(db, diagnosis_id)
+        if not diagnosis:
+            logger.info(f"진단을 찾을 수 없음: 진단ID={diagnosis_id}")
+            return None
+        return DiagnosisDTO.from_entity(diagnosis)
+
     def get_diagnosis_by_code(self, db: Session, code: str) -> Optional[DiagnosisDTO]:
         """진단 코드로 진단 조회"""
         diagnosis = self.repository.get_diagnosis_by_code(db, code)
@@ -107,38 +139,216 @@ class DiagnosisService:
     def update_diagnosis_state(self, db: Session, diagnosis_id: int, state: DiagnosisStateDTO) -> Optional[DiagnosisStateDTO]:
         """진단 상태 업데이트"""
         updated_diagnosis = self.repository.update_state(db, diagnosis_id, state)
+        return self._publish_state(diagnosis_id, state, updated_diagnosis)
+
+    async def update_diagnosis_state_async(self, db: AsyncSession, diagnosis_id: int, state: DiagnosisStateDTO) -> Optional[DiagnosisStateDTO]:
+        """진단 상태 업데이트 (async 컨트롤러용)"""
+        updated_diagnosis = await self.async_repository.update_state(db, diagnosis_id, state)
+        return self._publish_state(diagnosis_id, state, updated_diagnosis)
+
+    def _publish_state(self, diagnosis_id: int, state: DiagnosisStateDTO, updated_diagnosis: Optional[Diagnosis]) -> Optional[DiagnosisStateDTO]:
         if not updated_diagnosis:
             logger.warning(f"진단 상태 업데이트 실패: 진단ID={diagnosis_id}, 상태={state.value}")
             return None
 
-        return DiagnosisStateDTO(updated_diagnosis.state.value)
+        # 상태 변경을 구독 중인 SSE 스트림에 전달
+        updated_state = DiagnosisStateDTO(updated_diagnosis.state.value)
+        updated_at = DiagnosisDTO.from_entity(updated_diagnosis).updated_at
+        self.state_broker.publish(DiagnosisStateEvent(id=diagnosis_id, state=updated_state, timestamp=updated_at))
+        return updated_state
 
-    def upload_diagnosis_result(self, db: Session, diagnosis_id: int, diagnosis_type: DiagnosisTypeDTO, diagnosis_level: int, file: UploadFile) -> bool:
-        """진단 결과 파일 업로드"""
-        try:
-            filename = f"{diagnosis_type.value}_{diagnosis_level}_{get_datetime_now().strftime('%Y%m%d%H%M%S')}.csv"
+    async def enqueue_diagnosis_result(
+        self, db: Session, diagnosis_id: int, diagnosis_type: DiagnosisTypeDTO, diagnosis_level: int, file: UploadFile
+    ) -> Optional[IngestionJobDTO]:
+        """진단 결과 원본을 S3에 저장하고 처리 작업을 큐에 등록
 
-            # 원본 파일 S3 업로드
-            original_file = file.file.read()
+        전처리와 결과 저장은 워커(`app.workers.ingestion_worker`)가 큐에서 작업을 가져가 수행합니다.
+        원본이 먼저 저장되므로 서버가 재시작되어도 업로드된 결과는 유실되지 않습니다.
+        """
+        try:
+            filename = self._result_filename(diagnosis_type, diagnosis_level)
             original_file_path = self.ORIGINAL_FILE_PATH_TEMPLATE.format(diagnosis_id=diagnosis_id, filename=filename)
-            self.s3_service.upload_file(original_file_path, io.BytesIO(original_file))
-
-            # 전처리 및 S3 업로드
-            processed_file, score = self.result_processor.preprocess(diagnosis_type, original_file)
             processed_file_path = self.PROCESSED_FILE_PATH_TEMPLATE.format(diagnosis_id=diagnosis_id, filename=filename)
-            self.s3_service.upload_file(processed_file_path, io.BytesIO(processed_file))
 
-            # 파일 정보 저장
-            self.repository.create_diagnosis_result(db, diagnosis_id, original_file_path, processed_file_path, score.score, score.time_spent, score.fps)
+            file.file.seek(0)
+            if not await self.async_storage_service.upload_file(original_file_path, file.file):
+                logger.error(f"진단 결과 원본 업로드 실패: 진단ID={diagnosis_id}")
+                return None
 
-            return True
+            job = await self.task_executor.run_io(
+                self.ingestion_job_repository.create_job, db, diagnosis_id, original_file_path, processed_file_path, settings.INGESTION_MAX_ATTEMPTS
+            )
+            return IngestionJobDTO.from_entity(job)
         except Exception as e:
-            logger.error(f"진단 결과 업로드 중 오류 발생: {str(e)}", exc_info=True)
-            return False
+            logger.error(f"진단 결과 작업 등록 중 오류 발생: {str(e)}", exc_info=True)
+            return None
+
+    async def create_result_upload_url(self, diagnosis_id: int, diagnosis_type: DiagnosisTypeDTO, diagnosis_level: int) -> Optional[Tuple[str, str]]:
+        """VR 클라이언트가 결과 원본을 S3에 직접 업로드할 presigned PUT URL 발급
+
+        결과 파일이 API 서버를 거치지 않으므로 크기와 관계없이 API 메모리를 사용하지 않습니다.
+
+        Returns:
+            (S3 객체 키, presigned URL) 또는 발급 실패 시 None
+        """
+        filename = self._result_filename(diagnosis_type, diagnosis_level)
+        original_file_path = self.ORIGINAL_FILE_PATH_TEMPLATE.format(diagnosis_id=diagnosis_id, filename=filename)
+        url = await self.async_storage_service.generate_presigned_url(original_file_path, expiration=settings.S3_UPLOAD_URL_EXPIRATION)
+        if not url:
+            return None
+        return original_file_path, url
 
-    def get_diagnosis_record_metadata(self, db: Session, diagnosis_id: int) -> Optional[Tuple[DiagnosisDTO, DiagnosisResultDTO]]:
+    async def enqueue_uploaded_diagnosis_result(self, db: Session, diagnosis_id: int, original_file_path: str, etag: str) -> Optional[IngestionJobDTO]:
+        """VR 클라이언트가 S3에 직접 업로드한 결과 원본을 확인하고 처리 작업을 큐에 등록
+
+        키가 해당 진단의 원본 경로인지, 객체가 존재하고 ETag와 크기가 올바른지 확인합니다.
+        """
+        prefix = self.ORIGINAL_FILE_PATH_TEMPLATE.format(diagnosis_id=diagnosis_id, filename="")
+        filename = original_file_path.removeprefix(prefix)
+        if not original_file_path.startswith(prefix) or not filename or "/" in filename:
+            logger.error(f"잘못된 업로드 경로: 진단ID={diagnosis_id}, 경로={original_file_path}")
+            return None
+
+        try:
+            metadata = await self.async_storage_service.head_file(original_file_path)
+        except StorageTimeoutError:
+            metadata = None
+        if not metadata:
+            logger.error(f"업로드된 결과 원본을 찾을 수 없음: 진단ID={diagnosis_id}, 경로={original_file_path}")
+            return None
+        if metadata["etag"].strip('"') != etag.strip('"'):
+            logger.error(f"업로드된 결과 원본 ETag 불일치: 진단ID={diagnosis_id}, 요청={etag}, S3={metadata['etag']}")
+            return None
+        if metadata["size"] > settings.S3_UPLOAD_MAX_SIZE:
+            logger.error(f"업로드된 결과 원본 크기 초과: 진단ID={diagnosis_id}, 크기={metadata['size']}")
+            return None
+
+        try:
+            processed_file_path = self.PROCESSED_FILE_PATH_TEMPLATE.format(diagnosis_id=diagnosis_id, filename=filename)
+            job = await self.task_executor.run_io(
+                self.ingestion_job_repository.create_job, db, diagnosis_id, original_file_path, processed_file_path, settings.INGESTION_MAX_ATTEMPTS
+            )
+            return IngestionJobDTO.from_entity(job)
+        except Exception as e:
+            logger.error(f"진단 결과 작업 등록 중 오류 발생: {str(e)}", exc_info=True)
+            return None
+
+    @staticmethod
+    def parquet_file_path(processed_file_path: str) -> str:
+        """전처리 CSV 경로에 대응하는 Parquet 경로 (같은 디렉터리에 확장자만 다르게 저장)"""
+        return f"{os.path.splitext(processed_file_path)[0]}.parquet"
+
+    @staticmethod
+    def _result_filename(diagnosis_type: DiagnosisTypeDTO, diagnosis_level: int) -> str:
+        return f"{diagnosis_type.value}_{diagnosis_level}_{get_datetime_now().strftime('%Y%m%d%H%M%S')}.csv"
+
+    def claim_ingestion_job(self, db: Session, worker_id: str) -> Optional[IngestionJobDTO]:
+        """처리할 작업 하나를 가져와 잠금"""
+        job = self.ingestion_job_repository.claim_next_job(db, worker_id, timedelta(seconds=settings.INGESTION_LOCK_TIMEOUT))
+        return IngestionJobDTO.from_entity(job)
+
+    def dead_letter_stale_ingestion_jobs(self, db: Session) -> List[IngestionJobDTO]:
+        """시도 횟수를 모두 사용한 채 중단된 작업을 dead-letter 처리하고 진단을 FAILED로 변경"""
+        jobs = self.ingestion_job_repository.dead_letter_stale_jobs(db, timedelta(seconds=settings.INGESTION_LOCK_TIMEOUT))
+        job_dtos = [IngestionJobDTO.from_entity(job) for job in jobs]
+        for job in job_dtos:
+            logger.error(f"진단 결과 처리 중 워커 중단, 재시도 초과: 작업ID={job.id}, 진단ID={job.diagnosis_id}")
+            self.update_diagnosis_state(db, job.diagnosis_id, DiagnosisStateDTO.FAILED)
+        return job_dtos
+
+    def renew_ingestion_job_lock(self, db: Session, job: IngestionJobDTO, worker_id: str) -> bool:
+        """처리 중인 작업의 잠금 갱신 (다른 워커가 이미 가져갔으면 False)"""
+        renewed = self.ingestion_job_repository.renew_lock(db, job.id, worker_id, job.attempts)
+        if not renewed:
+            logger.warning(f"작업 잠금을 잃음: 작업ID={job.id}, 워커={worker_id}, 시도={job.attempts}")
+        return renewed
+
+    def complete_ingestion_job(self, db: Session, job: IngestionJobDTO, worker_id: str) -> Optional[IngestionJobDTO]:
+        """작업 완료 처리 (잠금이 만료되어 다른 워커가 가져간 작업이면 변경하지 않음)"""
+        completed_job = self.ingestion_job_repository.mark_succeeded(db, job.id, worker_id, job.attempts)
+        if not completed_job:
+            logger.warning(f"다른 워커가 가져간 작업은 완료 처리하지 않음: 작업ID={job.id}, 워커={worker_id}, 시도={job.attempts}")
+        return IngestionJobDTO.from_entity(completed_job)
+
+    def fail_ingestion_job(self, db: Session, job: IngestionJobDTO, worker_id: str, error: str, retry_delay: Optional[timedelta]) -> Optional[IngestionJobDTO]:
+        """작업 실패 처리
+
+        재시도 횟수가 남아 있으면 `retry_delay` 후 다시 처리하도록 대기 상태로 되돌리고,
+        남아 있지 않으면 dead-letter 상태로 전환한 뒤 진단을 FAILED로 변경합니다.
+        잠금이 만료되어 다른 워커가 가져간 작업이면 변경하지 않습니다.
+        """
+        retry_at = get_datetime_now() + retry_delay if retry_delay is not None and job.attempts < job.max_attempts else None
+        failed_job = self.ingestion_job_repository.mark_failed(db, job.id, worker_id, job.attempts, error, retry_at)
+        if not failed_job:
+            logger.warning(f"다른 워커가 가져간 작업은 실패 처리하지 않음: 작업ID={job.id}, 워커={worker_id}, 시도={job.attempts}")
+        elif not retry_at:
+            logger.error(f"진단 결과 처리 재시도 초과: 작업ID={job.id}, 진단ID={job.diagnosis_id}")
+            self.update_diagnosis_state(db, job.diagnosis_id, DiagnosisStateDTO.FAILED)
+        return IngestionJobDTO.from_entity(failed_job)
+
+    async def process_ingestion_job(self, db: Session, job: IngestionJobDTO):
+        """큐에서 가져온 진단 결과 처리 작업 수행 (실패 시 예외 발생)
+
+        S3의 원본을 임시 파일로 내려받아 프로세스 풀에서 전처리하고, 결과(CSV, Parquet) 업로드 후
+        결과 기록과 COMPLETED 전환을 한 트랜잭션으로 DB에 반영합니다.
+        같은 작업이 다시 실행되어도 결과가 중복 저장되지 않도록 이미 기록된 진단은 전처리를 건너뛰고 COMPLETED 전환만 시도합니다.
+        """
+        source_path = None
+        processed_path = None
+        parquet_path = None
+        try:
+            if await self.task_executor.run_io(self.repository.get_results_by_diagnosis_id, db, job.diagnosis_id):
+                logger.info(f"이미 처리된 진단 결과: 진단ID={job.diagnosis_id}")
+                # 결과만 기록된 진단도 완료로 전환 (이미 전환된 경우 무시)
+                await self.task_executor.run_io(self.update_diagnosis_state, db, job.diagnosis_id, DiagnosisStateDTO.COMPLETED)
+                return
+
+            diagnosis = await self.task_executor.run_io(self.get_diagnosis_by_id, db, job.diagnosis_id)
+            if not diagnosis:
+                raise ValueError(f"진단을 찾을 수 없음: 진단ID={job.diagnosis_id}")
+
+            # 원본을 임시 파일로 내려받은 뒤 전처리
+            source_path = await self.task_executor.run_io(self._download_to_disk, job.original_file_path)
+            processed_path, parquet_path, score = await self.task_executor.run_cpu(preprocess_file, self.result_processor, diagnosis.type, source_path)
+            files = {job.processed_file_path: processed_path, self.parquet_file_path(job.processed_file_path): parquet_path}
+            if not await self.task_executor.run_io(self._upload_from_paths, files):
+                raise IOError(f"전처리 결과 업로드 실패: {job.processed_file_path}")
+
+            # 파일 정보 저장과 COMPLETED 전환을 함께 commit
+            completed_diagnosis = await self.task_executor.run_io(
+                self.repository.complete_with_result,
+                db,
+                job.diagnosis_id,
+                job.original_file_path,
+                job.processed_file_path,
+                score.score,
+                score.time_spent,
+                score.fps,
+            )
+            self._publish_state(job.diagnosis_id, DiagnosisStateDTO.COMPLETED, completed_diagnosis)
+        finally:
+            for path in (source_path, processed_path, parquet_path):
+                if path:
+                    with suppress(FileNotFoundError):
+                        os.remove(path)
+
+    def _download_to_disk(self, s3_file_path: str) -> str:
+        with NamedTemporaryFile(suffix=".csv", delete=False) as temp_file:
+            downloaded = self.storage_service.download_file(s3_file_path, temp_file)
+        if not downloaded:
+            os.remove(temp_file.name)
+            raise IOError(f"원본 파일 다운로드 실패: {s3_file_path}")
+        return temp_file.name
+
+    def _upload_from_paths(self, files: Dict[str, str]) -> bool:
+        """로컬 파일들을 S3 객체 경로별로 동시에 업로드"""
+        with ExitStack() as stack:
+            opened = {s3_file_path: stack.enter_context(open(local_path, "rb")) for s3_file_path, local_path in files.items()}
+            return self.storage_service.upload_files(opened)
+
+    async def get_diagnosis_record_metadata(self, db: AsyncSession, diagnosis_id: int) -> Optional[Tuple[DiagnosisDTO, DiagnosisResultDTO]]:
         """특정 진단 기록 메타데이터 조회"""
-        record = self.repository.get_diagnosis_record(db, diagnosis_id)
+        record = await self.async_repository.get_diagnosis_record(db, diagnosis_id)
         if not record:
             logger.info(f"진단 기록을 찾을 수 없음: 진단ID={diagnosis_id}")
             return None
@@ -146,32 +356,66 @@ class DiagnosisService:
         diagnosis, result = record
         return (DiagnosisDTO.from_entity(diagnosis), DiagnosisResultDTO.from_entity(result))
 
-    def get_diagnosis_file(self, db: Session, diagnosis_id: int) -> Tuple[Optional[str], Optional[io.BytesIO]]:
-        """특정 진단 기록 파일 경로 조회"""
-        record = self.repository.get_diagnosis_record(db, diagnosis_id)
+    async def get_diagnosis_file(
+        self,
+        db: AsyncSession,
+        diagnosis_id: int,
+        byte_range: Optional[str] = None,
+        accept_encoding: Optional[str] = None,
+        file_format: DiagnosisFileFormatDTO = DiagnosisFileFormatDTO.CSV,
+    ) -> Tuple[Optional[str], Optional[Union[CachedFile, ObjectStream]]]:
+        """특정 진단 기록 파일 조회
+
+        로컬 디스크 캐시에 있으면 캐시 파일(CachedFile)을, 아니면 S3 응답 본문 스트림(ObjectStream)을 반환합니다.
+        (Range 없는 요청의 스트림은 전달하면서 캐시에 기록)
+        스트림인 경우 byte_range가 주어지면 해당 범위만 조회하며, 요청 범위가 파일 크기를 벗어나면 InvalidRangeError가 발생합니다.
+        압축된 파일은 캐시 파일이면 압축된 그대로 반환하고, 스트림이면 accept_encoding에 따라 압축된 그대로 또는 풀어서 반환합니다.
+        Parquet은 전처리 CSV와 함께 저장되며, Parquet 도입 이전 기록에는 없으므로 (None, None)을 반환할 수 있습니다.
+        저장소 조회가 시간 제한(`STORAGE_READ_TIMEOUT`)을 넘기면 StorageTimeoutError가 발생합니다.
+        """
+        record = await self.async_repository.get_diagnosis_record(db, diagnosis_id)
         if not record:
             logger.info(f"진단 기록을 찾을 수 없음: 진단ID={diagnosis_id}")
             return None, None
 
         _, result = record
 
-        # S3 버킷 내 파일 경로
+        # S3 버킷 내 파일 경로 (전처리 파일은 한 번 저장되면 바뀌지 않으므로 캐시 가능)
         s3_file_path = result.processed_file_path
+        if file_format == DiagnosisFileFormatDTO.PARQUET:
+            s3_file_path = self.parquet_file_path(s3_file_path)
         filename = s3_file_path.split("/")[-1]
-        # 1. S3에서 파일 데이터 (bytes) 가져오기
-        file_bytes = self.s3_service.get_file_data(s3_file_path)
-        if file_bytes is None:
-            return filename, None
-
-        # 2. bytes 데이터를 BytesIO 객체로 변환
-        bytesio_obj = io.BytesIO(file_bytes)
-        return filename, bytesio_obj
-
-    def get_patient_diagnosis_records(
-        self, db: Session, patient_id: int, start_date: datetime, end_date: datetime
-    ) -> List[Tuple[DiagnosisDTO, DiagnosisResultDTO]]:
-        """환자의 진단 기록 리스트 조회"""
-        records = self.repository.get_diagnosis_records_by_patient(db, patient_id, start_date, end_date)
+        cached_file = await self.async_storage_service.get_cached_file(s3_file_path)
+        if cached_file:
+            return filename, cached_file
+        return filename, await self.async_storage_service.get_file_stream(s3_file_path, byte_range, accept_encoding)
+
+    async def get_patient_diagnosis_records(
+        self,
+        db: AsyncSession,
+        patient_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Tuple[DiagnosisDTO, DiagnosisResultDTO]], Optional[str]]:
+        """환자의 진단 기록 리스트 조회 (최신순)
+
+        limit이 주어지면 한 페이지만 조회하고, 다음 페이지가 있으면 다음 페이지 커서를 함께 반환합니다.
+        잘못된 커서는 ValueError를 발생시킵니다.
+        """
+        position = self.decode_record_cursor(cursor) if cursor else None
+        # 다음 페이지 존재 여부 확인을 위해 하나 더 조회
+        records = await self.async_repository.get_diagnosis_records_by_patient(
+            db, patient_id, start_date, end_date, limit=limit + 1 if limit else None, cursor=position
+        )
+
+        next_cursor = None
+        if limit and len(records) > limit:
+            records = records[:limit]
+            last_diagnosis, _ = records[-1]
+            next_cursor = self.encode_record_cursor(last_diagnosis.created_at, last_diagnosis.id)
+
         result_list = []
         for diagnosis, result in records:
             result_list.append(
@@ -180,4 +424,18 @@ class DiagnosisService:
                     DiagnosisResultDTO.from_entity(result),
                 )
             )
-        return result_list
+        return result_list, next_cursor
+
+    @staticmethod
+    def encode_record_cursor(created_at: datetime, diagnosis_id: int) -> str:
+        """진단 기록 페이지 커서 생성 (DB에 저장된 created_at 값 그대로 사용)"""
+        return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{diagnosis_id}".encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_record_cursor(cursor: str) -> Tuple[datetime, int]:
+        try:
+            decoded = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            created_at, diagnosis_id = decoded.split("|")
+            return datetime.fromisoformat(created_at), int(diagnosis_id)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"잘못된 커서입니다: {cursor}") from e
@@ -0,0 +1,224 @@
+from dataclasses import dataclass
+import glob
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional
+
+
+logger = logging.getLogger(__name__)
+
+TEMP_FILE_PREFIX = ".tmp-"
+# 비정상 종료로 남은 임시 파일 정리 기준 (초)
+TEMP_FILE_MAX_AGE = 3600
+# 압축되지 않은 항목의 파일명 표기
+IDENTITY_ENCODING = "identity"
+
+
+@dataclass(frozen=True)
+class CachedFile:
+    path: str
+    size: int
+    etag: str
+    content_encoding: Optional[str] = None  # 저장된 파일의 압축 방식 (None이면 압축되지 않음)
+
+
+class FileCache:
+    """S3 객체 로컬 디스크 캐시 (크기 제한, LRU 제거)
+
+    항목은 (객체 키, ETag)로 식별하며 `{sha256(키)}-{압축 방식}-{ETag}` 파일로 저장합니다. (압축된 객체는 압축된 그대로 저장)
+    전처리 파일처럼 한 번 쓰고 바뀌지 않는 객체(키에 생성 시각이 포함되어 덮어쓰지 않음)를 대상으로 하므로,
+    조회는 객체 키로만 하고(조회마다 HEAD 요청을 하지 않음) 객체를 삭제한 경우에만 `invalidate`로 무효화합니다.
+    임시 파일에 쓴 뒤 rename하므로 읽는 쪽에서 쓰다 만 파일을 볼 수 없고,
+    조회 시 파일 수정 시각을 갱신해 디렉터리 자체를 LRU 순서로 사용하므로 여러 프로세스가 같은 디렉터리를 공유할 수 있습니다.
+    """
+
+    def __init__(self, directory: str, max_size: int, max_entry_size: Optional[int] = None):
+        self.directory = directory
+        self.max_size = max_size
+        # 한 항목이 캐시 대부분을 밀어내지 않도록 기본값은 전체 크기의 1/4
+        self.max_entry_size = max_entry_size if max_entry_size is not None else max_size // 4
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[CachedFile]:
+        """캐시된 파일을 조회합니다. 조회된 항목은 가장 최근에 사용한 항목이 됩니다."""
+        for path in glob.glob(os.path.join(glob.escape(self.directory), f"{self._key_hash(key)}-*")):
+            try:
+                os.utime(path)  # LRU 순서 갱신
+                size = os.stat(path).st_size
+            except FileNotFoundError:
+                # 다른 프로세스가 제거한 경우
+                continue
+            parts = os.path.basename(path).split("-", 2)
+            if len(parts) != 3:
+                # 압축 방식이 없는 이전 형식의 항목은 사용하지 않음 (LRU로 제거됨)
+                continue
+            with self._lock:
+                self._hits += 1
+            _, encoding, etag = parts
+            return CachedFile(path=path, size=size, etag=f'"{etag}"', content_encoding=None if encoding == IDENTITY_ENCODING else encoding)
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def accepts(self, size: int) -> bool:
+        return size <= self.max_entry_size
+
+    def put(self, key: str, etag: str, chunks: Iterable[bytes], content_encoding: Optional[str] = None) -> Optional[CachedFile]:
+        """청크를 임시 파일에 기록한 뒤 캐시 파일로 rename합니다. 실패하면 None을 반환합니다."""
+        writer = self._open_writer(key, etag, content_encoding)
+        if writer is None:
+            return None
+        try:
+            for chunk in chunks:
+                writer.write(chunk)
+        except Exception as e:
+            logger.error(f"파일 캐시 저장 실패: 키={key}, 오류={e}")
+            writer.abort()
+            return None
+        return writer.commit()
+
+    def tee(self, key: str, etag: str, chunks: Iterable[bytes], content_encoding: Optional[str] = None) -> Iterator[bytes]:
+        """청크를 그대로 전달하면서 캐시 파일에도 기록합니다.
+
+        끝까지 읽은 경우에만 캐시에 저장하고, 중간에 멈추면(클라이언트 연결 끊김, 저장소 오류) 기록한 임시 파일을 버립니다.
+        캐시 기록에 실패해도(디스크 부족 등) 전달은 계속합니다.
+        """
+        writer = self._open_writer(key, etag, content_encoding)
+        completed = False
+        try:
+            for chunk in chunks:
+                if writer is not None:
+                    try:
+                        writer.write(chunk)
+                    except OSError as e:
+                        logger.error(f"파일 캐시 저장 실패: 키={key}, 오류={e}")
+                        writer.abort()
+                        writer = None
+                yield chunk
+            completed = True
+        finally:
+            if writer is not None:
+                if completed:
+                    writer.commit()
+                else:
+                    writer.abort()
+
+    def _open_writer(self, key: str, etag: str, content_encoding: Optional[str]) -> Optional["_CacheEntryWriter"]:
+        etag = etag.strip('"')
+        path = os.path.join(self.directory, f"{self._key_hash(key)}-{content_encoding or IDENTITY_ENCODING}-{etag}")
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=TEMP_FILE_PREFIX)
+        except OSError as e:
+            logger.error(f"파일 캐시 임시 파일 생성 실패: 키={key}, 오류={e}")
+            return None
+        return _CacheEntryWriter(self, key, path, temp_path, os.fdopen(fd, "wb"), etag, content_encoding)
+
+    def invalidate(self, key: str):
+        """키의 캐시 항목을 모두 제거합니다. (원본 객체를 삭제한 경우)"""
+        for path in glob.glob(os.path.join(glob.escape(self.directory), f"{self._key_hash(key)}-*")):
+            self._remove(path)
+
+    def _evict(self):
+        """전체 크기가 max_size 이하가 될 때까지 가장 오래 사용하지 않은 항목부터 제거"""
+        entries = []
+        total_size = 0
+        now = time.time()
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.name.startswith(TEMP_FILE_PREFIX):
+                    if now - stat.st_mtime > TEMP_FILE_MAX_AGE:
+                        self._remove(entry.path)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            if self._remove(path):
+                with self._lock:
+                    self._evictions += 1
+            total_size -= size
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def _key_hash(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        entries = 0
+        size = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.startswith(TEMP_FILE_PREFIX):
+                    continue
+                try:
+                    size += entry.stat().st_size
+                    entries += 1
+                except FileNotFoundError:
+                    continue
+        with self._lock:
+            requests = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / requests if requests else 0.0,
+                "evictions": self._evictions,
+                "entries": entries,
+                "size_bytes": size,
+                "max_size_bytes": self.max_size,
+            }
+
+
+class _CacheEntryWriter:
+    """캐시 항목 하나를 임시 파일에 기록하고, 완료되면 캐시 파일로 rename"""
+
+    def __init__(self, cache: FileCache, key: str, path: str, temp_path: str, file: BinaryIO, etag: str, content_encoding: Optional[str]):
+        self.cache = cache
+        self.key = key
+        self.path = path
+        self.temp_path = temp_path
+        self.file = file
+        self.etag = etag
+        self.content_encoding = content_encoding
+        self.size = 0
+
+    def write(self, chunk: bytes):
+        self.file.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> Optional[CachedFile]:
+        try:
+            self.file.close()
+            os.replace(self.temp_path, self.path)
+        except OSError as e:
+            logger.error(f"파일 캐시 저장 실패: 키={self.key}, 오류={e}")
+            self.abort()
+            return None
+        self.cache._evict()
+        return CachedFile(path=self.path, size=self.size, etag=f'"{self.etag}"', content_encoding=self.content_encoding)
+
+    def abort(self):
+        self.file.close()
+        FileCache._remove(self.temp_path)
@@ -0,0 +1,280 @@
+"""로컬 파일 시스템 저장소
+
+단일 노드 배포나 오프라인 테스트/벤치마크에서 S3 대신 사용합니다. (`STORAGE_BACKEND=local`)
+객체 키를 `LOCAL_STORAGE_DIR` 아래의 상대 경로로 그대로 사용합니다.
+
+- 쓰기: 같은 디렉터리의 임시 파일에 기록하고 fsync 후 `os.replace`로 교체하므로 읽는 쪽은 쓰다 만 파일을 보지 않습니다.
+  교체 후 디렉터리도 fsync하므로 `upload_file`이 True를 반환하면 장애 후에도 파일이 남아 있습니다.
+- 복사: 양쪽이 디스크의 파일이면 `os.sendfile`로 사용자 공간을 거치지 않고 복사합니다.
+- 읽기: 저장된 파일 자체를 `CachedFile`로 반환하므로 다운로드 API가 별도 캐시 없이 `FileResponse`로 전송합니다.
+- 압축 저장(`S3_CONTENT_ENCODING`)과 presigned URL은 지원하지 않습니다.
+"""
+
+from contextlib import suppress
+from datetime import datetime, timezone
+import logging
+import os
+import re
+import shutil
+import tempfile
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.services.file_cache import CachedFile
+from app.services.storage_service import InvalidRangeError, ObjectStream, StorageService
+
+
+logger = logging.getLogger(__name__)
+
+TEMP_FILE_PREFIX = ".tmp-"
+# sendfile을 쓸 수 없을 때 복사 단위
+COPY_CHUNK_SIZE = 1024 * 1024
+BYTE_RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+class LocalFileBody:
+    """파일의 일정 범위를 청크 단위로 읽는 객체 본문"""
+
+    def __init__(self, file: BinaryIO, length: int):
+        self.file = file
+        self.length = length
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        remaining = self.length
+        while remaining > 0:
+            chunk = self.file.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+    def close(self):
+        self.file.close()
+
+
+def resolve_byte_range(byte_range: str, size: int) -> Tuple[int, int]:
+    """Range 헤더 값(단일 범위)을 (시작, 끝) 위치로 변환합니다. 끝 위치는 포함입니다.
+
+    Raises:
+        InvalidRangeError: 형식이 잘못되었거나 범위가 파일 크기를 벗어난 경우
+    """
+    match = BYTE_RANGE_PATTERN.fullmatch(byte_range.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        raise InvalidRangeError(size)
+
+    first, last = match.groups()
+    if not first:
+        # 마지막 N바이트 (bytes=-N)
+        if int(last) == 0 or size == 0:
+            raise InvalidRangeError(size)
+        return max(size - int(last), 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise InvalidRangeError(size)
+    return start, end
+
+
+def _fileno(file: BinaryIO) -> Optional[int]:
+    """디스크 파일이면 파일 디스크립터를 반환 (메모리에 있는 BytesIO, SpooledTemporaryFile은 None)"""
+    if getattr(file, "_rolled", True) is False:
+        return None
+    try:
+        return file.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _fsync_dir(path: str):
+    """디렉터리 항목 변경(rename)을 디스크에 기록 (지원하지 않는 플랫폼은 무시)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def copy_file(src: BinaryIO, dst: BinaryIO):
+    """src의 현재 위치부터 끝까지 dst에 복사 (가능하면 os.sendfile 사용)"""
+    src_fd, dst_fd = _fileno(src), _fileno(dst)
+    if src_fd is not None and dst_fd is not None:
+        dst.flush()
+        offset = src.tell()
+        size = os.fstat(src_fd).st_size
+        try:
+            while offset < size:
+                sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except OSError:
+            # 파일 간 sendfile을 지원하지 않는 플랫폼이면 일반 복사로 이어서 진행
+            pass
+        # sendfile은 파일 객체의 위치를 갱신하지 않으므로 맞춰 줌
+        src.seek(offset)
+        dst.seek(os.lseek(dst_fd, 0, os.SEEK_CUR))
+    shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+
+
+class LocalStorageService(StorageService):
+    def __init__(self, root_dir: str):
+        # 저장된 파일을 그대로 전송하므로 파일 캐시를 두지 않음
+        super().__init__(file_cache=None)
+        self.root_dir = os.path.abspath(root_dir)
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def _path(self, file_path: str) -> str:
+        """객체 키를 저장 경로로 변환 (저장소 디렉터리 밖을 가리키는 키는 거부)"""
+        path = os.path.normpath(os.path.join(self.root_dir, file_path))
+        if not path.startswith(self.root_dir + os.sep):
+            raise ValueError(f"잘못된 객체 경로: {file_path}")
+        return path
+
+    @staticmethod
+    def _etag(stat: os.stat_result) -> str:
+        return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+    def upload_file(self, file_path: str, file: BinaryIO) -> bool:
+        """파일 저장 (임시 파일에 기록 후 원자적으로 교체)"""
+        try:
+            path = self._path(file_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=TEMP_FILE_PREFIX)
+            try:
+                with os.fdopen(fd, "wb") as temp_file:
+                    copy_file(file, temp_file)
+                    temp_file.flush()
+                    os.fsync(temp_file.fileno())
+                os.replace(temp_path, path)
+                _fsync_dir(os.path.dirname(path))
+            except BaseException:
+                with suppress(FileNotFoundError):
+                    os.remove(temp_path)
+                raise
+            return True
+        except Exception as e:
+            logger.error(f"파일 저장 실패: 경로={file_path}, 오류={e}")
+            return False
+
+    def download_file(self, file_path: str, file: BinaryIO) -> bool:
+        """저장된 파일을 파일 객체에 복사"""
+        try:
+            with open(self._path(file_path), "rb") as src:
+                copy_file(src, file)
+            return True
+        except Exception as e:
+            logger.error(f"파일 다운로드 실패: 경로={file_path}, 오류={e}")
+            return False
+
+    def head_file(self, file_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            stat = os.stat(self._path(file_path))
+        except (OSError, ValueError) as e:
+            logger.error(f"파일 메타데이터 조회 실패: 경로={file_path}, 오류={e}")
+            return None
+        last_modified = datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat()
+        return {"etag": self._etag(stat), "size": stat.st_size, "last_modified": last_modified}
+
+    def list_objects(self, prefix: str = "", start_after: Optional[str] = None, delimiter: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """접두사로 시작하는 객체를 키 순서로 반환 (접두사의 디렉터리 아래만, 필요한 디렉터리만 탐색)"""
+        base_key = prefix[: prefix.rindex("/") + 1] if "/" in prefix else ""
+        try:
+            base_dir = self._path(base_key) if base_key else self.root_dir
+        except ValueError:
+            return
+
+        def skip(key: str, is_dir: bool) -> bool:
+            # 디렉터리 키는 "/"로 끝나며, 하위 객체 키는 모두 디렉터리 키로 시작함
+            if not (key.startswith(prefix) or (is_dir and prefix.startswith(key))):
+                return True
+            if start_after and (key <= start_after if not is_dir else key < start_after and not start_after.startswith(key)):
+                return True
+            return bool(delimiter) and key.startswith(prefix) and delimiter in key[len(prefix) : -1 if is_dir else None]
+
+        for key, path in self._iter_files(base_dir, base_key, skip):
+            with suppress(FileNotFoundError):
+                stat = os.stat(path)
+                yield {"key": key, "size": stat.st_size, "last_modified": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat()}
+
+    def _iter_files(self, directory: str, key_prefix: str, skip: Callable[[str, bool], bool]) -> Iterator[Tuple[str, str]]:
+        """디렉터리 아래 파일을 (키, 경로)로 키 순서대로 반환 (디렉터리는 "이름/"으로 정렬해야 키 순서와 같음)"""
+        try:
+            with os.scandir(directory) as it:
+                entries = [(entry.name + "/" if entry.is_dir(follow_symlinks=False) else entry.name, entry.path) for entry in it]
+        except (FileNotFoundError, NotADirectoryError):
+            return
+
+        for name, path in sorted(entries):
+            if name.startswith(TEMP_FILE_PREFIX):
+                continue
+            key = key_prefix + name
+            is_dir = name.endswith("/")
+            if skip(key, is_dir):
+                continue
+            if is_dir:
+                yield from self._iter_files(path, key, skip)
+            else:
+                yield key, path
+
+    def delete_objects(self, file_paths: Iterable[str]) -> List[str]:
+        """파일을 삭제하고 비게 된 상위 디렉터리를 정리합니다."""
+        failed = []
+        for file_path in file_paths:
+            try:
+                path = self._path(file_path)
+                with suppress(FileNotFoundError):
+                    os.remove(path)
+            except (OSError, ValueError) as e:
+                logger.error(f"파일 삭제 실패: 경로={file_path}, 오류={e}")
+                failed.append(file_path)
+                continue
+            self._remove_empty_dirs(os.path.dirname(path))
+        return failed
+
+    def _remove_empty_dirs(self, directory: str):
+        while directory.startswith(self.root_dir + os.sep):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                # 비어 있지 않거나 이미 삭제됨
+                return
+            directory = os.path.dirname(directory)
+
+    def _get_object_stream(self, file_path: str, byte_range: Optional[str] = None) -> Optional[ObjectStream]:
+        try:
+            file = open(self._path(file_path), "rb")
+        except (OSError, ValueError) as e:
+            logger.error(f"파일 조회 실패: 경로={file_path}, 오류={e}")
+            return None
+
+        stat = os.fstat(file.fileno())
+        if not byte_range:
+            return ObjectStream(body=LocalFileBody(file, stat.st_size), content_length=stat.st_size, etag=self._etag(stat))
+
+        try:
+            start, end = resolve_byte_range(byte_range, stat.st_size)
+        except InvalidRangeError:
+            file.close()
+            raise
+        file.seek(start)
+        length = end - start + 1
+        return ObjectStream(
+            body=LocalFileBody(file, length),
+            content_length=length,
+            etag=self._etag(stat),
+            content_range=f"bytes {start}-{end}/{stat.st_size}",
+        )
+
+    def get_cached_file(self, file_path: str) -> Optional[CachedFile]:
+        """저장된 파일을 그대로 반환합니다. (이미 로컬 디스크에 있으므로 캐시를 거치지 않음)"""
+        try:
+            path = self._path(file_path)
+            stat = os.stat(path)
+        except (OSError, ValueError):
+            return None
+        return CachedFile(path=path, size=stat.st_size, etag=self._etag(stat))
@@ -1,19 +1,92 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import batched
 import logging
-from typing import Any, BinaryIO, Dict, List, Optional
+import os
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from app.configs.env_configs import settings
+from app.core.metrics import OperationMetrics
+from app.core.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, call_with_retry
+from app.services.file_cache import FileCache
+from app.services.storage_service import DELETE_BATCH_SIZE, InvalidRangeError, ObjectStream, StorageService
+from app.utils import SUPPORTED_ENCODINGS, compress_file
 import boto3
-from botocore.exceptions import ClientError
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError, ConnectionError, HTTPClientError
 
 
 logger = logging.getLogger(__name__)
 
+# presigned PUT URL로 업로드할 때 클라이언트가 보내야 하는 Content-Type (서명에 포함됨)
+PRESIGNED_UPLOAD_CONTENT_TYPE = "application/octet-stream"
+# 자체적으로 압축된 형식이라 S3_CONTENT_ENCODING을 적용하지 않는 객체
+UNCOMPRESSED_SUFFIXES = (".parquet",)
+# ListObjectsV2 한 페이지의 최대 키 수 (S3 최대값)
+LIST_PAGE_SIZE = 1000
+# head_files에서 동시에 보내는 HEAD 요청 수
+HEAD_BATCH_CONCURRENCY = 16
+# 재시도하는 S3 오류 코드 (그 외 5xx 응답도 재시도)
+RETRYABLE_ERROR_CODES = {"SlowDown", "Throttling", "ThrottlingException", "RequestTimeout", "InternalError", "ServiceUnavailable"}
 
-class S3Service:
-    def __init__(self, bucket_name: str = None):
+
+def is_retryable_error(error: Exception) -> bool:
+    """일시적인 S3 오류인지 확인 (연결 실패/시간 초과, 5xx, 스로틀링)"""
+    if isinstance(error, (ConnectionError, HTTPClientError)):
+        return True
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code")
+        status_code = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+        return code in RETRYABLE_ERROR_CODES or status_code >= 500
+    return False
+
+
+class S3Service(StorageService):
+    def __init__(self, bucket_name: str = None, file_cache: Optional[FileCache] = None):
+        super().__init__(file_cache)
         # 버킷 이름을 파라미터로 받지 않으면 환경 변수에서 가져옴
         self.bucket_name = bucket_name or settings.S3_BUCKET_NAME
         self.region_name = settings.AWS_REGION
+        # 업로드 시 압축 방식 (None이면 압축하지 않음)
+        content_encoding = settings.S3_CONTENT_ENCODING
+        if content_encoding not in (*SUPPORTED_ENCODINGS, "identity"):
+            raise ValueError(f"지원하지 않는 S3_CONTENT_ENCODING: {content_encoding}")
+        self.content_encoding = None if content_encoding == "identity" else content_encoding
+
+        # 파일 하나를 파트 단위로 병렬 전송하는 설정 (upload_fileobj/download_fileobj에 사용)
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=settings.S3_MAX_CONCURRENCY,
+        )
+        # 모든 전송이 같은 커넥션 풀을 공유하므로 (동시 파일 수 x max_concurrency)보다 작으면 커넥션 대기가 발생함
+        # 요청마다 연결/응답 시간 제한을 두어 멈춘 연결이 스레드를 계속 점유하지 않도록 함
+        # 재시도는 retry_policy가 담당하므로 botocore 자체 재시도는 끔 (시도 수와 기한을 한 곳에서 관리)
+        client_config = Config(
+            max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+            connect_timeout=settings.S3_CONNECT_TIMEOUT,
+            read_timeout=settings.S3_READ_TIMEOUT,
+            retries={"total_max_attempts": 1},
+        )
+        self.retry_policy = RetryPolicy(
+            max_attempts=settings.S3_RETRY_MAX_ATTEMPTS,
+            base_delay=settings.S3_RETRY_BASE_SECONDS,
+            max_delay=settings.S3_RETRY_MAX_SECONDS,
+            deadline=settings.S3_RETRY_DEADLINE_SECONDS,
+        )
+        # S3 장애 중에는 요청을 보내지 않고 바로 실패 (스레드와 커넥션이 시간 초과를 기다리며 쌓이지 않도록)
+        self.circuit_breaker = CircuitBreaker("s3", settings.S3_CIRCUIT_FAILURE_THRESHOLD, settings.S3_CIRCUIT_RESET_SECONDS)
+        self.metrics = OperationMetrics()
+        # 여러 파일 동시 업로드용 스레드 풀 (커넥션 풀을 넘지 않도록 파일 수를 제한)
+        self._upload_executor = ThreadPoolExecutor(
+            max_workers=max(2, settings.S3_MAX_POOL_CONNECTIONS // settings.S3_MAX_CONCURRENCY), thread_name_prefix="s3-upload"
+        )
+        # head_files용 스레드 풀 (HEAD 요청은 커넥션을 하나씩만 사용)
+        self.head_batch_concurrency = min(HEAD_BATCH_CONCURRENCY, settings.S3_MAX_POOL_CONNECTIONS)
+        self._head_executor = ThreadPoolExecutor(max_workers=self.head_batch_concurrency, thread_name_prefix="s3-head")
+        self.list_page_size = LIST_PAGE_SIZE
 
         # local 환경에서는 LocalStack 사용, 그 외(production)에는 실제 AWS S3 사용
         if settings.is_local:
@@ -27,13 +100,45 @@ class S3Service:
                 region_name=self.region_name,
                 aws_access_key_id="test",  # LocalStack에서는 아무 값이나 사용 가능
                 aws_secret_access_key="test",  # LocalStack에서는 아무 값이나 사용 가능
+                config=client_config,
             )
 
             # 버킷이 존재하는지 확인하고 없으면 생성
             self._ensure_bucket_exists()
         else:
             # 프로덕션 환경에서는 실제 AWS S3 사용
-            self.s3_client = boto3.client("s3", region_name=self.region_name)
+            self.s3_client = boto3.client("s3", region_name=self.region_name, config=client_config)
+
+    def _call(self, operation: str, func: Callable, *args, **kwargs) -> Any:
+        """S3 요청을 재시도 정책과 서킷 브레이커를 거쳐 실행하고 작업별 지표를 기록합니다.
+
+        Raises:
+            CircuitOpenError: 서킷이 열려 있는 경우
+        """
+
+        def on_retry(attempt: int, error: Exception, delay: float):
+            self.metrics.increment(operation, "retries")
+            logger.warning(f"S3 요청 재시도: 작업={operation}, 시도={attempt}, 대기={delay:.2f}초, 오류={error}")
+
+        try:
+            return call_with_retry(
+                partial(func, *args, **kwargs),
+                self.retry_policy,
+                is_retryable_error,
+                self.circuit_breaker,
+                on_attempt=lambda seconds, error: self.metrics.record(operation, seconds, error is None),
+                on_retry=on_retry,
+            )
+        except CircuitOpenError:
+            self.metrics.increment(operation, "rejected")
+            raise
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"circuit_breaker": self.circuit_breaker.snapshot(), "operations": self.metrics.snapshot()}
+
+    def shutdown(self) -> None:
+        self._upload_executor.shutdown()
+        self._head_executor.shutdown()
 
     def _ensure_bucket_exists(self) -> None:
         """LocalStack에서 버킷이 존재하는지 확인하고 없으면 생성합니다."""
@@ -75,32 +180,109 @@ class S3Service:
         """
         try:
             response = self.s3_client.generate_presigned_url(
-                "put_object", Params={"Bucket": self.bucket_name, "Key": object_name, "ContentType": "application/octet-stream"}, ExpiresIn=expiration
+                "put_object", Params={"Bucket": self.bucket_name, "Key": object_name, "ContentType": PRESIGNED_UPLOAD_CONTENT_TYPE}, ExpiresIn=expiration
             )
             return response
         except ClientError as e:
             logger.error(f"Error generating presigned URL: {e}")
             return None
 
-    def list_objects(self, prefix: str = "") -> List[Dict[str, Any]]:
+    def list_objects(self, prefix: str = "", start_after: Optional[str] = None, delimiter: Optional[str] = None) -> Iterator[Dict[str, Any]]:
         """
-        S3 버킷 내 객체 목록을 조회합니다.
+        S3 버킷 내 객체 목록을 페이지 단위로 조회하며 반환합니다. (continuation token으로 다음 페이지를 요청)
 
         Args:
             prefix (str): 객체 접두사(폴더)
+            start_after (str): 이 키 다음부터 조회
+            delimiter (str): 주어지면 접두사 바로 아래 객체만 반환
 
         Returns:
-            List[Dict]: 객체 목록
+            Iterator[Dict]: 객체 목록 (key, size, last_modified)
         """
-        try:
-            response = self.s3_client.list_objects_v2(Bucket=self.bucket_name, Prefix=prefix)
+        for page in self._list_pages(prefix, start_after, delimiter):
+            for item in page.get("Contents", ()):
+                yield {"key": item["Key"], "size": item["Size"], "last_modified": item["LastModified"].isoformat()}
 
-            if "Contents" in response:
-                return [{"key": item["Key"], "size": item["Size"], "last_modified": item["LastModified"].isoformat()} for item in response["Contents"]]
-            return []
-        except ClientError as e:
-            logger.error(f"Error listing S3 objects: {e}")
-            return []
+    def list_prefixes(self, prefix: str = "", delimiter: str = "/", start_after: Optional[str] = None) -> Iterator[str]:
+        # 하위 객체는 S3가 CommonPrefixes로 묶어서 반환하므로 디렉터리 수만큼만 전송됨
+        for page in self._list_pages(prefix, start_after, delimiter):
+            for item in page.get("CommonPrefixes", ()):
+                if start_after is None or item["Prefix"] > start_after:
+                    yield item["Prefix"]
+
+    def _list_pages(self, prefix: str, start_after: Optional[str], delimiter: Optional[str]) -> Iterator[Dict[str, Any]]:
+        params = {"Bucket": self.bucket_name, "Prefix": prefix, "MaxKeys": self.list_page_size}
+        if start_after:
+            params["StartAfter"] = start_after
+        if delimiter:
+            params["Delimiter"] = delimiter
+        while True:
+            page = self._call("list", self.s3_client.list_objects_v2, **params)
+            yield page
+            if not page.get("IsTruncated"):
+                return
+            params["ContinuationToken"] = page["NextContinuationToken"]
+
+    def delete_objects(self, file_paths: Iterable[str]) -> List[str]:
+        """
+        S3 객체를 DeleteObjects 요청 하나당 최대 1000개씩 삭제합니다.
+
+        Args:
+            file_paths (Iterable[str]): 삭제할 객체 경로
+
+        Returns:
+            List[str]: 삭제하지 못한 객체 경로
+        """
+        failed = []
+        for batch in batched(file_paths, DELETE_BATCH_SIZE):
+            try:
+                # Quiet 모드에서는 실패한 키만 응답에 포함됨
+                response = self._call(
+                    "delete", self.s3_client.delete_objects, Bucket=self.bucket_name, Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+                )
+            except (ClientError, BotoCoreError, CircuitOpenError) as e:
+                logger.error(f"Error deleting S3 objects: {e}")
+                failed.extend(batch)
+                continue
+
+            errors = {error["Key"]: error.get("Code") for error in response.get("Errors", ())}
+            if errors:
+                logger.error(f"Error deleting S3 objects: {len(errors)}개 실패, 예: {next(iter(errors.items()))}")
+            for key in batch:
+                if key in errors:
+                    failed.append(key)
+                elif self.file_cache is not None:
+                    self.file_cache.invalidate(key)
+        return failed
+
+    def head_files(self, file_paths: Iterable[str]) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """여러 객체의 HEAD 요청을 동시에 보내고 입력 순서대로 반환합니다. (한 번에 HEAD_BATCH_CONCURRENCY개까지 진행)"""
+        window = deque()
+        for file_path in file_paths:
+            window.append((file_path, self._head_executor.submit(self.head_file, file_path)))
+            if len(window) >= self.head_batch_concurrency:
+                file_path, future = window.popleft()
+                yield file_path, future.result()
+        while window:
+            file_path, future = window.popleft()
+            yield file_path, future.result()
+
+    def head_file(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        S3 객체 메타데이터를 조회합니다. (본문은 받지 않음)
+
+        Args:
+            file_path (str): S3 객체 경로
+
+        Returns:
+            Dict: 객체 메타데이터 (etag, size, last_modified) 또는 객체가 없거나 에러 발생 시 None
+        """
+        try:
+            response = self._call("head", self.s3_client.head_object, Bucket=self.bucket_name, Key=file_path)
+            return {"etag": response["ETag"], "size": response["ContentLength"], "last_modified": response["LastModified"].isoformat()}
+        except (ClientError, BotoCoreError, CircuitOpenError) as e:
+            logger.error(f"Error retrieving S3 object metadata: {e}")
+            return None
 
     def generate_download_url(self, object_name: str, expiration: int = 3600) -> Optional[str]:
         """
@@ -121,19 +303,107 @@ class S3Service:
             return None
 
     def upload_file(self, file_path: str, file: BinaryIO) -> bool:
-        """S3에 파일 업로드"""
+        """S3에 파일 업로드 (S3_CONTENT_ENCODING에 따라 압축하고 Content-Encoding 메타데이터를 함께 저장)
+
+        일시적 오류는 retry_policy에 따라 다시 업로드하고, 업로드 후 HEAD로 저장된 크기를 확인한 뒤에만 True를 반환합니다.
+        """
+        try:
+            if not self.content_encoding or file_path.endswith(UNCOMPRESSED_SUFFIXES):
+                self._put_object(file_path, file)
+                return True
+
+            with compress_file(file, self.content_encoding, settings.RESULT_SPOOL_MAX_SIZE) as compressed:
+                self._put_object(file_path, compressed, {"ContentEncoding": self.content_encoding})
+            return True
+        except Exception as e:
+            logger.error(f"Error uploading file to S3: 경로={file_path}, 오류={e}")
+            return False
+
+    def _put_object(self, file_path: str, file: BinaryIO, extra_args: Optional[Dict[str, str]] = None):
+        """파일 객체를 현재 위치부터 업로드하고 저장된 크기를 확인 (재시도 시 시작 위치로 되돌려 다시 업로드)"""
+        start = file.tell()
+        size = file.seek(0, os.SEEK_END) - start
+
+        def upload():
+            file.seek(start)
+            self.s3_client.upload_fileobj(file, self.bucket_name, file_path, ExtraArgs=extra_args, Config=self.transfer_config)
+
+        self._call("put", upload)
+        stored_size = self._call("head", self.s3_client.head_object, Bucket=self.bucket_name, Key=file_path)["ContentLength"]
+        if stored_size != size:
+            raise IOError(f"업로드 크기 불일치: 경로={file_path}, 업로드={size}, 저장={stored_size}")
+
+    def upload_files(self, files: Dict[str, BinaryIO]) -> bool:
+        """
+        여러 파일을 동시에 S3에 업로드합니다. (예: 진단 결과 원본과 전처리 파일)
+
+        Args:
+            files (Dict[str, BinaryIO]): S3 객체 경로별 파일 객체
+
+        Returns:
+            bool: 모든 파일 업로드 성공 여부 (일부만 실패해도 성공한 객체는 삭제하지 않음)
+        """
+        futures = [self._upload_executor.submit(self.upload_file, file_path, file) for file_path, file in files.items()]
+        results = [future.result() for future in futures]
+        return all(results)
+
+    def download_file(self, file_path: str, file: BinaryIO) -> bool:
+        """S3에서 파일을 내려받아 파일 객체에 기록 (압축된 객체는 풀어서 기록)"""
         try:
-            self.s3_client.upload_fileobj(file, self.bucket_name, file_path)
+            file_stream = self._get_object_stream(file_path)
+            if file_stream is None:
+                return False
+            if not file_stream.content_encoding:
+                # 압축되지 않은 객체(압축 도입 이전 객체, 직접 업로드 원본)는 파트 단위 병렬 다운로드
+                file_stream.body.close()
+                start = file.tell()
+
+                def download():
+                    # 재시도 시 앞선 시도에서 기록한 내용을 지우고 처음부터 다시 기록
+                    file.seek(start)
+                    file.truncate()
+                    self.s3_client.download_fileobj(self.bucket_name, file_path, file, Config=self.transfer_config)
+
+                self._call("get", download)
+                return True
+
+            for chunk in file_stream.decoded().iter_chunks():
+                file.write(chunk)
             return True
         except Exception as e:
-            logger.error(f"Error uploading file to S3: {e}")
+            logger.error(f"Error downloading file from S3: {e}")
             return False
 
-    def get_file_data(self, file_path: str) -> Optional[bytes]:
-        """S3에서 파일 데이터 가져오기"""
+    def _get_object_stream(self, file_path: str, byte_range: Optional[str] = None) -> Optional[ObjectStream]:
+        """S3 객체 본문을 저장된 그대로(압축된 경우 압축된 바이트) 스트림으로 가져옵니다.
+
+        응답을 받기까지만 재시도하며, 본문을 읽는 도중의 오류는 재시도하지 않습니다.
+
+        Raises:
+            InvalidRangeError: 요청한 범위가 객체 크기를 벗어난 경우
+            CircuitOpenError: 서킷이 열려 있는 경우
+        """
+        params = {"Bucket": self.bucket_name, "Key": file_path}
+        if byte_range:
+            params["Range"] = byte_range
         try:
-            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=file_path)
-            return response["Body"].read()
+            response = self._call("get", self.s3_client.get_object, **params)
         except ClientError as e:
-            logger.error(f"Error retrieving file from S3: {e}")
+            error = e.response.get("Error", {})
+            if error.get("Code") == "InvalidRange":
+                object_size = error.get("ActualObjectSize")
+                raise InvalidRangeError(int(object_size) if object_size else None) from e
+            logger.error(f"Error streaming file from S3: {e}")
             return None
+
+        content_encoding = response.get("ContentEncoding")
+
+        return ObjectStream(
+            body=response["Body"],
+            content_length=response["ContentLength"],
+            etag=response["ETag"],
+            content_type=response.get("ContentType"),
+            content_range=response.get("ContentRange"),
+            # 알 수 없는 압축 방식은 클라이언트에 그대로 전달하지 않도록 원본으로 취급
+            content_encoding=content_encoding if content_encoding in SUPPORTED_ENCODINGS else None,
+        )
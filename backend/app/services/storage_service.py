@@ -0,0 +1,255 @@
+"""파일 저장소 인터페이스
+
+진단 결과 원본/전처리 파일을 저장하는 백엔드입니다. `STORAGE_BACKEND` 설정으로 선택합니다.
+
+- `s3`: AWS S3 (local 환경에서는 LocalStack) - `S3Service`
+- `local`: 로컬 파일 시스템 - `LocalStorageService` (단일 노드 배포, 오프라인 테스트/벤치마크용)
+
+객체는 `diagnosis/{id}/processed/result.csv` 같은 키로 식별하며, 본문은 저장된 그대로(압축된 경우 압축된 바이트) 읽은 뒤
+`Content-Encoding`에 따라 풀어서 반환하는 공통 로직은 이 모듈의 `StorageService`가 담당합니다.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+import logging
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Protocol, Tuple
+
+from app.services.file_cache import CachedFile, FileCache
+from app.utils import accepts_encoding, iter_decompressed
+
+
+logger = logging.getLogger(__name__)
+
+# 스트리밍 다운로드 시 한 번에 읽는 크기 (다운로드당 메모리 사용량)
+STREAM_CHUNK_SIZE = 64 * 1024
+# delete_objects 한 번에 삭제 요청하는 키 수 (S3 DeleteObjects 최대값)
+DELETE_BATCH_SIZE = 1000
+
+
+class InvalidRangeError(Exception):
+    """요청한 Range가 객체 크기를 벗어난 경우 (HTTP 416)"""
+
+    def __init__(self, object_size: Optional[int] = None):
+        super().__init__(f"Invalid range (object size: {object_size})")
+        self.object_size = object_size
+
+
+class ObjectBody(Protocol):
+    """객체 본문 (botocore StreamingBody와 같은 인터페이스)"""
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[bytes]: ...
+
+    def close(self) -> None: ...
+
+
+@dataclass
+class ObjectStream:
+    """저장소 객체 스트림 (본문은 읽는 만큼만 저장소에서 받아옴)"""
+
+    body: ObjectBody
+    content_length: Optional[int]  # 압축을 풀어서 전달하는 경우 None
+    etag: str
+    content_type: Optional[str] = None
+    content_range: Optional[str] = None  # Range 요청인 경우 "bytes {start}-{end}/{size}"
+    content_encoding: Optional[str] = None  # 전달하는 본문의 압축 방식 (None이면 압축되지 않은 원본)
+    decode_encoding: Optional[str] = None  # 읽으면서 풀어야 하는 압축 방식
+
+    def iter_chunks(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        try:
+            chunks = self.body.iter_chunks(chunk_size)
+            if self.decode_encoding:
+                chunks = iter_decompressed(chunks, self.decode_encoding)
+            yield from chunks
+        finally:
+            self.body.close()
+
+    def decoded(self) -> "ObjectStream":
+        """압축을 풀어서 전달하는 스트림 (크기를 미리 알 수 없고, 표현이 달라지므로 약한 ETag 사용)"""
+        if not self.content_encoding:
+            return self
+        return replace(self, content_length=None, etag=f"W/{self.etag}", content_range=None, content_encoding=None, decode_encoding=self.content_encoding)
+
+
+class CachingObjectBody:
+    """저장된 그대로의 본문을 읽으면서 로컬 디스크 캐시에도 기록 (끝까지 읽은 경우에만 캐시에 저장)"""
+
+    def __init__(self, body: ObjectBody, file_cache: FileCache, key: str, etag: str, content_encoding: Optional[str]):
+        self.body = body
+        self.file_cache = file_cache
+        self.key = key
+        self.etag = etag
+        self.content_encoding = content_encoding
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        return self.file_cache.tee(self.key, self.etag, self.body.iter_chunks(chunk_size), self.content_encoding)
+
+    def close(self) -> None:
+        self.body.close()
+
+
+class StorageService(ABC):
+    def __init__(self, file_cache: Optional[FileCache] = None):
+        self.file_cache = file_cache
+
+    @abstractmethod
+    def upload_file(self, file_path: str, file: BinaryIO) -> bool:
+        """파일 객체를 현재 위치부터 끝까지 저장합니다. 같은 키가 있으면 덮어씁니다."""
+
+    @abstractmethod
+    def head_file(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """객체 메타데이터 (etag, size, last_modified) 또는 객체가 없거나 에러 발생 시 None"""
+
+    @abstractmethod
+    def list_objects(self, prefix: str = "", start_after: Optional[str] = None, delimiter: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """접두사로 시작하는 객체(key, size, last_modified)를 키 순서로 필요한 만큼만 조회하며 반환합니다.
+
+        Args:
+            prefix (str): 객체 접두사
+            start_after (str): 이 키 다음부터 조회 (중단한 위치부터 이어서 조회할 때 사용)
+            delimiter (str): 주어지면 접두사 뒤에 구분자가 없는 객체(해당 "디렉터리" 바로 아래 객체)만 반환
+
+        Raises:
+            조회 중 저장소 오류가 발생하면 예외를 그대로 발생시킵니다. (목록이 잘린 채로 끝나지 않도록)
+        """
+
+    def list_prefixes(self, prefix: str = "", delimiter: str = "/", start_after: Optional[str] = None) -> Iterator[str]:
+        """접두사 아래의 "디렉터리"(접두사 뒤 첫 구분자까지의 공통 접두사)를 키 순서로 반환합니다.
+
+        예: `list_prefixes("diagnosis/")` -> "diagnosis/1/", "diagnosis/10/", ...
+        start_after가 주어지면 그보다 뒤의 디렉터리만 반환하므로, 마지막으로 처리한 디렉터리를 넘겨 이어서 조회할 수 있습니다.
+        """
+        last = start_after
+        for item in self.list_objects(prefix, start_after):
+            rest = item["key"][len(prefix) :]
+            if delimiter not in rest:
+                continue
+            common_prefix = prefix + rest[: rest.index(delimiter) + len(delimiter)]
+            if last is None or common_prefix > last:
+                last = common_prefix
+                yield common_prefix
+
+    @abstractmethod
+    def delete_objects(self, file_paths: Iterable[str]) -> List[str]:
+        """객체를 일괄 삭제합니다. 없는 객체는 삭제된 것으로 봅니다.
+
+        Args:
+            file_paths (Iterable[str]): 삭제할 객체 경로 (list_objects의 결과처럼 지연 생성되는 값도 가능)
+
+        Returns:
+            List[str]: 삭제하지 못한 객체 경로 (모두 삭제되면 빈 목록)
+        """
+
+    @abstractmethod
+    def _get_object_stream(self, file_path: str, byte_range: Optional[str] = None) -> Optional[ObjectStream]:
+        """객체 본문을 저장된 그대로(압축된 경우 압축된 바이트) 스트림으로 가져옵니다.
+
+        Raises:
+            InvalidRangeError: 요청한 범위가 객체 크기를 벗어난 경우
+        """
+
+    def head_files(self, file_paths: Iterable[str]) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """여러 객체의 메타데이터를 조회해 입력 순서대로 (경로, 메타데이터 또는 None)을 반환합니다."""
+        for file_path in file_paths:
+            yield file_path, self.head_file(file_path)
+
+    def generate_presigned_url(self, object_name: str, expiration: int = 3600) -> Optional[str]:
+        """클라이언트가 직접 업로드할 URL (지원하지 않는 저장소는 None)"""
+        return None
+
+    def generate_download_url(self, object_name: str, expiration: int = 3600) -> Optional[str]:
+        """클라이언트가 직접 다운로드할 URL (지원하지 않는 저장소는 None)"""
+        return None
+
+    def upload_files(self, files: Dict[str, BinaryIO]) -> bool:
+        """
+        여러 파일을 저장합니다. (예: 진단 결과 원본과 전처리 파일)
+
+        Args:
+            files (Dict[str, BinaryIO]): 객체 경로별 파일 객체
+
+        Returns:
+            bool: 모든 파일 저장 성공 여부 (일부만 실패해도 성공한 객체는 삭제하지 않음)
+        """
+        results = [self.upload_file(file_path, file) for file_path, file in files.items()]
+        return all(results)
+
+    def download_file(self, file_path: str, file: BinaryIO) -> bool:
+        """객체를 파일 객체에 기록 (압축된 객체는 풀어서 기록)"""
+        try:
+            file_stream = self._get_object_stream(file_path)
+            if file_stream is None:
+                return False
+            for chunk in file_stream.decoded().iter_chunks():
+                file.write(chunk)
+            return True
+        except Exception as e:
+            logger.error(f"파일 다운로드 실패: 경로={file_path}, 오류={e}")
+            return False
+
+    def get_file_data(self, file_path: str) -> Optional[bytes]:
+        """파일 데이터 가져오기 (압축된 객체는 풀어서 반환)"""
+        try:
+            file_stream = self._get_object_stream(file_path)
+            if file_stream is None:
+                return None
+            return b"".join(file_stream.decoded().iter_chunks())
+        except Exception as e:
+            logger.error(f"파일 조회 실패: 경로={file_path}, 오류={e}")
+            return None
+
+    def get_file_stream(self, file_path: str, byte_range: Optional[str] = None, accept_encoding: Optional[str] = None) -> Optional[ObjectStream]:
+        """
+        객체를 메모리에 올리지 않고 스트림으로 가져옵니다.
+
+        압축된 객체는 클라이언트가 해당 압축 방식을 받을 수 있으면(Accept-Encoding) 압축된 그대로 전달하고,
+        받을 수 없으면 읽으면서 풀어서 전달합니다. 이때 Range는 무시하고 전체 객체를 전달합니다.
+
+        로컬 디스크 캐시를 사용하는 경우, 전체 객체 요청(Range 없음)이면 전달하면서 저장된 그대로 캐시에 기록합니다.
+        (첫 바이트 전달이 전체 다운로드를 기다리지 않음, 한 번 쓰면 바뀌지 않는 객체(전처리 파일 등)에만 사용해야 함)
+
+        Args:
+            file_path (str): 객체 경로
+            byte_range (str): HTTP Range 헤더 값 (예: "bytes=0-1023"), 주어지면 해당 범위만 가져옴 (압축된 객체는 압축된 바이트 기준)
+            accept_encoding (str): 클라이언트의 Accept-Encoding 헤더 값
+
+        Returns:
+            ObjectStream: 객체 스트림 또는 에러 발생 시 None
+
+        Raises:
+            InvalidRangeError: 요청한 범위가 객체 크기를 벗어난 경우
+        """
+        file_stream = self._get_object_stream(file_path, byte_range)
+        if file_stream is not None and not byte_range and self.file_cache is not None and self._cacheable(file_stream):
+            body = CachingObjectBody(file_stream.body, self.file_cache, file_path, file_stream.etag, file_stream.content_encoding)
+            file_stream = replace(file_stream, body=body)
+        if file_stream is None or not file_stream.content_encoding or accepts_encoding(accept_encoding, file_stream.content_encoding):
+            return file_stream
+
+        if byte_range:
+            # 압축을 푼 본문의 범위는 조회할 수 없으므로 전체 객체를 다시 조회
+            file_stream.body.close()
+            file_stream = self._get_object_stream(file_path)
+            if file_stream is None:
+                return None
+        return file_stream.decoded()
+
+    def _cacheable(self, file_stream: ObjectStream) -> bool:
+        return file_stream.content_length is not None and self.file_cache.accepts(file_stream.content_length)
+
+    def get_cached_file(self, file_path: str) -> Optional[CachedFile]:
+        """
+        로컬 디스크 캐시에 있는 객체를 가져옵니다. 저장소를 조회하지 않습니다.
+        캐시에 없으면 None을 반환하며, 이후 `get_file_stream`으로 전달하는 동안 캐시에 기록됩니다.
+
+        Args:
+            file_path (str): 객체 경로
+
+        Returns:
+            CachedFile: 캐시된 파일 또는 캐시를 사용하지 않거나 캐시에 없는 경우 None
+        """
+        if self.file_cache is None:
+            return None
+        return self.file_cache.get(file_path)
+
+    def shutdown(self) -> None:
+        """저장소가 사용하는 스레드 풀 등 자원 정리 (프로세스 종료 시 호출)"""
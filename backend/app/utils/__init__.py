@@ -1,3 +1,10 @@
+from .compression import (
+    SUPPORTED_ENCODINGS,
+    accepts_encoding,
+    compress_file,
+    iter_decompressed,
+    iter_file_chunks,
+)
 from .time import (
     convert_kst_to_utc,
     convert_utc_to_kst,
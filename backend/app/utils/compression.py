@@ -0,0 +1,69 @@
+import gzip
+import shutil
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Iterable, Iterator, Optional
+import zlib
+
+import zstandard
+
+
+# 지원하는 Content-Encoding (identity는 압축하지 않음)
+SUPPORTED_ENCODINGS = ("gzip", "zstd")
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+def compress_file(src: BinaryIO, encoding: str, spool_max_size: int) -> SpooledTemporaryFile:
+    """파일 객체를 압축해 새 임시 파일로 반환합니다. (spool_max_size 초과 시 디스크 사용)"""
+    output = SpooledTemporaryFile(max_size=spool_max_size, mode="w+b")
+    if encoding == "gzip":
+        # mtime 고정: 같은 내용이면 같은 바이트(ETag)가 되도록 함
+        with gzip.GzipFile(fileobj=output, mode="wb", mtime=0) as gz:
+            shutil.copyfileobj(src, gz, COPY_CHUNK_SIZE)
+    elif encoding == "zstd":
+        zstandard.ZstdCompressor().copy_stream(src, output, read_size=COPY_CHUNK_SIZE)
+    else:
+        raise ValueError(f"지원하지 않는 Content-Encoding: {encoding}")
+    output.seek(0)
+    return output
+
+
+def iter_decompressed(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """압축된 청크를 순서대로 풀어서 반환합니다. (전체를 메모리에 올리지 않음)"""
+    if encoding == "gzip":
+        decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    elif encoding == "zstd":
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+    else:
+        raise ValueError(f"지원하지 않는 Content-Encoding: {encoding}")
+
+    for chunk in chunks:
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    data = decompressor.flush()
+    if data:
+        yield data
+
+
+def iter_file_chunks(path: str, chunk_size: int = COPY_CHUNK_SIZE) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def accepts_encoding(accept_encoding: Optional[str], encoding: str) -> bool:
+    """Accept-Encoding 헤더가 encoding을 허용하는지 확인합니다. (q=0은 거부)"""
+    if not accept_encoding:
+        return False
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        if coding.strip().lower() not in (encoding, "*"):
+            continue
+        params = params.replace(" ", "")
+        if not params.startswith("q="):
+            return True
+        try:
+            return float(params[2:]) > 0
+        except ValueError:
+            return False
+    return False
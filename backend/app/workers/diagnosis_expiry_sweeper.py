@@ -0,0 +1,74 @@
+"""진단 만료 처리 백그라운드 작업
+
+모니터링 화면(SSE)이 열려 있지 않아도 만료 시각이 지난 진행중(READY, STARTED) 진단을 주기적으로 EXPIRED로 전환합니다.
+조건부 UPDATE 한 번으로 처리하므로 여러 API 프로세스에서 동시에 실행해도 각 진단은 한 번만 전환되고 한 번만 발행됩니다.
+
+API 서버 lifespan에서 `start()`/`stop()`으로 실행합니다.
+"""
+
+import asyncio
+from contextlib import suppress
+import logging
+from typing import List, Optional
+
+from app.configs.database import AsyncSessionLocal
+from app.configs.env_configs import settings
+from app.core.diagnosis_state_broker import DiagnosisStateBroker, DiagnosisStateEvent, state_broker
+from app.dtos.diagnosis_dto import DiagnosisStateDTO
+from app.repositories.diagnosis_repository import AsyncDiagnosisRepository
+from app.utils import convert_utc_to_kst
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+
+logger = logging.getLogger(__name__)
+
+
+class DiagnosisExpirySweeper:
+    def __init__(
+        self,
+        repository: Optional[AsyncDiagnosisRepository] = None,
+        broker: Optional[DiagnosisStateBroker] = None,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        interval: Optional[float] = None,
+    ):
+        self.repository = repository or AsyncDiagnosisRepository()
+        self.broker = broker or state_broker
+        self.session_factory = session_factory
+        self.interval = settings.DIAGNOSIS_EXPIRY_SWEEP_INTERVAL if interval is None else interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> List[int]:
+        """만료 대상 진단을 EXPIRED로 전환하고 상태 변경을 발행합니다. 전환된 진단 ID 목록을 반환합니다."""
+        async with self.session_factory() as db:
+            expired = await self.repository.expire_overdue(db)
+
+        # SSE 스트림 등 구독자에게 전달 (메시지 버스를 통해 다른 프로세스에도 전달)
+        for diagnosis_id, updated_at in expired:
+            self.broker.publish(DiagnosisStateEvent(id=diagnosis_id, state=DiagnosisStateDTO.EXPIRED, timestamp=convert_utc_to_kst(updated_at)))
+        if expired:
+            logger.info(f"만료된 진단 {len(expired)}건 EXPIRED 전환")
+        return [diagnosis_id for diagnosis_id, _ in expired]
+
+    async def start(self):
+        """주기적 만료 처리 시작 (interval이 0 이하이면 실행하지 않음)"""
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"진단 만료 처리 중 오류 발생: {e}", exc_info=True)
+
+
+sweeper = DiagnosisExpirySweeper()
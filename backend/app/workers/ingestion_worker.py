@@ -0,0 +1,177 @@
+"""진단 결과 처리 워커
+
+WS 핸들러가 등록한 작업(`ingestion_jobs`)을 `SELECT ... FOR UPDATE SKIP LOCKED`로 가져와 처리합니다.
+여러 프로세스/컨테이너에서 동시에 실행해도 같은 작업을 중복 처리하지 않습니다.
+
+실행: `python -m app.workers.ingestion_worker`
+"""
+
+import asyncio
+from contextlib import suppress
+from datetime import timedelta
+import logging
+import os
+import random
+import signal
+import socket
+from typing import Callable, Optional
+
+from app.configs.database import SessionLocal, engine
+from app.configs.env_configs import settings
+from app.core.diagnosis_state_broker import state_broker
+from app.core.message_bus import InMemoryMessageBus, MessageBus, message_bus
+from app.core.task_executor import executor
+from app.dependency.dependency import (
+    get_async_storage_service,
+    get_diagnosis_password_manager,
+    get_diagnosis_repository,
+    get_diagnosis_result_processor,
+    get_ingestion_job_repository,
+    get_storage_service,
+    shutdown_storage_services,
+)
+from app.dtos.ingestion_job_dto import IngestionJobDTO
+from app.services.diagnosis_service import DiagnosisService
+from sqlalchemy.orm import Session
+
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionWorker:
+    def __init__(
+        self,
+        diagnosis_service: DiagnosisService,
+        session_factory: Callable[[], Session] = SessionLocal,
+        worker_id: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+        retry_base_seconds: Optional[float] = None,
+        retry_max_seconds: Optional[float] = None,
+        lock_renew_interval: Optional[float] = None,
+    ):
+        self.diagnosis_service = diagnosis_service
+        self.task_executor = diagnosis_service.task_executor
+        self.session_factory = session_factory
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.poll_interval = settings.INGESTION_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.retry_base_seconds = settings.INGESTION_RETRY_BASE_SECONDS if retry_base_seconds is None else retry_base_seconds
+        self.retry_max_seconds = settings.INGESTION_RETRY_MAX_SECONDS if retry_max_seconds is None else retry_max_seconds
+        self.lock_renew_interval = settings.INGESTION_LOCK_RENEW_INTERVAL if lock_renew_interval is None else lock_renew_interval
+
+    def retry_delay(self, attempts: int) -> timedelta:
+        """재시도 지연 시간 (지수 백오프 + full jitter)"""
+        backoff = min(self.retry_base_seconds * 2 ** max(attempts - 1, 0), self.retry_max_seconds)
+        return timedelta(seconds=random.uniform(backoff / 2, backoff))
+
+    async def run_once(self) -> bool:
+        """작업 하나를 가져와 처리합니다. 처리할 작업이 없으면 False를 반환합니다."""
+        db = self.session_factory()
+        try:
+            # 처리 중 워커가 죽어 재시도 횟수를 모두 사용한 작업 정리 (진단 FAILED 전환)
+            await self.task_executor.run_io(self.diagnosis_service.dead_letter_stale_ingestion_jobs, db)
+            job = await self.task_executor.run_io(self.diagnosis_service.claim_ingestion_job, db, self.worker_id)
+            if not job:
+                return False
+
+            logger.info(f"진단 결과 처리 시작: 작업ID={job.id}, 진단ID={job.diagnosis_id}, 시도={job.attempts}/{job.max_attempts}")
+            # 처리가 오래 걸려도 다른 워커가 중단된 작업으로 보고 다시 가져가지 않도록 잠금 갱신
+            renewer = asyncio.create_task(self._renew_lock_periodically(job))
+            try:
+                await self.diagnosis_service.process_ingestion_job(db, job)
+            except Exception as e:
+                logger.error(f"진단 결과 처리 실패: 작업ID={job.id}, 오류={e}", exc_info=True)
+                await self.task_executor.run_io(db.rollback)
+                await self.task_executor.run_io(self.diagnosis_service.fail_ingestion_job, db, job, self.worker_id, str(e), self.retry_delay(job.attempts))
+                return True
+            finally:
+                renewer.cancel()
+                with suppress(asyncio.CancelledError):
+                    await renewer
+
+            await self.task_executor.run_io(self.diagnosis_service.complete_ingestion_job, db, job, self.worker_id)
+            logger.info(f"진단 결과 처리 완료: 작업ID={job.id}, 진단ID={job.diagnosis_id}")
+            return True
+        finally:
+            await self.task_executor.run_io(db.close)
+
+    async def _renew_lock_periodically(self, job: IngestionJobDTO):
+        """lock_renew_interval마다 잠금 갱신 (다른 워커가 가져갔으면 중단)"""
+        if self.lock_renew_interval <= 0:
+            return
+        while True:
+            await asyncio.sleep(self.lock_renew_interval)
+            try:
+                if not await self.task_executor.run_io(self._renew_lock, job):
+                    return
+            except Exception as e:
+                logger.error(f"작업 잠금 갱신 중 오류 발생: 작업ID={job.id}, 오류={e}", exc_info=True)
+
+    def _renew_lock(self, job: IngestionJobDTO) -> bool:
+        # 처리 중인 세션과 별개의 짧은 세션 사용 (세션은 스레드 간 공유하지 않음)
+        with self.session_factory() as db:
+            return self.diagnosis_service.renew_ingestion_job_lock(db, job, self.worker_id)
+
+    async def run_forever(self, stop_event: asyncio.Event):
+        """stop_event가 설정될 때까지 작업을 처리합니다. 대기 작업이 없으면 poll_interval 동안 쉽니다."""
+        while not stop_event.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception as e:
+                logger.error(f"작업 큐 조회 중 오류 발생: {e}", exc_info=True)
+                processed = False
+
+            if not processed:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+
+def create_diagnosis_service() -> DiagnosisService:
+    storage_service = get_storage_service()
+    return DiagnosisService(
+        repository=get_diagnosis_repository(),
+        storage_service=storage_service,
+        password_manager=get_diagnosis_password_manager(),
+        result_processor=get_diagnosis_result_processor(),
+        task_executor=executor,
+        ingestion_job_repository=get_ingestion_job_repository(),
+        state_broker=state_broker,
+        async_storage_service=get_async_storage_service(storage_service),
+    )
+
+
+def check_message_bus(bus: MessageBus):
+    """memory 버스는 프로세스 내부에서만 전달하므로 워커의 상태 변경(COMPLETED/FAILED)이 API 프로세스의 SSE 스트림에 도달하지 않습니다."""
+    if isinstance(bus, InMemoryMessageBus):
+        raise RuntimeError("ingestion 워커는 별도 프로세스로 실행되므로 MESSAGE_BUS_BACKEND를 postgres 또는 unix로 설정해야 합니다")
+
+
+async def main(concurrency: Optional[int] = None):
+    check_message_bus(message_bus)
+    concurrency = concurrency or settings.INGESTION_WORKERS
+    diagnosis_service = create_diagnosis_service()
+    host_id = f"{socket.gethostname()}-{os.getpid()}"
+    workers = [IngestionWorker(diagnosis_service, worker_id=f"{host_id}-{i}") for i in range(concurrency)]
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    # 상태 변경(COMPLETED/FAILED)을 API 프로세스의 SSE 스트림에 전달
+    await message_bus.start()
+    logger.info(f"진단 결과 처리 워커 시작: 동시 처리 수={concurrency}")
+    try:
+        await asyncio.gather(*(worker.run_forever(stop_event) for worker in workers))
+    finally:
+        await message_bus.stop()
+        executor.shutdown()
+        shutdown_storage_services()
+        engine.dispose()
+        logger.info("진단 결과 처리 워커 종료")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
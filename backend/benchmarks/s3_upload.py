@@ -0,0 +1,121 @@
+"""진단 결과 S3 업로드 벤치마크
+
+원본/전처리 파일 한 쌍을 업로드하는 데 걸리는 시간을 측정합니다.
+
+- baseline: boto3 기본 TransferConfig로 원본, 전처리 파일을 순차 업로드 (작업 큐 도입 전 WS 핸들러의 업로드 방식)
+- tuned: `S3Service`의 TransferConfig와 `upload_files`로 두 파일을 동시 업로드
+- local: `LocalStorageService`로 로컬 디스크에 저장 (`STORAGE_BACKEND=local`)
+
+전송 시간만 비교하도록 압축 저장(`S3_CONTENT_ENCODING`)은 끄고 측정합니다.
+
+실행 (backend 디렉터리):
+    python -m benchmarks.s3_upload                                        # moto 서버 (pip install "moto[server]")
+    python -m benchmarks.s3_upload --endpoint http://localhost:4566       # LocalStack (make localstack-up)
+    python -m benchmarks.s3_upload --storage-dir /data/dat-storage        # 로컬 저장소 위치 지정 (기본: 임시 디렉터리)
+"""
+
+import argparse
+from contextlib import contextmanager
+import io
+import logging
+import os
+import statistics
+import tempfile
+import time
+from typing import Iterator, List
+
+from app.configs.env_configs import settings
+import boto3
+
+
+MB = 1024 * 1024
+BUCKET_NAME = "benchmark-bucket"
+
+
+@contextmanager
+def s3_endpoint(endpoint: str) -> Iterator[str]:
+    """endpoint가 없으면 moto 서버를 띄워 사용합니다."""
+    if endpoint:
+        yield endpoint
+        return
+
+    from moto.server import ThreadedMotoServer
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = ThreadedMotoServer(port=0, verbose=False)
+    server.start()
+    try:
+        host, port = server.get_host_and_port()
+        yield f"http://{host}:{port}"
+    finally:
+        server.stop()
+
+
+def create_s3_service(endpoint: str):
+    # S3Service는 ENV=local일 때 LOCALSTACK_ENDPOINT로 접속함
+    settings.is_local = True
+    settings.LOCALSTACK_ENDPOINT = endpoint
+    settings.S3_BUCKET_NAME = BUCKET_NAME
+    settings.S3_CONTENT_ENCODING = "identity"
+
+    from app.services.s3_service import S3Service
+
+    return S3Service()
+
+
+def measure(upload, sizes_mb: List[int], repeat: int) -> List[float]:
+    results = []
+    for size_mb in sizes_mb:
+        original, processed = os.urandom(size_mb * MB), os.urandom(size_mb * MB)
+        elapsed = []
+        for i in range(repeat):
+            started = time.perf_counter()
+            upload(f"diagnosis/{size_mb}/{i}", original, processed)
+            elapsed.append(time.perf_counter() - started)
+        results.append(statistics.median(elapsed))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", default="", help="S3 호환 엔드포인트 (기본: moto 서버 실행)")
+    parser.add_argument("--sizes", default="1,10,50,100", help="파일 크기 목록 (MB)")
+    parser.add_argument("--storage-dir", default="", help="로컬 저장소 디렉터리 (기본: 임시 디렉터리)")
+    parser.add_argument("--repeat", type=int, default=3, help="크기별 반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+    sizes_mb = [int(size) for size in args.sizes.split(",")]
+
+    with s3_endpoint(args.endpoint) as endpoint:
+        s3_service = create_s3_service(endpoint)
+        # 비교 기준: 기본 설정 클라이언트 (커넥션 풀 10, TransferConfig 기본값)
+        default_client = boto3.client("s3", endpoint_url=endpoint, region_name=settings.AWS_REGION, aws_access_key_id="test", aws_secret_access_key="test")
+
+        def baseline(prefix: str, original: bytes, processed: bytes):
+            default_client.upload_fileobj(io.BytesIO(original), BUCKET_NAME, f"{prefix}/original.csv")
+            default_client.upload_fileobj(io.BytesIO(processed), BUCKET_NAME, f"{prefix}/processed.csv")
+
+        def tuned(prefix: str, original: bytes, processed: bytes):
+            assert s3_service.upload_files({f"{prefix}/original.csv": io.BytesIO(original), f"{prefix}/processed.csv": io.BytesIO(processed)})
+
+        baseline_results = measure(baseline, sizes_mb, args.repeat)
+        tuned_results = measure(tuned, sizes_mb, args.repeat)
+
+    from app.services.local_storage_service import LocalStorageService
+
+    with tempfile.TemporaryDirectory(dir=args.storage_dir or None) as storage_dir:
+        local_storage_service = LocalStorageService(storage_dir)
+
+        def local(prefix: str, original: bytes, processed: bytes):
+            assert local_storage_service.upload_files({f"{prefix}/original.csv": io.BytesIO(original), f"{prefix}/processed.csv": io.BytesIO(processed)})
+
+        local_results = measure(local, sizes_mb, args.repeat)
+
+    print(f"endpoint={endpoint} threshold={settings.S3_MULTIPART_THRESHOLD} chunksize={settings.S3_MULTIPART_CHUNKSIZE}", end=" ")
+    print(f"max_concurrency={settings.S3_MAX_CONCURRENCY} max_pool_connections={settings.S3_MAX_POOL_CONNECTIONS}")
+    print(f"{'size (MB) x2':>12} {'baseline (s)':>13} {'tuned (s)':>10} {'speedup':>8} {'local (s)':>10}")
+    for size_mb, baseline_seconds, tuned_seconds, local_seconds in zip(sizes_mb, baseline_results, tuned_results, local_results):
+        print(f"{size_mb:>12} {baseline_seconds:>13.3f} {tuned_seconds:>10.3f} {baseline_seconds / tuned_seconds:>7.2f}x {local_seconds:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,39 @@
+from contextlib import asynccontextmanager
+
+from app.configs.database import async_engine, engine
 from app.controllers import (
     auth_controller,
     diagnosis_record_controller,
     diagnosis_web_controller,
     diagnosis_ws_controller,
+    metrics_controller,
     mock_client_controller,
     patient_controller,
 )
+from app.core.message_bus import message_bus
+from app.core.task_executor import executor
+from app.core.ws_connection_manager import manager
+from app.dependency.dependency import shutdown_storage_services
 from app.utils import load_api_description_from_json
+from app.workers.diagnosis_expiry_sweeper import sweeper
 from fastapi import FastAPI
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await message_bus.start()
+    await manager.start()
+    await sweeper.start()
+    yield
+    await sweeper.stop()
+    await manager.stop()
+    await message_bus.stop()
+    executor.shutdown()
+    shutdown_storage_services()
+    engine.dispose()
+    await async_engine.dispose()
+
+
 def create_app() -> FastAPI:
     VERSION = "1.1.1"
     app = FastAPI(
@@ -17,6 +41,7 @@ def create_app() -> FastAPI:
         version=VERSION,
         description=load_api_description_from_json(),
         root_path="/api",
+        lifespan=lifespan,
     )
 
     app.include_router(auth_controller.router)
@@ -25,6 +50,7 @@ def create_app() -> FastAPI:
     app.include_router(diagnosis_record_controller.router)
     app.include_router(diagnosis_ws_controller.router)
     app.include_router(mock_client_controller.router)
+    app.include_router(metrics_controller.router)
 
     @app.get("/")
     def version_check():
@@ -7,7 +7,7 @@ from alembic import context
 
 # models import
 from app.configs.database import Base
-from app.models import diagnosis, doctor, patient, user, token
+from app.models import diagnosis, doctor, ingestion_job, patient, user, token
 
 # or if you have multiple, from app.models import user, other_model
 # then Base = user.Base
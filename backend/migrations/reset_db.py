@@ -38,6 +38,7 @@ def reset_database():
     print("\n[단계 1/3] 개별 테이블 및 타입을 삭제합니다...")
 
     TABLES_TO_DROP = [
+        "ingestion_jobs",
         "diagnosis_results",
         "diagnosis_sessions",
         "diagnoses",
@@ -50,6 +51,7 @@ def reset_database():
     ENUMS_TO_DROP = [
         "diagnosisstate",
         "diagnosistype",
+        "ingestionjobstate",
         "userrole",
         "diagnosisresultfiletype"
     ]
@@ -5,17 +5,22 @@ os.environ["LOCALSTACK_ENDPOINT"] = "http://localhost:4566"
 
 from typing import Generator
 
-from app.configs.database import Base, get_db
+from app.configs.database import Base, get_async_db, get_async_session_factory, get_db, get_session_factory
 from fastapi.testclient import TestClient
 from main import create_app
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# async 컨트롤러용 (같은 DB 파일, TestClient가 테스트마다 이벤트 루프를 새로 만들므로 커넥션을 재사용하지 않음)
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+AsyncTestingSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 
 
 @pytest.fixture(scope="function")
@@ -36,7 +41,14 @@ def client(db_session: Generator) -> TestClient:
     def override_get_db():
         yield db_session
 
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+    app.dependency_overrides[get_async_session_factory] = lambda: AsyncTestingSessionLocal
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
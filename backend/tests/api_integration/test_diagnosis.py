@@ -1,3 +1,23 @@
+from datetime import timedelta
+import io
+from urllib.parse import quote
+
+from app.configs.env_configs import settings
+from app.dependency.dependency import get_storage_service
+from app.dtos.diagnosis_dto import DiagnosisStateDTO, DiagnosisTypeDTO
+from app.models.ingestion_job import IngestionJob
+from app.repositories.diagnosis_repository import DiagnosisRepository
+from app.services.diagnosis_result_process import DiagnosisResultProcessor
+from app.services.diagnosis_service import DiagnosisService
+from app.services.file_cache import FileCache
+from app.services.local_storage_service import LocalStorageService
+from app.services.s3_service import S3Service
+from app.utils import get_datetime_now_plus_timedelta
+from moto import mock_aws
+import pandas as pd
+import requests
+from tests.utils import make_result_csv
+
 from .utils import create_patient, login_user, register_user
 
 
@@ -29,6 +49,45 @@ def test_diagnosis_record_list(client):
     assert isinstance(response.json(), list)
 
 
+def test_diagnosis_record_list_pages_only_when_requested(client, db_session):
+    register_user(client, "doctor17", "password123", "Dr. Kim", "DOCTOR")
+    access_token = login_user(client, "doctor17", "password123").json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    patient_id = create_patient(client, "Patient J", token=access_token).json()["id"]
+    repository = DiagnosisRepository()
+    for i in range(3):
+        diagnosis = repository.create_diagnosis(
+            db_session,
+            doctor_id=1,
+            patient_id=patient_id,
+            code=f"PAGE{i:02d}",
+            type=DiagnosisTypeDTO.BALANCEBALL,
+            state=DiagnosisStateDTO.COMPLETED,
+            level=1,
+            expired_at=get_datetime_now_plus_timedelta(timedelta(minutes=30)),
+        )
+        repository.create_diagnosis_result(db_session, diagnosis.id, "original.csv", f"diagnosis/{diagnosis.id}/processed/result.csv", 1.0, 2.0, 60.0)
+    import datetime
+
+    today = datetime.datetime.now().date()
+    url = f"/diagnosis/record/list?patient_id={patient_id}&start_date={today}T00:00:00&end_date={today + datetime.timedelta(days=1)}T00:00:00"
+
+    # limit, cursor 모두 없으면 기존처럼 전체 목록
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+    assert "x-next-cursor" not in response.headers
+
+    first_page = client.get(f"{url}&limit=2", headers=headers)
+    assert len(first_page.json()) == 2
+    cursor = first_page.headers["x-next-cursor"]
+
+    # cursor만 주어지면 기본 페이지 크기로 다음 페이지 조회
+    second_page = client.get(f"{url}&cursor={quote(cursor)}", headers=headers)
+    assert [record["id"] for record in first_page.json() + second_page.json()] == [record["id"] for record in response.json()]
+    assert "x-next-cursor" not in second_page.headers
+
+
 def test_diagnosis_record_metadata_fail(client):
     register_user(client, "doctor14", "password123", "Dr. Kim", "DOCTOR")
     login_response = login_user(client, "doctor14", "password123")
@@ -36,3 +95,297 @@ def test_diagnosis_record_metadata_fail(client):
     headers = {"Authorization": f"Bearer {access_token}"}
     response = client.get("/diagnosis/record/9999/metadata", headers=headers)
     assert response.status_code in (404, 403)
+
+
+def test_diagnosis_record_list_rejects_invalid_cursor(client):
+    register_user(client, "doctor15", "password123", "Dr. Kim", "DOCTOR")
+    login_response = login_user(client, "doctor15", "password123")
+    access_token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    patient_response = create_patient(client, "Patient I", token=access_token)
+    patient_id = patient_response.json()["id"]
+    import datetime
+
+    today = datetime.datetime.now().date()
+    url = f"/diagnosis/record/list?patient_id={patient_id}&start_date={today}T00:00:00&end_date={today}T23:59:59"
+    response = client.get(f"{url}&limit=10&cursor=invalid", headers=headers)
+    assert response.status_code == 400
+    response = client.get(f"{url}&limit=0", headers=headers)
+    assert response.status_code == 422
+
+
+def test_diagnosis_record_file_streams_with_range(client, db_session, monkeypatch):
+    register_user(client, "doctor16", "password123", "Dr. Kim", "DOCTOR")
+    access_token = login_user(client, "doctor16", "password123").json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    repository = DiagnosisRepository()
+    diagnosis = repository.create_diagnosis(
+        db_session,
+        doctor_id=1,
+        patient_id=1,
+        code="FILE01",
+        type=DiagnosisTypeDTO.BALANCEBALL,
+        state=DiagnosisStateDTO.COMPLETED,
+        level=1,
+        expired_at=get_datetime_now_plus_timedelta(timedelta(minutes=30)),
+    )
+    processed_file_path = f"diagnosis/{diagnosis.id}/processed/result.csv"
+    repository.create_diagnosis_result(db_session, diagnosis.id, "original.csv", processed_file_path, 1.0, 2.0, 60.0)
+    data = b"".join(f"{i},{i * 2}\n".encode() for i in range(20000))
+    monkeypatch.setattr(settings, "S3_CONTENT_ENCODING", "identity")
+
+    with mock_aws():
+        s3_service = S3Service(bucket_name="test-bucket")
+        s3_service.s3_client.create_bucket(Bucket="test-bucket", CreateBucketConfiguration={"LocationConstraint": s3_service.region_name})
+        s3_service.upload_file(processed_file_path, io.BytesIO(data))
+        client.app.dependency_overrides[get_storage_service] = lambda: s3_service
+
+        response = client.get(f"/diagnosis/record/{diagnosis.id}/file", headers=headers)
+        assert response.status_code == 200
+        assert response.content == data
+        assert response.headers["content-length"] == str(len(data))
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["etag"]
+
+        response = client.get(f"/diagnosis/record/{diagnosis.id}/file", headers={**headers, "Range": "bytes=10-19"})
+        assert response.status_code == 206
+        assert response.content == data[10:20]
+        assert response.headers["content-range"] == f"bytes 10-19/{len(data)}"
+
+        response = client.get(f"/diagnosis/record/{diagnosis.id}/file", headers={**headers, "Range": f"bytes={len(data)}-"})
+        assert response.status_code == 416
+
+
+def test_presigned_upload_action_pair(client, db_session):
+    register_user(client, "doctor17", "password123", "Dr. Kim", "DOCTOR")
+    access_token = login_user(client, "doctor17", "password123").json()["access_token"]
+    patient = create_patient(client, "Patient J", code="PJ0001", token=access_token).json()
+    diagnosis = DiagnosisRepository().create_diagnosis(
+        db_session,
+        doctor_id=1,
+        patient_id=patient["id"],
+        code="UPL001",
+        type=DiagnosisTypeDTO.BALANCEBALL,
+        state=DiagnosisStateDTO.STARTED,
+        level=1,
+        expired_at=get_datetime_now_plus_timedelta(timedelta(minutes=30)),
+    )
+
+    with mock_aws():
+        s3_service = S3Service(bucket_name="test-bucket")
+        s3_service.s3_client.create_bucket(Bucket="test-bucket", CreateBucketConfiguration={"LocationConstraint": s3_service.region_name})
+        client.app.dependency_overrides[get_storage_service] = lambda: s3_service
+
+        with client.websocket_connect(f"/ws/diagnosis/{patient['code']}") as websocket:
+            websocket.send_json({"action": "c_request_upload_url", "data": {"diagnosis_id": diagnosis.id}})
+            message = websocket.receive_json()
+            assert message["action"] == "s_upload_url"
+            upload_url = message["data"]
+            assert upload_url["key"].startswith(f"diagnosis/{diagnosis.id}/original/")
+
+            response = requests.put(upload_url["url"], data=b"a,b\n1,2\n", headers=upload_url["headers"])
+            assert response.status_code == 200
+            websocket.send_json(
+                {"action": "c_result_uploaded", "data": {"diagnosis_id": diagnosis.id, "key": upload_url["key"], "etag": response.headers["ETag"]}}
+            )
+            # 메시지 처리 완료를 기다리기 위해 다음 메시지 왕복
+            websocket.send_json({"action": "c_request_upload_url", "data": {"diagnosis_id": diagnosis.id}})
+            websocket.receive_json()
+
+    job = db_session.query(IngestionJob).one()
+    assert job.diagnosis_id == diagnosis.id
+    assert job.original_file_path == upload_url["key"]
+
+
+def test_diagnosis_record_file_served_from_disk_cache(client, db_session, tmp_path, monkeypatch):
+    register_user(client, "doctor18", "password123", "Dr. Kim", "DOCTOR")
+    access_token = login_user(client, "doctor18", "password123").json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    repository = DiagnosisRepository()
+    diagnosis = repository.create_diagnosis(
+        db_session,
+        doctor_id=1,
+        patient_id=1,
+        code="FILE02",
+        type=DiagnosisTypeDTO.BALANCEBALL,
+        state=DiagnosisStateDTO.COMPLETED,
+        level=1,
+        expired_at=get_datetime_now_plus_timedelta(timedelta(minutes=30)),
+    )
+    processed_file_path = f"diagnosis/{diagnosis.id}/processed/result.csv"
+    repository.create_diagnosis_result(db_session, diagnosis.id, "original.csv", processed_file_path, 1.0, 2.0, 60.0)
+    data = b"".join(f"{i},{i * 2}\n".encode() for i in range(20000))
+    monkeypatch.setattr(settings, "S3_CONTENT_ENCODING", "identity")
+
+    with mock_aws():
+        file_cache = FileCache(str(tmp_path / "cache"), max_size=10 * 1024 * 1024)
+        s3_service = S3Service(bucket_name="test-bucket", file_cache=file_cache)
+        s3_service.s3_client.create_bucket(Bucket="test-bucket", CreateBucketConfiguration={"LocationConstraint": s3_service.region_name})
+        s3_service.upload_file(processed_file_path, io.BytesIO(data))
+        etag = s3_service.head_file(processed_file_path)["etag"]
+        client.app.dependency_overrides[get_storage_service] = lambda: s3_service
+
+        response = client.get(f"/diagnosis/record/{diagnosis.id}/file", headers=headers)
+        assert response.status_code == 200
+        assert response.content == data
+
+        # 캐시에 저장된 뒤에는 S3를 조회하지 않음
+        s3_service.s3_client.delete_object(Bucket="test-bucket", Key=processed_file_path)
+        response = client.get(f"/diagnosis/record/{diagnosis.id}/file", headers=headers)
+        assert response.status_code == 200
+        assert response.content == data
+        assert response.headers["content-length"] == str(len(data))
+        assert response.headers["etag"] == etag
+
+        response = client.get(f"/diagnosis/record/{diagnosis.id}/file", headers={**headers, "Range": "bytes=10-19"})
+        assert response.status_code == 206
+        assert response.content == data[10:20]
+
+    assert file_cache.get_metrics()["misses"] == 1
+    assert file_cache.get_metrics()["hits"] == 2
+
+
+def test_diagnosis_record_file_compressed_pass_through(client, db_session, tmp_path, monkeypatch):
+    register_user(client, "doctor19", "password123", "Dr. Kim", "DOCTOR")
+    access_token = login_user(client, "doctor19", "password123").json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    repository = DiagnosisRepository()
+    diagnosis = repository.create_diagnosis(
+        db_session,
+        doctor_id=1,
+        patient_id=1,
+        code="FILE03",
+        type=DiagnosisTypeDTO.BALANCEBALL,
+        state=DiagnosisStateDTO.COMPLETED,
+        level=1,
+        expired_at=get_datetime_now_plus_timedelta(timedelta(minutes=30)),
+    )
+    processed_file_path = f"diagnosis/{diagnosis.id}/processed/result.csv"
+    repository.create_diagnosis_result(db_session, diagnosis.id, "original.csv", processed_file_path, 1.0, 2.0, 60.0)
+    data = b"".join(f"{i},{i * 2}\n".encode() for i in range(20000))
+    monkeypatch.setattr(settings, "S3_CONTENT_ENCODING", "gzip")
+
+    with mock_aws():
+        s3_service = S3Service(bucket_name="test-bucket")
+        s3_service.s3_client.create_bucket(Bucket="test-bucket", CreateBucketConfiguration={"LocationConstraint": s3_service.region_name})
+        s3_service.upload_file(processed_file_path, io.BytesIO(data))
+        stored_size = s3_service.head_file(processed_file_path)["size"]
+        client.app.dependency_overrides[get_storage_service] = lambda: s3_service
+        url = f"/diagnosis/record/{diagnosis.id}/file"
+
+        # gzip을 받을 수 있으면 압축된 그대로 전달 (httpx가 응답을 풀어줌)
+        response = client.get(url, headers={**headers, "Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-length"] == str(stored_size)
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.content == data
+
+        # 받을 수 없으면 서버에서 풀어서 전달 (Range 무시)
+        response = client.get(url, headers={**headers, "Accept-Encoding": "identity", "Range": "bytes=0-9"})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert response.headers["etag"].startswith("W/")
+        assert response.content == data
+
+        # 로컬 캐시에는 압축된 그대로 저장
+        s3_service.file_cache = FileCache(str(tmp_path / "cache"), max_size=10 * 1024 * 1024)
+        response = client.get(url, headers={**headers, "Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-length"] == str(stored_size)
+        assert response.content == data
+        response = client.get(url, headers={**headers, "Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.content == data
+
+
+def test_diagnosis_record_file_parquet_format(client, db_session):
+    register_user(client, "doctor20", "password123", "Dr. Kim", "DOCTOR")
+    access_token = login_user(client, "doctor20", "password123").json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    repository = DiagnosisRepository()
+    diagnosis = repository.create_diagnosis(
+        db_session,
+        doctor_id=1,
+        patient_id=1,
+        code="FILE04",
+        type=DiagnosisTypeDTO.BALANCEBALL,
+        state=DiagnosisStateDTO.COMPLETED,
+        level=1,
+        expired_at=get_datetime_now_plus_timedelta(timedelta(minutes=30)),
+    )
+    processed_file_path = f"diagnosis/{diagnosis.id}/processed/result.csv"
+    repository.create_diagnosis_result(db_session, diagnosis.id, "original.csv", processed_file_path, 1.0, 2.0, 60.0)
+    parquet_file = io.BytesIO()
+    processed_file, _ = DiagnosisResultProcessor().preprocess_stream(
+        DiagnosisTypeDTO.BALANCEBALL, io.BytesIO(make_result_csv(1000)), parquet_output=parquet_file
+    )
+
+    with mock_aws():
+        s3_service = S3Service(bucket_name="test-bucket")
+        s3_service.s3_client.create_bucket(Bucket="test-bucket", CreateBucketConfiguration={"LocationConstraint": s3_service.region_name})
+        s3_service.upload_file(processed_file_path, processed_file)
+        client.app.dependency_overrides[get_storage_service] = lambda: s3_service
+        url = f"/diagnosis/record/{diagnosis.id}/file"
+
+        # Parquet 도입 이전 기록에는 Parquet 파일이 없음
+        response = client.get(url, params={"format": "parquet"}, headers=headers)
+        assert response.status_code == 404
+
+        s3_service.upload_file(DiagnosisService.parquet_file_path(processed_file_path), parquet_file)
+
+        response = client.get(url, params={"format": "parquet"}, headers=headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/vnd.apache.parquet"
+        assert "content-encoding" not in response.headers
+        assert "result.parquet" in response.headers["content-disposition"]
+        df = pd.read_parquet(io.BytesIO(response.content))
+        assert len(df) == 1000
+        assert df["Rotation_X"].dtype == "float32"
+
+        response = client.get(url, params={"format": "csv"}, headers=headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert len(pd.read_csv(io.BytesIO(response.content))) == 1000
+
+        response = client.get(url, params={"format": "xlsx"}, headers=headers)
+        assert response.status_code == 422
+
+
+def test_diagnosis_record_file_local_storage(client, db_session, tmp_path):
+    register_user(client, "doctor21", "password123", "Dr. Kim", "DOCTOR")
+    access_token = login_user(client, "doctor21", "password123").json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    repository = DiagnosisRepository()
+    diagnosis = repository.create_diagnosis(
+        db_session,
+        doctor_id=1,
+        patient_id=1,
+        code="FILE05",
+        type=DiagnosisTypeDTO.BALANCEBALL,
+        state=DiagnosisStateDTO.COMPLETED,
+        level=1,
+        expired_at=get_datetime_now_plus_timedelta(timedelta(minutes=30)),
+    )
+    processed_file_path = f"diagnosis/{diagnosis.id}/processed/result.csv"
+    repository.create_diagnosis_result(db_session, diagnosis.id, "original.csv", processed_file_path, 1.0, 2.0, 60.0)
+    data = b"".join(f"{i},{i * 2}\n".encode() for i in range(20000))
+    storage_service = LocalStorageService(str(tmp_path / "storage"))
+    storage_service.upload_file(processed_file_path, io.BytesIO(data))
+    client.app.dependency_overrides[get_storage_service] = lambda: storage_service
+    url = f"/diagnosis/record/{diagnosis.id}/file"
+
+    # 저장된 파일을 그대로 전송 (압축하지 않음)
+    response = client.get(url, headers={**headers, "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.content == data
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-length"] == str(len(data))
+    assert response.headers["etag"] == storage_service.head_file(processed_file_path)["etag"]
+
+    response = client.get(url, headers={**headers, "Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == data[10:20]
+
+    response = client.get(url, params={"format": "parquet"}, headers=headers)
+    assert response.status_code == 404
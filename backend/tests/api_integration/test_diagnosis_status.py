@@ -0,0 +1,117 @@
+from datetime import timedelta, timezone
+import threading
+import time
+
+from app.configs.env_configs import settings
+from app.core.diagnosis_state_broker import DiagnosisStateEvent, state_broker
+from app.dtos.diagnosis_dto import DiagnosisStateDTO, DiagnosisTypeDTO
+from app.models.diagnosis import Diagnosis, DiagnosisState
+from app.models.doctor import Doctor
+from app.repositories.diagnosis_repository import DiagnosisRepository
+from app.utils import get_datetime_now, get_datetime_now_plus_timedelta
+import pytest
+from sqlalchemy import event
+
+from .conftest import TestingSessionLocal, async_engine
+from .utils import login_user, register_user
+
+
+def test_diagnosis_status_stream_is_event_driven(client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "SSE_HEARTBEAT_INTERVAL", 0.05)
+    monkeypatch.setattr(settings, "SSE_RESYNC_INTERVAL", 0)
+    register_user(client, "doctor21", "password123", "Dr. Kim", "DOCTOR")
+    access_token = login_user(client, "doctor21", "password123").json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    doctor = db_session.query(Doctor).first()
+    diagnosis = DiagnosisRepository().create_diagnosis(
+        db_session,
+        doctor_id=doctor.id,
+        patient_id=1,
+        code="SSE001",
+        type=DiagnosisTypeDTO.BALANCEBALL,
+        state=DiagnosisStateDTO.READY,
+        level=1,
+        expired_at=get_datetime_now_plus_timedelta(timedelta(minutes=30)),
+    )
+
+    statements = []
+    idle_statements = []
+
+    def count_statement(*args):
+        statements.append(args[2])
+
+    def complete_when_subscribed():
+        # 구독 직후부터 상태 변경 전까지 DB 조회가 없어야 함
+        while state_broker.get_metrics()["subscribers"] == 0:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        before = len(statements)
+        time.sleep(0.3)
+        idle_statements.extend(statements[before:])
+        state_broker.publish(DiagnosisStateEvent(id=diagnosis.id, state=DiagnosisStateDTO.COMPLETED, timestamp=get_datetime_now()))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_statement)
+    publisher = threading.Thread(target=complete_when_subscribed)
+    publisher.start()
+    try:
+        response = client.get(f"/diagnosis/{diagnosis.id}/status", headers=headers)
+    finally:
+        publisher.join()
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count_statement)
+
+    lines = [line for line in response.text.split("\n\n") if line]
+    assert response.status_code == 200
+    assert '"state": "READY"' in lines[0]
+    assert ": heartbeat" in lines[1:-1]
+    assert '"state": "COMPLETED"' in lines[-1]
+    assert idle_statements == []
+
+
+@pytest.mark.parametrize("final_state", [DiagnosisState.EXPIRED, DiagnosisState.COMPLETED])
+def test_diagnosis_status_stream_reports_state_changed_elsewhere_on_expiry(client, db_session, monkeypatch, final_state):
+    monkeypatch.setattr(settings, "SSE_HEARTBEAT_INTERVAL", 0.05)
+    monkeypatch.setattr(settings, "SSE_RESYNC_INTERVAL", 0)
+    register_user(client, "doctor22", "password123", "Dr. Kim", "DOCTOR")
+    access_token = login_user(client, "doctor22", "password123").json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    doctor = db_session.query(Doctor).first()
+    diagnosis = DiagnosisRepository().create_diagnosis(
+        db_session,
+        doctor_id=doctor.id,
+        patient_id=1,
+        code="SSE002",
+        type=DiagnosisTypeDTO.BALANCEBALL,
+        state=DiagnosisStateDTO.STARTED,
+        level=1,
+        # DB에는 UTC로 저장됨
+        expired_at=get_datetime_now_plus_timedelta(timedelta(seconds=2)).astimezone(timezone.utc),
+    )
+
+    initial_state_read = threading.Event()
+
+    def mark_initial_state_read(*args):
+        # 구독 후 실행된 첫 조회가 스트림의 현재 상태 조회
+        if state_broker.get_metrics()["subscribers"]:
+            initial_state_read.set()
+
+    def change_state_without_publishing():
+        # 다른 프로세스(만료 처리 작업, ingestion 워커)가 먼저 전환했지만 메시지 버스로 전달되지 않은 경우
+        assert initial_state_read.wait(5)
+        with TestingSessionLocal() as db:
+            db.query(Diagnosis).filter(Diagnosis.id == diagnosis.id).update({Diagnosis.state: final_state})
+            db.commit()
+
+    event.listen(async_engine.sync_engine, "after_cursor_execute", mark_initial_state_read)
+    changer = threading.Thread(target=change_state_without_publishing)
+    changer.start()
+    try:
+        response = client.get(f"/diagnosis/{diagnosis.id}/status", headers=headers)
+    finally:
+        changer.join()
+        event.remove(async_engine.sync_engine, "after_cursor_execute", mark_initial_state_read)
+
+    lines = [line for line in response.text.split("\n\n") if line]
+    assert response.status_code == 200
+    assert '"state": "STARTED"' in lines[0]
+    assert "error" not in response.text
+    assert f'"state": "{final_state.value}"' in lines[-1]
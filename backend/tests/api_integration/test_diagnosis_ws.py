@@ -0,0 +1,134 @@
+from contextlib import ExitStack
+from datetime import timedelta
+import threading
+import time
+
+from app.configs.database import get_session_factory
+from app.core.db_pool import PoolMonitor
+from app.dependency.dependency import get_storage_service
+from app.dtos.diagnosis_dto import DiagnosisStateDTO, DiagnosisTypeDTO
+from app.models.diagnosis import Diagnosis
+from app.models.ingestion_job import IngestionJob
+from app.repositories.diagnosis_repository import DiagnosisRepository
+from app.services.local_storage_service import LocalStorageService
+from app.utils import get_datetime_now_plus_timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from .conftest import SQLALCHEMY_DATABASE_URL
+from .utils import create_patient, login_user, register_user
+
+
+HEADSETS = 12
+
+
+class SlowStorageService(LocalStorageService):
+    """업로드가 시작되면 테스트가 풀어줄 때까지 대기하는 저장소"""
+
+    def __init__(self, base_dir):
+        super().__init__(base_dir)
+        self.upload_started = threading.Event()
+        self.release_upload = threading.Event()
+
+    def upload_file(self, file_path, file):
+        self.upload_started.set()
+        self.release_upload.wait(10)
+        return super().upload_file(file_path, file)
+
+
+def create_pool_engine(monitor):
+    return create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=monitor.pool_class(QueuePool),
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=1,
+    )
+
+
+def test_idle_headsets_do_not_hold_pooled_connections(client, db_session):
+    register_user(client, "doctor30", "password123", "Dr. Kim", "DOCTOR")
+    access_token = login_user(client, "doctor30", "password123").json()["access_token"]
+    patients = [create_patient(client, f"Headset {i}", code=f"HS{i:04d}", token=access_token).json() for i in range(HEADSETS)]
+    diagnoses = [
+        DiagnosisRepository().create_diagnosis(
+            db_session,
+            doctor_id=1,
+            patient_id=patient["id"],
+            code=f"WS{i:04d}",
+            type=DiagnosisTypeDTO.BALANCEBALL,
+            state=DiagnosisStateDTO.READY,
+            level=1,
+            expired_at=get_datetime_now_plus_timedelta(timedelta(minutes=30)),
+        )
+        for i, patient in enumerate(patients)
+    ]
+
+    # 헤드셋 수보다 훨씬 작은 풀, 연결마다 커넥션을 쥐고 있으면 pool_timeout으로 실패
+    monitor = PoolMonitor()
+    pool_engine = create_pool_engine(monitor)
+    client.app.dependency_overrides[get_session_factory] = lambda: sessionmaker(bind=pool_engine, autocommit=False, autoflush=False)
+
+    with ExitStack() as stack:
+        websockets = [stack.enter_context(client.websocket_connect(f"/ws/diagnosis/{patient['code']}")) for patient in patients]
+        for websocket, diagnosis in zip(websockets, diagnoses):
+            websocket.send_json({"action": "c_diagnosis_started", "data": {"diagnosis_id": diagnosis.id}})
+
+        # 모든 메시지가 처리될 때까지 대기
+        deadline = time.monotonic() + 10
+        while db_session.query(Diagnosis).filter(Diagnosis.state == DiagnosisStateDTO.STARTED.value).count() < HEADSETS:
+            assert time.monotonic() < deadline
+            db_session.expire_all()
+            time.sleep(0.05)
+
+        # 모든 헤드셋이 연결된 채 대기 중이어도 풀에서 꺼낸 커넥션은 없음
+        snapshot = monitor.snapshot(pool_engine.pool)
+        assert snapshot["checked_out"] == 0
+        assert snapshot["overflow"] == 0
+        assert snapshot["timeouts"] == 0
+        # 연결 시 환자 조회 + 메시지 처리마다 커넥션을 꺼냄
+        assert snapshot["wait_seconds"]["count"] >= 2 * HEADSETS
+
+    pool_engine.dispose()
+
+
+def test_upload_result_does_not_hold_connection_during_upload(client, db_session, tmp_path):
+    register_user(client, "doctor31", "password123", "Dr. Kim", "DOCTOR")
+    access_token = login_user(client, "doctor31", "password123").json()["access_token"]
+    patient = create_patient(client, "Headset", code="HSUP01", token=access_token).json()
+    diagnosis = DiagnosisRepository().create_diagnosis(
+        db_session,
+        doctor_id=1,
+        patient_id=patient["id"],
+        code="WSUP01",
+        type=DiagnosisTypeDTO.BALANCEBALL,
+        state=DiagnosisStateDTO.STARTED,
+        level=1,
+        expired_at=get_datetime_now_plus_timedelta(timedelta(minutes=30)),
+    )
+
+    monitor = PoolMonitor()
+    pool_engine = create_pool_engine(monitor)
+    storage_service = SlowStorageService(str(tmp_path / "storage"))
+    client.app.dependency_overrides[get_session_factory] = lambda: sessionmaker(bind=pool_engine, autocommit=False, autoflush=False)
+    client.app.dependency_overrides[get_storage_service] = lambda: storage_service
+
+    with client.websocket_connect(f"/ws/diagnosis/{patient['code']}") as websocket:
+        websocket.send_json({"action": "c_upload_result", "data": {"diagnosis_id": diagnosis.id, "file_content": "a,b\n1,2\n"}})
+        assert storage_service.upload_started.wait(10)
+
+        # 진단 조회는 끝났고 S3 업로드 중에는 커넥션을 쥐고 있지 않음
+        assert monitor.snapshot(pool_engine.pool)["checked_out"] == 0
+        storage_service.release_upload.set()
+
+        # 업로드 후 작업 등록
+        deadline = time.monotonic() + 10
+        while db_session.query(IngestionJob).filter(IngestionJob.diagnosis_id == diagnosis.id).count() == 0:
+            assert time.monotonic() < deadline
+            db_session.expire_all()
+            time.sleep(0.05)
+
+    assert monitor.snapshot(pool_engine.pool)["checked_out"] == 0
+    pool_engine.dispose()
@@ -0,0 +1,12 @@
+from .utils import login_user, register_user
+
+
+def test_metrics_requires_authentication(client):
+    response = client.get("/metrics")
+    assert response.status_code in (401, 403)
+
+    register_user(client, "doctor40", "password123", "Dr. Kim", "DOCTOR")
+    access_token = login_user(client, "doctor40", "password123").json()["access_token"]
+    response = client.get("/metrics", headers={"Authorization": f"Bearer {access_token}"})
+    assert response.status_code == 200
+    assert "db_pool" in response.json()
@@ -0,0 +1,125 @@
+import asyncio
+import io
+import threading
+
+from app.configs.env_configs import settings
+from app.dependency.dependency import get_async_storage_service, get_storage_service, shutdown_storage_services
+from app.services.async_storage_service import READ, WRITE, AsyncStorageService, OperationLimit, StorageTimeoutError
+from app.services.local_storage_service import LocalStorageService
+import pytest
+
+
+@pytest.fixture
+def storage_service(tmp_path):
+    return LocalStorageService(str(tmp_path / "storage"))
+
+
+@pytest.fixture
+def async_storage_service(storage_service):
+    service = AsyncStorageService(storage_service, max_workers=4, limits={READ: OperationLimit(2, 1.0), WRITE: OperationLimit(1, 1.0)})
+    yield service
+    service.shutdown()
+
+
+def test_operations_run_off_event_loop(async_storage_service):
+    threads = []
+
+    def blocking_call():
+        threads.append(threading.current_thread().name)
+        return "done"
+
+    async def scenario():
+        assert await async_storage_service.upload_file("result.csv", io.BytesIO(b"a,b\n1,2\n"))
+        assert (await async_storage_service.head_file("result.csv"))["size"] == 8
+        file_stream = await async_storage_service.get_file_stream("result.csv")
+        chunks = [chunk async for chunk in async_storage_service.iter_chunks(file_stream)]
+        assert b"".join(chunks) == b"a,b\n1,2\n"
+        return await async_storage_service.run(READ, blocking_call)
+
+    assert asyncio.run(scenario()) == "done"
+    assert threads[0].startswith("storage-io")
+    metrics = async_storage_service.get_metrics()
+    assert metrics[WRITE]["calls"] == 1
+    assert metrics[READ]["in_flight"] == 0
+
+
+def test_concurrency_is_limited_per_operation(async_storage_service):
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+    release = threading.Event()
+
+    def blocking_read():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        release.wait(1)
+        with lock:
+            running -= 1
+
+    async def scenario():
+        tasks = [asyncio.create_task(async_storage_service.run(READ, blocking_read)) for _ in range(5)]
+        await asyncio.sleep(0.1)
+        assert async_storage_service.get_metrics()[READ]["in_flight"] == 2
+        # 쓰기는 읽기 슬롯과 별도로 실행됨
+        assert await async_storage_service.run(WRITE, lambda: "written") == "written"
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    assert peak == 2
+
+
+def test_timeout_raises_and_holds_slot_until_thread_finishes(async_storage_service):
+    finished = threading.Event()
+
+    def slow_write():
+        finished.wait(5)
+
+    async def scenario():
+        with pytest.raises(StorageTimeoutError) as exc_info:
+            await async_storage_service.run(WRITE, slow_write)
+        assert exc_info.value.operation == WRITE
+
+        # 실행 중인 스레드가 슬롯을 쥐고 있으므로 다음 쓰기도 슬롯을 기다리다 시간 초과
+        with pytest.raises(StorageTimeoutError):
+            await async_storage_service.run(WRITE, lambda: None)
+
+        finished.set()
+        await asyncio.sleep(0.1)
+        assert await async_storage_service.run(WRITE, lambda: "ok") == "ok"
+
+    asyncio.run(scenario())
+    assert async_storage_service.get_metrics()[WRITE]["timeouts"] == 2
+
+
+def test_errors_propagate(async_storage_service):
+    def broken():
+        raise OSError("boom")
+
+    with pytest.raises(OSError):
+        asyncio.run(async_storage_service.run(READ, broken))
+    assert async_storage_service.get_metrics()[READ]["failed"] == 1
+    assert async_storage_service.get_metrics()[READ]["in_flight"] == 0
+
+
+def test_shutdown_storage_services_stops_cached_pools(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "local")
+    monkeypatch.setattr(settings, "LOCAL_STORAGE_DIR", str(tmp_path / "storage"))
+    get_storage_service.cache_clear()
+    get_async_storage_service.cache_clear()
+    async_storage_service = get_async_storage_service(get_storage_service())
+    assert asyncio.run(async_storage_service.upload_file("result.csv", io.BytesIO(b"a,b\n")))
+    pool = async_storage_service._pool
+
+    shutdown_storage_services()
+
+    assert async_storage_service._pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(print)
+    assert get_storage_service.cache_info().currsize == 0
+    assert get_async_storage_service.cache_info().currsize == 0
+    # 저장소가 생성되지 않은 상태에서는 아무것도 만들지 않음
+    shutdown_storage_services()
+    assert get_storage_service.cache_info().currsize == 0
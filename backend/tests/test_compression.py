@@ -0,0 +1,62 @@
+import gzip
+import io
+
+from app.utils.compression import accepts_encoding, compress_file, iter_decompressed
+import pytest
+import zstandard
+
+
+DATA = b"".join(f"{i},{i * 2}\n".encode() for i in range(10000))
+
+
+def chunked(data: bytes, size: int = 1000):
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+def test_compress_and_decompress_round_trip(encoding):
+    # spool 크기보다 크면 디스크 임시 파일로 전환되어도 동일하게 동작
+    with compress_file(io.BytesIO(DATA), encoding, spool_max_size=1024) as compressed:
+        encoded = compressed.read()
+
+    assert len(encoded) < len(DATA)
+    assert b"".join(iter_decompressed(chunked(encoded), encoding)) == DATA
+
+
+def test_compressed_bytes_are_readable_by_standard_decoders():
+    with compress_file(io.BytesIO(DATA), "gzip", spool_max_size=1024 * 1024) as compressed:
+        assert gzip.decompress(compressed.read()) == DATA
+    with compress_file(io.BytesIO(DATA), "zstd", spool_max_size=1024 * 1024) as compressed:
+        assert zstandard.ZstdDecompressor().decompressobj().decompress(compressed.read()) == DATA
+
+
+def test_gzip_output_is_deterministic():
+    outputs = []
+    for _ in range(2):
+        with compress_file(io.BytesIO(DATA), "gzip", spool_max_size=1024 * 1024) as compressed:
+            outputs.append(compressed.read())
+    assert outputs[0] == outputs[1]
+
+
+def test_unsupported_encoding():
+    with pytest.raises(ValueError):
+        compress_file(io.BytesIO(DATA), "br", spool_max_size=1024)
+    with pytest.raises(ValueError):
+        list(iter_decompressed([DATA], "br"))
+
+
+@pytest.mark.parametrize(
+    "header, encoding, expected",
+    [
+        (None, "gzip", False),
+        ("gzip, deflate", "gzip", True),
+        ("GZIP", "gzip", True),
+        ("deflate, br", "gzip", False),
+        ("gzip;q=0", "gzip", False),
+        ("gzip; q=0.5, zstd", "zstd", True),
+        ("*", "zstd", True),
+        ("identity", "zstd", False),
+    ],
+)
+def test_accepts_encoding(header, encoding, expected):
+    assert accepts_encoding(header, encoding) is expected
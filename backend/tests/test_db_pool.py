@@ -0,0 +1,52 @@
+import asyncio
+
+from app.core.db_pool import PoolMonitor
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+def test_pool_gauges_and_wait_time(tmp_path):
+    monitor = PoolMonitor()
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=monitor.pool_class(QueuePool), pool_size=1, max_overflow=1, pool_timeout=0.1)
+
+    first = engine.connect()
+    second = engine.connect()
+    snapshot = monitor.snapshot(engine.pool)
+    assert snapshot["checked_out"] == 2
+    assert snapshot["overflow"] == 1
+
+    # 풀과 overflow가 모두 사용 중이면 pool_timeout만큼 기다린 뒤 실패
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+
+    first.close()
+    second.close()
+    snapshot = monitor.snapshot(engine.pool)
+    assert snapshot["checked_out"] == 0
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_seconds"]["count"] == 3
+    assert snapshot["wait_seconds"]["sum"] >= 0.1
+
+    # dispose 후 다시 만들어진 풀도 계속 기록
+    engine.dispose()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert monitor.snapshot(engine.pool)["wait_seconds"]["count"] == 4
+    engine.dispose()
+
+
+def test_async_pool_is_monitored(tmp_path):
+    monitor = PoolMonitor()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", poolclass=monitor.pool_class(AsyncAdaptedQueuePool), pool_size=2)
+
+    async def scenario():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            assert monitor.snapshot(engine.sync_engine.pool)["checked_out"] == 1
+        await engine.dispose()
+
+    asyncio.run(scenario())
+    assert monitor.snapshot(engine.sync_engine.pool)["wait_seconds"]["count"] == 1
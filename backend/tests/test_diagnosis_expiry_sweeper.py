@@ -0,0 +1,88 @@
+import asyncio
+from datetime import timedelta
+
+from app.core.diagnosis_state_broker import DiagnosisStateBroker
+from app.dtos.diagnosis_dto import DiagnosisStateDTO, DiagnosisTypeDTO
+from app.models.diagnosis import Diagnosis
+from app.repositories.diagnosis_repository import AsyncDiagnosisRepository
+from app.utils import get_datetime_now_minus_timedelta, get_datetime_now_plus_timedelta
+from app.workers.diagnosis_expiry_sweeper import DiagnosisExpirySweeper
+from sqlalchemy import select
+from tests.utils import capture_statements
+
+
+async def create_diagnoses(async_session_factory, cases):
+    repository = AsyncDiagnosisRepository()
+    ids = []
+    async with async_session_factory() as db:
+        for state, expired_at in cases:
+            diagnosis = await repository.create_diagnosis(db, 1, 1, "ABC123", DiagnosisTypeDTO.BALANCEBALL, state, 1, expired_at)
+            ids.append(diagnosis.id)
+    return ids
+
+
+def test_run_once_expires_overdue_live_diagnoses_and_publishes(async_session_factory, async_db_engine):
+    broker = DiagnosisStateBroker()
+    sweeper = DiagnosisExpirySweeper(broker=broker, session_factory=async_session_factory, interval=0)
+    past = get_datetime_now_minus_timedelta(timedelta(minutes=1))
+    future = get_datetime_now_plus_timedelta(timedelta(minutes=30))
+
+    async def scenario():
+        ready_id, started_id, live_id, completed_id = await create_diagnoses(
+            async_session_factory,
+            [
+                (DiagnosisStateDTO.READY, past),
+                (DiagnosisStateDTO.STARTED, past),
+                (DiagnosisStateDTO.STARTED, future),
+                (DiagnosisStateDTO.COMPLETED, past),
+            ],
+        )
+
+        with broker.subscribe(started_id) as subscription:
+            with capture_statements(async_db_engine.sync_engine) as statements:
+                expired_ids = await sweeper.run_once()
+            event = await subscription.get(1)
+
+        # UPDATE ... RETURNING 한 번으로 처리
+        assert len(statements) == 1
+        assert sorted(expired_ids) == [ready_id, started_id]
+        assert event.state == DiagnosisStateDTO.EXPIRED
+
+        async with async_session_factory() as db:
+            states = dict((await db.execute(select(Diagnosis.id, Diagnosis.state))).all())
+        assert states[live_id].value == "STARTED"
+        assert states[completed_id].value == "COMPLETED"
+
+        # 이미 만료된 진단은 다시 전환/발행하지 않음
+        assert await sweeper.run_once() == []
+
+    asyncio.run(scenario())
+    assert broker.get_metrics()["published"] == 2
+
+
+def test_start_runs_periodically_until_stopped(async_session_factory):
+    broker = DiagnosisStateBroker()
+    sweeper = DiagnosisExpirySweeper(broker=broker, session_factory=async_session_factory, interval=0.05)
+
+    async def scenario():
+        (diagnosis_id,) = await create_diagnoses(async_session_factory, [(DiagnosisStateDTO.READY, get_datetime_now_minus_timedelta(timedelta(seconds=1)))])
+        # 인메모리 DB 커넥션 하나를 공유하므로 DB를 폴링하지 않고 발행된 상태 변경을 기다림
+        with broker.subscribe(diagnosis_id) as subscription:
+            await sweeper.start()
+            event = await subscription.get(5)
+        await sweeper.stop()
+        async with async_session_factory() as db:
+            return event.state, (await db.get(Diagnosis, diagnosis_id)).state.value
+
+    assert asyncio.run(scenario()) == (DiagnosisStateDTO.EXPIRED, "EXPIRED")
+
+
+def test_start_is_disabled_when_interval_is_zero(async_session_factory):
+    sweeper = DiagnosisExpirySweeper(session_factory=async_session_factory, interval=0)
+
+    async def scenario():
+        await sweeper.start()
+        assert sweeper._task is None
+        await sweeper.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from app.dtos.diagnosis_dto import DiagnosisStateDTO, DiagnosisTypeDTO
+from app.repositories.diagnosis_repository import DiagnosisRepository, _expire_overdue_statement
+from app.utils import get_datetime_now, get_datetime_now_minus_timedelta, get_datetime_now_plus_timedelta
+import pytest
+from tests.utils import capture_statements
+
+
+@pytest.fixture
+def explain(db_engine):
+    """함수가 실행한 SELECT/UPDATE 문들의 실행 계획(EXPLAIN QUERY PLAN)을 반환"""
+
+    def run(func, *args):
+        with capture_statements(db_engine, with_parameters=True) as executed:
+            func(*args)
+
+        with db_engine.connect() as conn:
+            return [
+                "\n".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+                for statement, parameters in executed
+                if statement.lstrip().upper().startswith(("SELECT", "UPDATE"))
+            ]
+
+    return run
+
+
+@pytest.fixture
+def db(session_factory):
+    repository = DiagnosisRepository()
+    db = session_factory()
+    for i in range(20):
+        diagnosis = repository.create_diagnosis(
+            db,
+            doctor_id=i % 3 + 1,
+            patient_id=i % 5 + 1,
+            code=f"CODE{i:02d}",
+            type=DiagnosisTypeDTO.BALANCEBALL,
+            state=DiagnosisStateDTO.COMPLETED if i % 2 else DiagnosisStateDTO.READY,
+            level=1,
+            expired_at=get_datetime_now_plus_timedelta(timedelta(minutes=30)),
+        )
+        repository.create_diagnosis_result(db, diagnosis.id, f"original/{i}.csv", f"processed/{i}.csv", 1.0, 2.0, 60.0)
+    yield db
+    db.close()
+
+
+def test_patient_records_use_composite_index(db, explain):
+    start_date = get_datetime_now_minus_timedelta(timedelta(days=1))
+    end_date = get_datetime_now_plus_timedelta(timedelta(days=1))
+
+    [plan] = explain(DiagnosisRepository().get_diagnosis_records_by_patient, db, 1, start_date, end_date)
+
+    assert "USING INDEX ix_diagnoses_patient_id_state_created_at" in plan
+    assert "USING INDEX ix_diagnosis_results_diagnosis_id" in plan
+
+
+def test_live_diagnosis_uses_doctor_state_index(db, explain):
+    [plan] = explain(DiagnosisRepository().get_live_diagnosis_by_doctor_id, db, 1)
+
+    assert "USING INDEX ix_diagnoses_doctor_id_state" in plan
+
+
+def test_code_lookup_uses_index(db, explain):
+    [plan] = explain(DiagnosisRepository().get_diagnosis_by_code, db, "CODE03")
+
+    assert "USING INDEX ix_diagnoses_code" in plan
+
+
+def test_diagnosis_record_uses_result_index(db, explain):
+    [plan] = explain(DiagnosisRepository().get_diagnosis_record, db, 3)
+
+    assert "USING INDEX ix_diagnosis_results_diagnosis_id" in plan
+
+
+def test_expire_overdue_uses_live_expired_at_partial_index(db, explain):
+    # 진행중(READY, STARTED) 진단만 담은 부분 인덱스로 만료 대상을 찾음 (완료된 진단이 쌓여도 전체 스캔하지 않음)
+    [plan] = explain(db.execute, _expire_overdue_statement(get_datetime_now()))
+
+    assert "USING INDEX ix_diagnoses_live_expired_at" in plan
@@ -0,0 +1,174 @@
+import asyncio
+from datetime import timedelta
+
+from app.dtos.diagnosis_dto import DiagnosisStateDTO, DiagnosisTypeDTO
+from app.models.diagnosis import Diagnosis, DiagnosisResult
+from app.repositories.diagnosis_repository import AsyncDiagnosisRepository, DiagnosisRepository
+from app.services.diagnosis_service import DiagnosisService
+from app.utils import get_datetime_now_minus_timedelta, get_datetime_now_plus_timedelta
+import pytest
+from tests.utils import capture_statements
+
+
+def create_record(repository: DiagnosisRepository, db, patient_id: int, state: DiagnosisStateDTO, with_result: bool = True):
+    diagnosis = repository.create_diagnosis(
+        db,
+        doctor_id=1,
+        patient_id=patient_id,
+        code="ABC123",
+        type=DiagnosisTypeDTO.BALANCEBALL,
+        state=state,
+        level=1,
+        expired_at=get_datetime_now_plus_timedelta(timedelta(minutes=30)),
+    )
+    if with_result:
+        repository.create_diagnosis_result(db, diagnosis.id, f"original/{diagnosis.id}.csv", f"processed/{diagnosis.id}.csv", 1.0, 2.0, 60.0)
+    return diagnosis
+
+
+@pytest.mark.parametrize("records", [1, 50])
+def test_get_diagnosis_records_by_patient_uses_single_query(session_factory, db_engine, records):
+    repository = DiagnosisRepository()
+    db = session_factory()
+    expected_ids = [create_record(repository, db, 1, DiagnosisStateDTO.COMPLETED).id for _ in range(records)]
+    create_record(repository, db, 1, DiagnosisStateDTO.COMPLETED, with_result=False)
+    create_record(repository, db, 1, DiagnosisStateDTO.FAILED)
+    create_record(repository, db, 2, DiagnosisStateDTO.COMPLETED)
+    db.expunge_all()
+
+    with capture_statements(db_engine) as statements:
+        result = repository.get_diagnosis_records_by_patient(
+            db, 1, get_datetime_now_minus_timedelta(timedelta(days=1)), get_datetime_now_plus_timedelta(timedelta(days=1))
+        )
+        # 반환된 결과 객체 접근 시 추가 쿼리가 없어야 함
+        paths = [diagnosis_result.processed_file_path for _, diagnosis_result in result]
+
+    assert len(statements) == 1
+    assert [diagnosis.id for diagnosis, _ in result] == sorted(expected_ids, reverse=True)
+    assert paths == [f"processed/{diagnosis_id}.csv" for diagnosis_id in sorted(expected_ids, reverse=True)]
+
+
+def test_get_diagnosis_records_by_patient_pages_by_cursor(session_factory):
+    repository = DiagnosisRepository()
+    db = session_factory()
+    expected_ids = [create_record(repository, db, 1, DiagnosisStateDTO.COMPLETED).id for _ in range(7)]
+    # 생성 시각이 같은 기록은 id로 순서를 정함
+    same_created_at = db.get(Diagnosis, expected_ids[0]).created_at
+    db.query(Diagnosis).filter(Diagnosis.id.in_(expected_ids[2:5])).update({Diagnosis.created_at: same_created_at}, synchronize_session=False)
+    db.commit()
+    db.expire_all()
+    expected_order = [diagnosis.id for diagnosis in sorted(db.query(Diagnosis).all(), key=lambda d: (d.created_at, d.id), reverse=True)]
+    start_date, end_date = get_datetime_now_minus_timedelta(timedelta(days=1)), get_datetime_now_plus_timedelta(timedelta(days=1))
+
+    paged_ids, cursor = [], None
+    while True:
+        page = repository.get_diagnosis_records_by_patient(db, 1, start_date, end_date, limit=3, cursor=cursor)
+        paged_ids.extend(diagnosis.id for diagnosis, _ in page)
+        if len(page) < 3:
+            break
+        last_diagnosis, _ = page[-1]
+        # 서비스가 발급하는 커서와 동일하게 인코딩/디코딩
+        cursor = DiagnosisService.decode_record_cursor(DiagnosisService.encode_record_cursor(last_diagnosis.created_at, last_diagnosis.id))
+
+    assert paged_ids == expected_order
+
+
+def test_decode_record_cursor_rejects_invalid_cursor():
+    with pytest.raises(ValueError):
+        DiagnosisService.decode_record_cursor("invalid")
+
+
+def test_get_diagnosis_record_uses_single_query(session_factory, db_engine):
+    repository = DiagnosisRepository()
+    db = session_factory()
+    diagnosis_id = create_record(repository, db, 1, DiagnosisStateDTO.COMPLETED).id
+    without_result_id = create_record(repository, db, 1, DiagnosisStateDTO.COMPLETED, with_result=False).id
+    db.expunge_all()
+
+    with capture_statements(db_engine) as statements:
+        diagnosis, diagnosis_result = repository.get_diagnosis_record(db, diagnosis_id)
+
+    assert len(statements) == 1
+    assert diagnosis.id == diagnosis_id
+    assert diagnosis_result.diagnosis_id == diagnosis_id
+    assert repository.get_diagnosis_record(db, without_result_id) is None
+
+
+def test_update_state_is_single_conditional_update(session_factory, db_engine):
+    repository = DiagnosisRepository()
+    db = session_factory()
+    diagnosis_id = create_record(repository, db, 1, DiagnosisStateDTO.READY, with_result=False).id
+    loaded = repository.get_diagnosis_by_id(db, diagnosis_id)
+
+    with capture_statements(db_engine) as statements:
+        updated = repository.update_state(db, diagnosis_id, DiagnosisStateDTO.STARTED)
+        # 반환된 객체 접근 시 다시 조회하지 않음
+        state, updated_at = updated.state, updated.updated_at
+
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("UPDATE")
+    assert state.value == "STARTED"
+    assert updated_at is not None
+    # 같은 세션에서 이미 조회한 객체에도 반영됨
+    assert loaded.state.value == "STARTED"
+
+
+@pytest.mark.parametrize(
+    "current, target, allowed",
+    [
+        (DiagnosisStateDTO.READY, DiagnosisStateDTO.STARTED, True),
+        (DiagnosisStateDTO.STARTED, DiagnosisStateDTO.EXPIRED, True),
+        (DiagnosisStateDTO.EXPIRED, DiagnosisStateDTO.COMPLETED, True),
+        (DiagnosisStateDTO.STARTED, DiagnosisStateDTO.STARTED, False),
+        (DiagnosisStateDTO.COMPLETED, DiagnosisStateDTO.EXPIRED, False),
+        (DiagnosisStateDTO.CANCELLED, DiagnosisStateDTO.STARTED, False),
+        (DiagnosisStateDTO.FAILED, DiagnosisStateDTO.COMPLETED, False),
+    ],
+)
+def test_update_state_rejects_illegal_transitions(session_factory, db_engine, current, target, allowed):
+    repository = DiagnosisRepository()
+    db = session_factory()
+    diagnosis_id = create_record(repository, db, 1, current, with_result=False).id
+
+    with capture_statements(db_engine) as statements:
+        updated = repository.update_state(db, diagnosis_id, target)
+
+    assert len(statements) == 1
+    assert (updated is not None) == allowed
+    db.expire_all()
+    assert repository.get_diagnosis_by_id(db, diagnosis_id).state.value == (target if allowed else current).value
+
+
+def test_async_repository_matches_sync_queries(async_session_factory, async_db_engine):
+    repository = AsyncDiagnosisRepository()
+    start_date, end_date = get_datetime_now_minus_timedelta(timedelta(days=1)), get_datetime_now_plus_timedelta(timedelta(days=1))
+
+    async def scenario():
+        async with async_session_factory() as db:
+            diagnosis_ids = []
+            for state in (DiagnosisStateDTO.COMPLETED, DiagnosisStateDTO.COMPLETED, DiagnosisStateDTO.READY):
+                diagnosis = await repository.create_diagnosis(
+                    db, 1, 1, "ABC123", DiagnosisTypeDTO.BALANCEBALL, state, 1, get_datetime_now_plus_timedelta(timedelta(minutes=30))
+                )
+                db.add(DiagnosisResult(diagnosis_id=diagnosis.id, original_file_path="o.csv", processed_file_path=f"{diagnosis.id}.csv"))
+                diagnosis_ids.append(diagnosis.id)
+            await db.commit()
+            db.expunge_all()
+
+            with capture_statements(async_db_engine.sync_engine) as statements:
+                records = await repository.get_diagnosis_records_by_patient(db, 1, start_date, end_date, limit=1)
+                paths = [diagnosis_result.processed_file_path for _, diagnosis_result in records]
+            assert len(statements) == 1
+            assert paths == [f"{diagnosis_ids[1]}.csv"]
+
+            live = await repository.get_live_diagnosis_by_doctor_id(db, 1)
+            assert live.id == diagnosis_ids[2]
+            diagnosis, _ = await repository.get_diagnosis_record(db, diagnosis_ids[0])
+            assert diagnosis.id == diagnosis_ids[0]
+
+            updated = await repository.update_state(db, diagnosis_ids[2], DiagnosisStateDTO.STARTED)
+            assert updated.state.value == "STARTED"
+            assert await repository.update_state(db, 999, DiagnosisStateDTO.STARTED) is None
+            assert await repository.update_state(db, diagnosis_ids[0], DiagnosisStateDTO.EXPIRED) is None
+
+    asyncio.run(scenario())
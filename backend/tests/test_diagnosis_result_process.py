@@ -0,0 +1,194 @@
+from datetime import datetime
+import io
+import os
+
+from app.dtos.diagnosis_dto import DiagnosisTypeDTO
+from app.services.diagnosis_result_process import DiagnosisResultProcessor, DiagnosisScore
+import numpy as np
+import pandas as pd
+import pytest
+from tests.utils import make_result_csv, make_states
+
+
+class LegacyDiagnosisResultProcessor(DiagnosisResultProcessor):
+    """행 단위 반복으로 구현된 기존 전처리 (회귀 비교용)"""
+
+    def preprocess(self, type: DiagnosisTypeDTO, file: bytes):
+        df = pd.read_csv(io.BytesIO(file))
+        df = self._preprocess_time(df)
+        if type == DiagnosisTypeDTO.TENNISBALL:
+            df = self._preprocess_tennisball(df)
+        df = self._sort_columns_alphabetically(df)
+
+        time_spent = self._legacy_convert_to_seconds(df.iloc[-1]["current_time"]) - self._legacy_convert_to_seconds(df.iloc[0]["current_time"])
+        score = DiagnosisScore(score=float(self._score_report(df)), time_spent=float(time_spent), fps=float(df.shape[0] / time_spent))
+
+        return df.to_csv(index=False).encode("utf-8"), score
+
+    def _legacy_convert_to_seconds(self, datetime_str: str) -> float:
+        dt = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S.%f")
+        return (dt - datetime(1970, 1, 1)).total_seconds()
+
+    def _preprocess_time(self, df: pd.DataFrame) -> pd.DataFrame:
+        df["time_in_seconds"] = df["current_time"].apply(self._legacy_convert_to_seconds)
+
+        df["event"] = ""
+        df["spend_time"] = ""
+
+        start_time = df["time_in_seconds"][0]
+
+        for i in range(1, len(df)):
+            if df["State"][i] < df["State"][i - 1]:
+                fail_time = df["time_in_seconds"][i]
+                df.loc[i, "event"] = "Fail"
+                df.loc[i, "spend_time"] = f"{fail_time - start_time}ms"
+                start_time = fail_time
+            elif df["State"][i] > df["State"][i - 1]:
+                fail_time = df["time_in_seconds"][i]
+                df.loc[i, "event"] = "Success"
+                df.loc[i, "spend_time"] = f"{fail_time - start_time}ms"
+
+        start = df["time_in_seconds"][0]
+        df["time (second)"] = df["time_in_seconds"] - start
+        df = df.drop(columns=["time_in_seconds"])
+
+        return df
+
+
+def detect_events_by_loop(states: list, times: list) -> tuple:
+    """기존 반복문 로직을 그대로 옮긴 참조 구현"""
+    event = [""] * len(states)
+    spend_time = [""] * len(states)
+    start_time = times[0]
+    for i in range(1, len(states)):
+        if states[i] < states[i - 1]:
+            event[i] = "Fail"
+            spend_time[i] = f"{times[i] - start_time}ms"
+            start_time = times[i]
+        elif states[i] > states[i - 1]:
+            event[i] = "Success"
+            spend_time[i] = f"{times[i] - start_time}ms"
+    return event, spend_time
+
+
+# 기존 전처리는 행 단위 반복이라 100만 행 비교에 1분 이상 걸리므로 설정한 경우에만 실행
+RUN_SLOW_TESTS = os.getenv("RUN_SLOW_TESTS")
+
+
+@pytest.mark.parametrize(
+    "rows",
+    [10_000, 100_000, pytest.param(1_000_000, marks=pytest.mark.skipif(not RUN_SLOW_TESTS, reason="RUN_SLOW_TESTS가 설정되지 않음"))],
+)
+def test_preprocess_matches_legacy(rows):
+    file = make_result_csv(rows, seed=rows)
+
+    expected_file, expected_score = LegacyDiagnosisResultProcessor().preprocess(DiagnosisTypeDTO.BALANCEBALL, file)
+    processed_file, score = DiagnosisResultProcessor().preprocess(DiagnosisTypeDTO.BALANCEBALL, file)
+
+    assert processed_file == expected_file
+    assert score == expected_score
+
+
+@pytest.mark.parametrize("rows", [10_000, 100_000, 1_000_000])
+def test_detect_events_matches_loop(rows):
+    rng = np.random.default_rng(rows)
+    states = make_states(rows, rng)
+    times = 1737728684.905 + np.cumsum(rng.integers(11, 17, size=rows)) / 1000
+
+    event, spend_time = DiagnosisResultProcessor()._detect_events(states, times)
+    expected_event, expected_spend_time = detect_events_by_loop(states.tolist(), times.tolist())
+
+    assert event.tolist() == expected_event
+    assert spend_time.tolist() == expected_spend_time
+
+
+def test_detect_events():
+    processor = DiagnosisResultProcessor()
+    states = np.array([0, 0, 1, 2, 0, 0, 1, 0])
+    times = np.array([0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0])
+
+    event, spend_time = processor._detect_events(states, times)
+
+    assert event.tolist() == ["", "", "Success", "Success", "Fail", "", "Success", "Fail"]
+    assert spend_time.tolist() == ["", "", "2.0ms", "3.0ms", "4.0ms", "", "2.0ms", "3.0ms"]
+
+
+def test_convert_to_seconds_matches_strptime():
+    column = pd.Series(["2025-01-24 14:24:44.905", "2025-01-24 14:24:44.974123", "2025-01-24 14:24:45.1", "1999-12-31 23:59:59.999999"])
+
+    seconds = DiagnosisResultProcessor()._convert_to_seconds(column)
+
+    assert seconds.tolist() == [LegacyDiagnosisResultProcessor()._legacy_convert_to_seconds(value) for value in column]
+
+
+@pytest.mark.parametrize("chunk_rows", [3, 7, 500, 100_000])
+def test_preprocess_stream_matches_preprocess(chunk_rows):
+    file = make_result_csv(2_000, seed=3)
+
+    expected_file, expected_score = DiagnosisResultProcessor().preprocess(DiagnosisTypeDTO.BALANCEBALL, file)
+    output, score = DiagnosisResultProcessor(chunk_rows=chunk_rows).preprocess_stream(DiagnosisTypeDTO.BALANCEBALL, io.BytesIO(file))
+
+    with output:
+        assert output.read() == expected_file
+    assert score == expected_score
+
+
+def test_preprocess_stream_unifies_chunk_dtypes():
+    # 첫 청크는 정수만, 이후 청크에 실수/결측치가 있어도 전체 읽기와 같은 형식으로 기록되어야 함
+    df = pd.read_csv(io.BytesIO(make_result_csv(100, seed=4)))
+    df.loc[:49, "Rotation_X"] = 0
+    df.loc[80, "Score"] = None
+    file = df.to_csv(index=False).encode("utf-8")
+
+    expected_file, _ = DiagnosisResultProcessor().preprocess(DiagnosisTypeDTO.BALANCEBALL, file)
+    output, _ = DiagnosisResultProcessor(chunk_rows=50).preprocess_stream(DiagnosisTypeDTO.BALANCEBALL, io.BytesIO(file))
+
+    with output:
+        assert output.read() == expected_file
+
+
+def test_preprocess_stream_spools_to_disk():
+    file = make_result_csv(10_000, seed=5)
+
+    output, _ = DiagnosisResultProcessor(chunk_rows=1_000, spool_max_size=1024).preprocess_stream(DiagnosisTypeDTO.BALANCEBALL, io.BytesIO(file))
+
+    with output:
+        assert output._rolled
+
+
+@pytest.mark.parametrize("chunk_rows", [7, 100_000])
+def test_preprocess_stream_writes_parquet(chunk_rows):
+    file = make_result_csv(2_000, seed=6)
+    parquet_output = io.BytesIO()
+
+    output, _ = DiagnosisResultProcessor(chunk_rows=chunk_rows).preprocess_stream(DiagnosisTypeDTO.BALANCEBALL, io.BytesIO(file), parquet_output=parquet_output)
+
+    with output:
+        expected = pd.read_csv(output)
+    df = pd.read_parquet(parquet_output)
+
+    assert list(df.columns) == list(expected.columns)
+    assert df["Rotation_X"].dtype == np.float32
+    assert df["time (second)"].dtype == np.float64
+    assert isinstance(df["event"].dtype, pd.CategoricalDtype)
+    assert df["event"].astype(object).equals(expected["event"])
+    assert df["spend_time"].equals(expected["spend_time"])
+    np.testing.assert_allclose(df["Rotation_X"], expected["Rotation_X"], rtol=1e-6)
+    pd.testing.assert_series_equal(df["State"], expected["State"])
+
+
+def test_preprocess_stream_writes_parquet_for_tennisball():
+    df = pd.read_csv(io.BytesIO(make_result_csv(500, seed=7)))
+    df["Position"] = [f"({i * 0.1}, {i * 0.2}, {i * 0.3})" for i in range(len(df))]
+    df[["Position_X", "Position_Y", "Position_Z"]] = [(i * 0.1, i * 0.2, i * 0.3) for i in range(len(df))]
+    file = df.to_csv(index=False).encode("utf-8")
+    parquet_output = io.BytesIO()
+
+    output, _ = DiagnosisResultProcessor().preprocess_stream(DiagnosisTypeDTO.TENNISBALL, io.BytesIO(file), parquet_output=parquet_output)
+
+    with output:
+        expected = pd.read_csv(output)
+    parquet_df = pd.read_parquet(parquet_output)
+    assert list(parquet_df.columns) == list(expected.columns)
+    assert parquet_df["Scaled_Position_X"].dtype == np.float32
+    np.testing.assert_allclose(parquet_df["Scaled_Position_X"], expected["Scaled_Position_X"], rtol=1e-6)
@@ -0,0 +1,51 @@
+import asyncio
+from datetime import datetime
+import threading
+
+from app.core.diagnosis_state_broker import DiagnosisStateBroker, DiagnosisStateEvent
+from app.dtos.diagnosis_dto import DiagnosisStateDTO
+
+
+def make_event(diagnosis_id: int, state: DiagnosisStateDTO = DiagnosisStateDTO.STARTED) -> DiagnosisStateEvent:
+    return DiagnosisStateEvent(id=diagnosis_id, state=state, timestamp=datetime(2025, 1, 1))
+
+
+def test_publish_delivers_only_to_matching_subscription():
+    broker = DiagnosisStateBroker()
+
+    async def run():
+        with broker.subscribe(1) as first, broker.subscribe(2) as second:
+            broker.publish(make_event(1))
+            return await first.get(timeout=1), await second.get(timeout=0.01)
+
+    first_event, second_event = asyncio.run(run())
+
+    assert first_event == make_event(1)
+    assert second_event is None
+
+
+def test_publish_from_worker_thread_wakes_subscriber():
+    broker = DiagnosisStateBroker()
+
+    async def run():
+        with broker.subscribe(1) as subscription:
+            thread = threading.Thread(target=broker.publish, args=(make_event(1, DiagnosisStateDTO.COMPLETED),))
+            thread.start()
+            event = await subscription.get(timeout=1)
+            thread.join()
+            return event
+
+    assert asyncio.run(run()).state == DiagnosisStateDTO.COMPLETED
+
+
+def test_unsubscribe_removes_subscription():
+    broker = DiagnosisStateBroker()
+
+    async def run():
+        with broker.subscribe(1):
+            assert broker.get_metrics()["subscribers"] == 1
+        broker.publish(make_event(1))
+
+    asyncio.run(run())
+
+    assert broker.get_metrics() == {"diagnoses": 0, "subscribers": 0, "published": 1}
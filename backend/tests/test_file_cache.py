@@ -0,0 +1,83 @@
+import os
+import time
+
+from app.services.file_cache import FileCache
+
+
+def make_cache(tmp_path, max_size=100, max_entry_size=None):
+    return FileCache(str(tmp_path / "cache"), max_size=max_size, max_entry_size=max_entry_size)
+
+
+def test_put_and_get(tmp_path):
+    cache = make_cache(tmp_path)
+
+    assert cache.get("diagnosis/1/processed/a.csv") is None
+    cached = cache.put("diagnosis/1/processed/a.csv", '"abc-2"', [b"hello ", b"world"])
+
+    assert cached.size == 11
+    assert cached.etag == '"abc-2"'
+    hit = cache.get("diagnosis/1/processed/a.csv")
+    assert hit == cached
+    with open(hit.path, "rb") as f:
+        assert f.read() == b"hello world"
+    assert cache.get_metrics() | {"hit_ratio": None} == {
+        "hits": 1,
+        "misses": 1,
+        "hit_ratio": None,
+        "evictions": 0,
+        "entries": 1,
+        "size_bytes": 11,
+        "max_size_bytes": 100,
+    }
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = make_cache(tmp_path, max_size=130, max_entry_size=100)
+    for i, key in enumerate(["a", "b", "c"]):
+        cached = cache.put(key, f"etag{i}", [b"x" * 40])
+        # 사용 시각이 구분되도록 수정 시각을 과거로 설정
+        os.utime(cached.path, (time.time() - 100 + i, time.time() - 100 + i))
+
+    # a를 다시 사용했으므로 b가 가장 오래 사용하지 않은 항목
+    assert cache.get("a")
+    cache.put("d", "etag3", [b"x" * 40])
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("d")
+    assert cache.get("c")
+    assert cache.get_metrics()["evictions"] == 1
+    assert cache.get_metrics()["size_bytes"] == 120
+
+
+def test_failed_write_leaves_no_partial_file(tmp_path):
+    cache = make_cache(tmp_path)
+
+    def broken_chunks():
+        yield b"partial"
+        raise OSError("connection reset")
+
+    assert cache.put("a", "etag", broken_chunks()) is None
+    assert cache.get("a") is None
+    assert os.listdir(cache.directory) == []
+
+
+def test_accepts_entries_up_to_quarter_of_cache_by_default(tmp_path):
+    cache = make_cache(tmp_path, max_size=100)
+
+    assert cache.accepts(25)
+    assert not cache.accepts(26)
+
+
+def test_tee_caches_only_fully_read_stream(tmp_path):
+    cache = make_cache(tmp_path)
+
+    assert list(cache.tee("a", "etag", [b"hello ", b"world"])) == [b"hello ", b"world"]
+    with open(cache.get("a").path, "rb") as f:
+        assert f.read() == b"hello world"
+
+    # 중간에 읽기를 멈추면(클라이언트 연결 끊김) 저장하지 않고 임시 파일도 남기지 않음
+    chunks = cache.tee("b", "etag", [b"partial", b"rest"])
+    assert next(chunks) == b"partial"
+    chunks.close()
+    assert cache.get("b") is None
+    assert sorted(os.listdir(tmp_path / "cache")) == [os.path.basename(cache.get("a").path)]
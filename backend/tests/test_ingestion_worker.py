@@ -0,0 +1,310 @@
+import asyncio
+from datetime import timedelta
+import io
+
+from app.core.diagnosis_state_broker import DiagnosisStateBroker
+from app.core.message_bus import InMemoryMessageBus, UnixSocketMessageBus
+from app.core.task_executor import TaskExecutor
+from app.dtos.diagnosis_dto import DiagnosisStateDTO, DiagnosisTypeDTO
+from app.models.diagnosis import DiagnosisResult
+from app.models.ingestion_job import IngestionJob, IngestionJobState
+from app.repositories import diagnosis_repository
+from app.repositories.diagnosis_repository import DiagnosisRepository
+from app.repositories.ingestion_job_repository import IngestionJobRepository
+from app.services.diagnosis_result_process import DiagnosisResultProcessor
+from app.services.diagnosis_service import DiagnosisService
+from app.utils import get_datetime_now, get_datetime_now_plus_timedelta
+from app.workers.ingestion_worker import IngestionWorker, check_message_bus
+from fastapi import UploadFile
+import pandas as pd
+import pytest
+from tests.utils import make_result_csv
+
+
+class FakeStorageService:
+    """메모리에 객체를 저장하는 StorageService 대체 구현"""
+
+    def __init__(self):
+        self.objects = {}
+        self.fail_uploads = 0
+
+    def upload_file(self, file_path, file):
+        if self.fail_uploads:
+            self.fail_uploads -= 1
+            return False
+        self.objects[file_path] = file.read()
+        return True
+
+    def upload_files(self, files):
+        # 실패는 호출 단위로 계산
+        if self.fail_uploads:
+            self.fail_uploads -= 1
+            return False
+        for file_path, file in files.items():
+            self.objects[file_path] = file.read()
+        return True
+
+    def download_file(self, file_path, file):
+        if file_path not in self.objects:
+            return False
+        file.write(self.objects[file_path])
+        return True
+
+
+@pytest.fixture
+def storage_service():
+    return FakeStorageService()
+
+
+@pytest.fixture
+def diagnosis_service(storage_service):
+    executor = TaskExecutor(process_workers=0, thread_workers=2)
+    diagnosis_service = DiagnosisService(
+        repository=DiagnosisRepository(),
+        storage_service=storage_service,
+        password_manager=None,
+        result_processor=DiagnosisResultProcessor(chunk_rows=100),
+        task_executor=executor,
+        ingestion_job_repository=IngestionJobRepository(),
+        state_broker=DiagnosisStateBroker(),
+    )
+    yield diagnosis_service
+    diagnosis_service.async_storage_service.shutdown()
+    executor.shutdown()
+
+
+def make_worker(diagnosis_service, session_factory):
+    return IngestionWorker(diagnosis_service, session_factory=session_factory, worker_id="test-worker", retry_base_seconds=10, retry_max_seconds=60)
+
+
+def enqueue(diagnosis_service, db, rows=500):
+    diagnosis = DiagnosisRepository().create_diagnosis(
+        db,
+        doctor_id=1,
+        patient_id=1,
+        code="ABC123",
+        type=DiagnosisTypeDTO.BALANCEBALL,
+        state=DiagnosisStateDTO.STARTED,
+        level=1,
+        expired_at=get_datetime_now_plus_timedelta(timedelta(minutes=30)),
+    )
+    file = UploadFile(file=io.BytesIO(make_result_csv(rows, seed=7)), filename="result.csv")
+    return diagnosis, asyncio.run(diagnosis_service.enqueue_diagnosis_result(db, diagnosis.id, diagnosis.type, diagnosis.level, file))
+
+
+def test_enqueue_persists_original_and_pending_job(diagnosis_service, session_factory, storage_service):
+    db = session_factory()
+    _, job = enqueue(diagnosis_service, db)
+
+    assert job.state.value == "PENDING"
+    assert job.attempts == 0
+    assert storage_service.objects[job.original_file_path] == make_result_csv(500, seed=7)
+    assert db.query(DiagnosisResult).count() == 0
+
+
+def test_run_once_processes_job(diagnosis_service, session_factory, storage_service):
+    db = session_factory()
+    diagnosis, job = enqueue(diagnosis_service, db)
+
+    processed = asyncio.run(make_worker(diagnosis_service, session_factory).run_once())
+
+    db.expire_all()
+    assert processed
+    assert db.get(IngestionJob, job.id).state == IngestionJobState.SUCCEEDED
+    assert db.get(type(diagnosis), diagnosis.id).state.value == "COMPLETED"
+    result = db.query(DiagnosisResult).one()
+    assert result.processed_file_path == job.processed_file_path
+    expected_file, expected_score = DiagnosisResultProcessor().preprocess(DiagnosisTypeDTO.BALANCEBALL, make_result_csv(500, seed=7))
+    assert storage_service.objects[job.processed_file_path] == expected_file
+    parquet = pd.read_parquet(io.BytesIO(storage_service.objects[DiagnosisService.parquet_file_path(job.processed_file_path)]))
+    assert len(parquet) == 500
+    assert result.score == expected_score.score
+
+
+def test_failure_while_completing_rolls_back_result_and_retry_completes(diagnosis_service, session_factory, monkeypatch):
+    db = session_factory()
+    diagnosis, job = enqueue(diagnosis_service, db)
+    worker = make_worker(diagnosis_service, session_factory)
+
+    # 결과 기록 직후(COMPLETED 전환 전) 실패
+    def fail_transition(*args):
+        raise RuntimeError("connection lost")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(diagnosis_repository, "_state_transition_statement", fail_transition)
+        assert asyncio.run(worker.run_once())
+
+    db.expire_all()
+    assert db.get(IngestionJob, job.id).state == IngestionJobState.PENDING
+    assert db.get(type(diagnosis), diagnosis.id).state.value == "STARTED"
+    assert db.query(DiagnosisResult).count() == 0
+
+    # 재시도 시 결과 기록과 COMPLETED 전환이 함께 반영됨
+    db.query(IngestionJob).update({IngestionJob.available_at: get_datetime_now()})
+    db.commit()
+    assert asyncio.run(worker.run_once())
+
+    db.expire_all()
+    assert db.get(IngestionJob, job.id).state == IngestionJobState.SUCCEEDED
+    assert db.get(type(diagnosis), diagnosis.id).state.value == "COMPLETED"
+    assert db.query(DiagnosisResult).count() == 1
+
+
+def test_already_recorded_result_still_completes_diagnosis(diagnosis_service, session_factory):
+    db = session_factory()
+    diagnosis, job = enqueue(diagnosis_service, db)
+    # 결과만 기록되고 상태 전환 전에 워커가 중단된 경우
+    DiagnosisRepository().create_diagnosis_result(db, diagnosis.id, job.original_file_path, job.processed_file_path, 1.0, 2.0, 60.0)
+
+    assert asyncio.run(make_worker(diagnosis_service, session_factory).run_once())
+
+    db.expire_all()
+    assert db.get(IngestionJob, job.id).state == IngestionJobState.SUCCEEDED
+    assert db.get(type(diagnosis), diagnosis.id).state.value == "COMPLETED"
+    assert db.query(DiagnosisResult).count() == 1
+
+
+def test_run_once_returns_false_when_queue_empty(diagnosis_service, session_factory):
+    assert not asyncio.run(make_worker(diagnosis_service, session_factory).run_once())
+
+
+def test_failed_job_is_rescheduled_with_backoff(diagnosis_service, session_factory, storage_service):
+    db = session_factory()
+    _, job = enqueue(diagnosis_service, db)
+    storage_service.fail_uploads = 1
+
+    worker = make_worker(diagnosis_service, session_factory)
+    asyncio.run(worker.run_once())
+
+    db.expire_all()
+    failed_job = db.get(IngestionJob, job.id)
+    assert failed_job.state == IngestionJobState.PENDING
+    assert failed_job.attempts == 1
+    assert failed_job.last_error
+    assert failed_job.available_at > get_datetime_now().replace(tzinfo=None) + timedelta(seconds=4)
+    assert db.query(DiagnosisResult).count() == 0
+
+    # 재시도 시각 전에는 가져가지 않음
+    assert not asyncio.run(worker.run_once())
+
+
+def test_job_becomes_dead_after_max_attempts(diagnosis_service, session_factory, storage_service):
+    db = session_factory()
+    diagnosis, job = enqueue(diagnosis_service, db)
+    storage_service.fail_uploads = job.max_attempts
+
+    worker = make_worker(diagnosis_service, session_factory)
+    for _ in range(job.max_attempts):
+        db.query(IngestionJob).update({IngestionJob.available_at: get_datetime_now()})
+        db.commit()
+        assert asyncio.run(worker.run_once())
+
+    db.expire_all()
+    dead_job = db.get(IngestionJob, job.id)
+    assert dead_job.state == IngestionJobState.DEAD
+    assert dead_job.attempts == job.max_attempts
+    assert db.get(type(diagnosis), diagnosis.id).state.value == "FAILED"
+
+
+def test_stale_running_job_is_reclaimed(diagnosis_service, session_factory):
+    db = session_factory()
+    _, job = enqueue(diagnosis_service, db)
+    repository = IngestionJobRepository()
+
+    claimed = repository.claim_next_job(db, "crashed-worker", timedelta(minutes=10))
+    assert claimed.id == job.id
+    assert repository.claim_next_job(db, "other-worker", timedelta(minutes=10)) is None
+
+    claimed.locked_at = get_datetime_now() - timedelta(minutes=11)
+    db.commit()
+    reclaimed = repository.claim_next_job(db, "other-worker", timedelta(minutes=10))
+
+    assert reclaimed.id == job.id
+    assert reclaimed.locked_by == "other-worker"
+    assert reclaimed.attempts == 2
+
+
+def test_job_killing_worker_is_dead_lettered_after_max_attempts(diagnosis_service, session_factory):
+    db = session_factory()
+    diagnosis, job = enqueue(diagnosis_service, db)
+    repository = IngestionJobRepository()
+
+    # 처리 중 워커가 죽는 경우: 작업을 가져간 뒤 mark_failed 없이 잠금만 만료됨
+    for attempt in range(1, job.max_attempts + 1):
+        claimed = repository.claim_next_job(db, f"crashed-worker-{attempt}", timedelta(minutes=10))
+        assert claimed.id == job.id
+        assert claimed.attempts == attempt
+        claimed.locked_at = get_datetime_now() - timedelta(minutes=11)
+        db.commit()
+
+    # 시도 횟수를 모두 사용한 작업은 다시 가져가지 않고 dead-letter 처리
+    assert repository.claim_next_job(db, "other-worker", timedelta(minutes=10)) is None
+    assert not asyncio.run(make_worker(diagnosis_service, session_factory).run_once())
+
+    db.expire_all()
+    dead_job = db.get(IngestionJob, job.id)
+    assert dead_job.state == IngestionJobState.DEAD
+    assert dead_job.attempts == job.max_attempts
+    assert dead_job.locked_by is None
+    assert f"crashed-worker-{job.max_attempts}" in dead_job.last_error
+    assert db.get(type(diagnosis), diagnosis.id).state.value == "FAILED"
+
+
+def test_expired_claim_cannot_overwrite_new_owner(diagnosis_service, session_factory):
+    db = session_factory()
+    _, job = enqueue(diagnosis_service, db)
+    repository = IngestionJobRepository()
+
+    first = repository.claim_next_job(db, "slow-worker", timedelta(minutes=10))
+    first.locked_at = get_datetime_now() - timedelta(minutes=11)
+    db.commit()
+    second = repository.claim_next_job(db, "other-worker", timedelta(minutes=10))
+    assert second.id == job.id
+    assert second.attempts == 2
+
+    # 잠금이 만료된 첫 워커는 완료/실패/잠금 갱신으로 새 워커의 작업을 바꾸지 않음
+    assert repository.mark_succeeded(db, job.id, "slow-worker", 1) is None
+    assert repository.mark_failed(db, job.id, "slow-worker", 1, "late failure", get_datetime_now()) is None
+    assert not repository.renew_lock(db, job.id, "slow-worker", 1)
+    db.expire_all()
+    running_job = db.get(IngestionJob, job.id)
+    assert running_job.state == IngestionJobState.RUNNING
+    assert running_job.locked_by == "other-worker"
+
+    assert repository.mark_succeeded(db, job.id, "other-worker", 2).state == IngestionJobState.SUCCEEDED
+
+
+def test_worker_renews_lock_while_processing(diagnosis_service, session_factory, monkeypatch):
+    db = session_factory()
+    _, job = enqueue(diagnosis_service, db)
+    worker = IngestionWorker(diagnosis_service, session_factory=session_factory, worker_id="test-worker", lock_renew_interval=0.05)
+    locked_at = []
+
+    async def slow_process(process_db, claimed_job):
+        for _ in range(2):
+            with session_factory() as check_db:
+                locked_at.append(check_db.get(IngestionJob, claimed_job.id).locked_at)
+            await asyncio.sleep(0.3)
+
+    monkeypatch.setattr(diagnosis_service, "process_ingestion_job", slow_process)
+    assert asyncio.run(worker.run_once())
+
+    # 처리 중 잠금 시각이 갱신되어 다른 워커가 중단된 작업으로 보지 않음
+    assert locked_at[1] > locked_at[0]
+    db.expire_all()
+    assert db.get(IngestionJob, job.id).state == IngestionJobState.SUCCEEDED
+
+
+def test_retry_delay_is_bounded(diagnosis_service, session_factory):
+    worker = make_worker(diagnosis_service, session_factory)
+
+    for attempts in range(1, 10):
+        backoff = min(10 * 2 ** (attempts - 1), 60)
+        assert backoff / 2 <= worker.retry_delay(attempts).total_seconds() <= backoff
+
+
+def test_worker_refuses_in_memory_message_bus():
+    # memory 버스로는 워커의 상태 변경이 API 프로세스의 SSE 스트림에 전달되지 않음
+    with pytest.raises(RuntimeError):
+        check_message_bus(InMemoryMessageBus())
+    check_message_bus(UnixSocketMessageBus("/tmp/unused.sock"))
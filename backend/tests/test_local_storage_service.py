@@ -0,0 +1,192 @@
+import io
+import os
+import tempfile
+
+from app.services.local_storage_service import TEMP_FILE_PREFIX, LocalStorageService, copy_file, resolve_byte_range
+from app.services.storage_service import InvalidRangeError
+import pytest
+
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def storage_service(tmp_path):
+    return LocalStorageService(str(tmp_path / "storage"))
+
+
+def stored_files(storage_service):
+    return sorted(
+        os.path.relpath(os.path.join(dir_path, filename), storage_service.root_dir)
+        for dir_path, _, filenames in os.walk(storage_service.root_dir)
+        for filename in filenames
+    )
+
+
+def test_upload_file_round_trip(storage_service):
+    data = os.urandom(3 * MB + 17)
+
+    assert storage_service.upload_file("diagnosis/1/processed/result.csv", io.BytesIO(data))
+
+    assert storage_service.get_file_data("diagnosis/1/processed/result.csv") == data
+    assert storage_service.head_file("diagnosis/1/processed/result.csv")["size"] == len(data)
+    # 임시 파일이 남지 않음
+    assert stored_files(storage_service) == [os.path.join("diagnosis", "1", "processed", "result.csv")]
+
+
+def test_upload_file_replaces_existing_object(storage_service):
+    storage_service.upload_file("result.csv", io.BytesIO(b"old"))
+    etag = storage_service.head_file("result.csv")["etag"]
+
+    assert storage_service.upload_file("result.csv", io.BytesIO(b"new data"))
+
+    assert storage_service.get_file_data("result.csv") == b"new data"
+    assert storage_service.head_file("result.csv")["etag"] != etag
+
+
+def test_failed_upload_keeps_previous_object(storage_service):
+    class BrokenFile(io.BytesIO):
+        def read(self, *args):
+            raise OSError("read failed")
+
+    storage_service.upload_file("result.csv", io.BytesIO(b"data"))
+
+    assert not storage_service.upload_files({"result.csv": BrokenFile(), "other.csv": io.BytesIO(b"other")})
+    assert storage_service.get_file_data("result.csv") == b"data"
+    assert not any(os.path.basename(path).startswith(TEMP_FILE_PREFIX) for path in stored_files(storage_service))
+
+
+def test_copy_file_between_disk_files(tmp_path):
+    data = os.urandom(2 * MB + 5)
+    (tmp_path / "src").write_bytes(data)
+
+    with open(tmp_path / "src", "rb") as src, open(tmp_path / "dst", "wb") as dst:
+        src.seek(5)
+        dst.write(b"head")
+        copy_file(src, dst)
+        assert src.tell() == len(data)
+        assert dst.tell() == len(data) - 5 + 4
+
+    assert (tmp_path / "dst").read_bytes() == b"head" + data[5:]
+
+
+def test_download_file_to_memory_and_spooled_file(storage_service):
+    data = os.urandom(MB)
+    storage_service.upload_file("result.csv", io.BytesIO(data))
+
+    buffer = io.BytesIO()
+    assert storage_service.download_file("result.csv", buffer)
+    assert buffer.getvalue() == data
+
+    with tempfile.SpooledTemporaryFile(max_size=10 * MB) as spooled:
+        assert storage_service.download_file("result.csv", spooled)
+        spooled.seek(0)
+        assert spooled.read() == data
+
+    assert not storage_service.download_file("missing.csv", io.BytesIO())
+
+
+def test_get_file_stream_serves_byte_range(storage_service):
+    data = os.urandom(4096)
+    storage_service.upload_file("result.csv", io.BytesIO(data))
+
+    file_stream = storage_service.get_file_stream("result.csv", "bytes=100-199")
+
+    assert file_stream.content_length == 100
+    assert file_stream.content_range == "bytes 100-199/4096"
+    assert file_stream.etag == storage_service.head_file("result.csv")["etag"]
+    assert b"".join(file_stream.iter_chunks()) == data[100:200]
+    assert b"".join(storage_service.get_file_stream("result.csv", "bytes=-10").iter_chunks()) == data[-10:]
+    with pytest.raises(InvalidRangeError):
+        storage_service.get_file_stream("result.csv", "bytes=5000-")
+    assert storage_service.get_file_stream("missing.csv") is None
+
+
+@pytest.mark.parametrize(
+    "byte_range, expected",
+    [("bytes=0-9", (0, 9)), ("bytes=90-", (90, 99)), ("bytes=-5", (95, 99)), ("bytes=50-500", (50, 99)), ("bytes=-500", (0, 99))],
+)
+def test_resolve_byte_range(byte_range, expected):
+    assert resolve_byte_range(byte_range, 100) == expected
+
+
+@pytest.mark.parametrize("byte_range", ["bytes=100-", "bytes=20-10", "bytes=-0", "bytes=-", "items=0-1", "bytes=0-1,5-6"])
+def test_resolve_byte_range_rejects_invalid_range(byte_range):
+    with pytest.raises(InvalidRangeError):
+        resolve_byte_range(byte_range, 100)
+
+
+def test_rejects_path_outside_root(storage_service, tmp_path):
+    assert not storage_service.upload_file("../escape.csv", io.BytesIO(b"data"))
+    assert not (tmp_path / "escape.csv").exists()
+    assert storage_service.head_file("../../etc/passwd") is None
+    assert storage_service.get_cached_file("../escape.csv") is None
+
+
+def test_list_objects_filters_by_prefix(storage_service):
+    for file_path in ("diagnosis/1/original/result.csv", "diagnosis/1/processed/result.csv", "diagnosis/10/original/result.csv", "other.csv"):
+        storage_service.upload_file(file_path, io.BytesIO(b"data"))
+
+    assert [item["key"] for item in storage_service.list_objects("diagnosis/1/")] == [
+        "diagnosis/1/original/result.csv",
+        "diagnosis/1/processed/result.csv",
+    ]
+    assert len(list(storage_service.list_objects("diagnosis/1"))) == 3
+    assert len(list(storage_service.list_objects())) == 4
+    assert list(storage_service.list_objects("missing/")) == []
+
+
+def test_list_objects_in_key_order_with_start_after_and_delimiter(storage_service):
+    # "diagnosis/1-a/..."는 키 순서상 "diagnosis/1/..."보다 앞에 옴
+    file_paths = ("diagnosis/1/processed/result.csv", "diagnosis/1-a/result.csv", "diagnosis/1/original/result.csv", "diagnosis/2/a.csv", "diagnosis/a.txt")
+    for file_path in file_paths:
+        storage_service.upload_file(file_path, io.BytesIO(b"data"))
+
+    keys = [item["key"] for item in storage_service.list_objects("diagnosis/")]
+    assert keys == sorted(keys)
+    assert [item["key"] for item in storage_service.list_objects("diagnosis/", start_after="diagnosis/1/original/result.csv")] == [
+        "diagnosis/1/processed/result.csv",
+        "diagnosis/2/a.csv",
+        "diagnosis/a.txt",
+    ]
+    assert [item["key"] for item in storage_service.list_objects("diagnosis/", delimiter="/")] == ["diagnosis/a.txt"]
+    assert list(storage_service.list_prefixes("diagnosis/")) == ["diagnosis/1-a/", "diagnosis/1/", "diagnosis/2/"]
+    assert list(storage_service.list_prefixes("diagnosis/", start_after="diagnosis/1/")) == ["diagnosis/2/"]
+
+
+def test_delete_objects_removes_files_and_empty_directories(storage_service):
+    for file_path in ("diagnosis/1/original/result.csv", "diagnosis/1/processed/result.csv", "diagnosis/2/original/result.csv"):
+        storage_service.upload_file(file_path, io.BytesIO(b"data"))
+
+    keys = (item["key"] for item in storage_service.list_objects("diagnosis/1/"))
+    assert storage_service.delete_objects([*keys, "diagnosis/1/missing.csv", "../escape.csv"]) == ["../escape.csv"]
+
+    assert stored_files(storage_service) == [os.path.join("diagnosis", "2", "original", "result.csv")]
+    assert not os.path.exists(os.path.join(storage_service.root_dir, "diagnosis", "1"))
+    assert os.path.isdir(storage_service.root_dir)
+
+
+def test_head_files_returns_metadata_in_input_order(storage_service):
+    storage_service.upload_file("b.csv", io.BytesIO(b"data"))
+    storage_service.upload_file("a.csv", io.BytesIO(b"a"))
+
+    results = list(storage_service.head_files(["b.csv", "missing.csv", "a.csv"]))
+
+    assert [(file_path, metadata and metadata["size"]) for file_path, metadata in results] == [("b.csv", 4), ("missing.csv", None), ("a.csv", 1)]
+
+
+def test_get_cached_file_returns_stored_file(storage_service):
+    storage_service.upload_file("result.csv", io.BytesIO(b"a,b\n1,2\n"))
+
+    cached_file = storage_service.get_cached_file("result.csv")
+
+    assert cached_file.path == os.path.join(storage_service.root_dir, "result.csv")
+    assert cached_file.size == 8
+    assert cached_file.etag == storage_service.head_file("result.csv")["etag"]
+    assert cached_file.content_encoding is None
+    assert storage_service.get_cached_file("missing.csv") is None
+
+
+def test_presigned_urls_are_not_supported(storage_service):
+    assert storage_service.generate_presigned_url("result.csv") is None
+    assert storage_service.generate_download_url("result.csv") is None
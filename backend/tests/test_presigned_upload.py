@@ -0,0 +1,99 @@
+import asyncio
+from datetime import timedelta
+
+from app.configs.env_configs import settings
+from app.core.diagnosis_state_broker import DiagnosisStateBroker
+from app.core.task_executor import TaskExecutor
+from app.dtos.diagnosis_dto import DiagnosisStateDTO, DiagnosisTypeDTO
+from app.models.diagnosis import Diagnosis, DiagnosisResult
+from app.repositories.diagnosis_repository import DiagnosisRepository
+from app.repositories.ingestion_job_repository import IngestionJobRepository
+from app.services.diagnosis_result_process import DiagnosisResultProcessor
+from app.services.diagnosis_service import DiagnosisService
+from app.services.s3_service import S3Service
+from app.utils import get_datetime_now_plus_timedelta
+from app.workers.ingestion_worker import IngestionWorker
+from moto import mock_aws
+import pytest
+import requests
+from tests.utils import make_result_csv
+
+
+BUCKET_NAME = "test-bucket"
+
+
+@pytest.fixture
+def s3_service():
+    with mock_aws():
+        service = S3Service(bucket_name=BUCKET_NAME)
+        service.s3_client.create_bucket(Bucket=BUCKET_NAME, CreateBucketConfiguration={"LocationConstraint": service.region_name})
+        yield service
+
+
+@pytest.fixture
+def diagnosis_service(s3_service):
+    executor = TaskExecutor(process_workers=0, thread_workers=2)
+    diagnosis_service = DiagnosisService(
+        repository=DiagnosisRepository(),
+        storage_service=s3_service,
+        password_manager=None,
+        result_processor=DiagnosisResultProcessor(chunk_rows=100),
+        task_executor=executor,
+        ingestion_job_repository=IngestionJobRepository(),
+        state_broker=DiagnosisStateBroker(),
+    )
+    yield diagnosis_service
+    diagnosis_service.async_storage_service.shutdown()
+    executor.shutdown()
+
+
+@pytest.fixture
+def diagnosis(session_factory):
+    return DiagnosisRepository().create_diagnosis(
+        session_factory(),
+        doctor_id=1,
+        patient_id=1,
+        code="ABC123",
+        type=DiagnosisTypeDTO.BALANCEBALL,
+        state=DiagnosisStateDTO.STARTED,
+        level=1,
+        expired_at=get_datetime_now_plus_timedelta(timedelta(minutes=30)),
+    )
+
+
+def upload(diagnosis_service, diagnosis, data: bytes):
+    key, url = asyncio.run(diagnosis_service.create_result_upload_url(diagnosis.id, DiagnosisTypeDTO.BALANCEBALL, 1))
+    response = requests.put(url, data=data, headers={"Content-Type": "application/octet-stream"})
+    response.raise_for_status()
+    return key, response.headers["ETag"]
+
+
+def test_uploaded_result_is_processed_from_s3(diagnosis_service, diagnosis, session_factory, s3_service):
+    db = session_factory()
+    key, etag = upload(diagnosis_service, diagnosis, make_result_csv(500, seed=7))
+
+    assert key.startswith(f"diagnosis/{diagnosis.id}/original/")
+    job = asyncio.run(diagnosis_service.enqueue_uploaded_diagnosis_result(db, diagnosis.id, key, etag))
+    assert job.original_file_path == key
+    assert job.processed_file_path == key.replace("/original/", "/processed/")
+
+    worker = IngestionWorker(diagnosis_service, session_factory=session_factory, worker_id="test-worker")
+    assert asyncio.run(worker.run_once())
+
+    db.expire_all()
+    assert db.get(Diagnosis, diagnosis.id).state.value == "COMPLETED"
+    assert db.query(DiagnosisResult).one().processed_file_path == job.processed_file_path
+    assert s3_service.head_file(job.processed_file_path)
+
+
+def test_uploaded_result_is_rejected_when_not_verified(diagnosis_service, diagnosis, session_factory, monkeypatch):
+    db = session_factory()
+    key, etag = upload(diagnosis_service, diagnosis, make_result_csv(100, seed=7))
+
+    # ETag 불일치, 다른 진단 경로, 존재하지 않는 객체
+    assert asyncio.run(diagnosis_service.enqueue_uploaded_diagnosis_result(db, diagnosis.id, key, '"0123"')) is None
+    assert asyncio.run(diagnosis_service.enqueue_uploaded_diagnosis_result(db, diagnosis.id + 1, key, etag)) is None
+    assert asyncio.run(diagnosis_service.enqueue_uploaded_diagnosis_result(db, diagnosis.id, f"{key}.missing", etag)) is None
+
+    monkeypatch.setattr(settings, "S3_UPLOAD_MAX_SIZE", 10)
+    assert asyncio.run(diagnosis_service.enqueue_uploaded_diagnosis_result(db, diagnosis.id, key, etag)) is None
@@ -0,0 +1,103 @@
+from app.core.metrics import LatencyHistogram
+from app.core.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, call_with_retry
+import pytest
+
+
+class TransientError(Exception):
+    pass
+
+
+def failing(failures: int, error: Exception = None):
+    calls = []
+
+    def func():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error or TransientError()
+        return "ok"
+
+    func.calls = calls
+    return func
+
+
+def is_transient(error: Exception) -> bool:
+    return isinstance(error, TransientError)
+
+
+def test_retry_delay_is_jittered_and_bounded():
+    policy = RetryPolicy(base_delay=0.1, max_delay=1.0)
+
+    for attempt in range(1, 10):
+        backoff = min(0.1 * 2 ** (attempt - 1), 1.0)
+        assert backoff / 2 <= policy.delay(attempt) <= backoff
+
+
+def test_call_with_retry_retries_transient_errors():
+    func = failing(2)
+    sleeps = []
+    attempts = []
+
+    result = call_with_retry(func, RetryPolicy(max_attempts=3), is_transient, on_attempt=lambda seconds, error: attempts.append(error), sleep=sleeps.append)
+
+    assert result == "ok"
+    assert len(func.calls) == 3
+    assert len(sleeps) == 2
+    assert [error is None for error in attempts] == [False, False, True]
+
+
+def test_call_with_retry_does_not_retry_permanent_errors():
+    func = failing(1, ValueError("not found"))
+
+    with pytest.raises(ValueError):
+        call_with_retry(func, RetryPolicy(max_attempts=3), is_transient, sleep=lambda _: None)
+    assert len(func.calls) == 1
+
+
+def test_call_with_retry_stops_at_max_attempts_and_deadline():
+    func = failing(10)
+    with pytest.raises(TransientError):
+        call_with_retry(func, RetryPolicy(max_attempts=4), is_transient, sleep=lambda _: None)
+    assert len(func.calls) == 4
+
+    func = failing(10)
+    with pytest.raises(TransientError):
+        call_with_retry(func, RetryPolicy(max_attempts=10, base_delay=5, max_delay=5, deadline=1), is_transient, sleep=lambda _: None)
+    assert len(func.calls) == 1
+
+
+def test_circuit_breaker_opens_and_recovers():
+    now = [0.0]
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=10, clock=lambda: now[0])
+
+    # 재시도 안에서의 실패도 연속 실패로 계산
+    with pytest.raises(TransientError):
+        call_with_retry(failing(10), RetryPolicy(max_attempts=3), is_transient, breaker, sleep=lambda _: None)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    func = failing(0)
+    with pytest.raises(CircuitOpenError) as exc_info:
+        call_with_retry(func, RetryPolicy(), is_transient, breaker)
+    assert exc_info.value.retry_after == 10
+    assert not func.calls
+
+    # half-open: 시험 호출 하나만 허용하고 실패하면 다시 열림
+    now[0] = 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    now[0] = 20
+    assert call_with_retry(func, RetryPolicy(), is_transient, breaker) == "ok"
+    assert breaker.snapshot() == {"state": "closed", "consecutive_failures": 0, "opened": 2}
+
+
+def test_latency_histogram_buckets_are_cumulative():
+    histogram = LatencyHistogram(buckets=(0.1, 1.0))
+
+    for seconds in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(seconds)
+
+    assert histogram.snapshot() == {"count": 4, "sum": 3.65, "buckets": {"0.1": 2, "1.0": 3, "+Inf": 4}}
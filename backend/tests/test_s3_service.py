@@ -0,0 +1,365 @@
+import io
+import os
+
+from app.configs.env_configs import settings
+from app.core.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from app.services.file_cache import FileCache
+from app.services.s3_service import InvalidRangeError, S3Service
+from botocore.exceptions import EndpointConnectionError
+from moto import mock_aws
+import pytest
+
+
+BUCKET_NAME = "test-bucket"
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def s3_service(monkeypatch):
+    # multipart 업로드가 일어나도록 기준값을 최소 파트 크기(5MB)로 낮춤
+    monkeypatch.setattr(settings, "S3_MULTIPART_THRESHOLD", 5 * MB)
+    monkeypatch.setattr(settings, "S3_MULTIPART_CHUNKSIZE", 5 * MB)
+    # 저장된 바이트를 직접 확인하는 테스트이므로 압축하지 않음
+    monkeypatch.setattr(settings, "S3_CONTENT_ENCODING", "identity")
+    with mock_aws():
+        service = S3Service(bucket_name=BUCKET_NAME)
+        service.s3_client.create_bucket(Bucket=BUCKET_NAME, CreateBucketConfiguration={"LocationConstraint": service.region_name})
+        yield service
+
+
+def test_upload_file_uses_multipart_above_threshold(s3_service):
+    data = os.urandom(12 * MB)
+
+    assert s3_service.upload_file("large.csv", io.BytesIO(data))
+    assert s3_service.upload_file("small.csv", io.BytesIO(b"a,b\n1,2\n"))
+
+    # multipart 업로드 객체의 ETag는 "-{파트 수}"로 끝남
+    assert s3_service.s3_client.head_object(Bucket=BUCKET_NAME, Key="large.csv")["ETag"].strip('"').endswith("-3")
+    assert "-" not in s3_service.s3_client.head_object(Bucket=BUCKET_NAME, Key="small.csv")["ETag"]
+    assert s3_service.get_file_data("large.csv") == data
+
+
+def test_upload_files_uploads_all_objects(s3_service):
+    files = {f"diagnosis/1/{kind}/result.csv": os.urandom(6 * MB) for kind in ("original", "processed")}
+
+    assert s3_service.upload_files({file_path: io.BytesIO(data) for file_path, data in files.items()})
+
+    for file_path, data in files.items():
+        assert s3_service.get_file_data(file_path) == data
+
+
+def test_upload_files_returns_false_when_any_upload_fails(s3_service):
+    class BrokenFile(io.BytesIO):
+        def read(self, *args):
+            raise OSError("read failed")
+
+    assert not s3_service.upload_files({"original.csv": io.BytesIO(b"data"), "processed.csv": BrokenFile()})
+    assert s3_service.get_file_data("original.csv") == b"data"
+
+
+def test_get_file_stream_reads_in_chunks(s3_service):
+    data = os.urandom(MB + 123)
+    s3_service.upload_file("result.csv", io.BytesIO(data))
+
+    file_stream = s3_service.get_file_stream("result.csv")
+    chunks = list(file_stream.iter_chunks(64 * 1024))
+
+    assert file_stream.content_length == len(data)
+    assert file_stream.etag == s3_service.s3_client.head_object(Bucket=BUCKET_NAME, Key="result.csv")["ETag"]
+    assert file_stream.content_range is None
+    assert max(len(chunk) for chunk in chunks) <= 64 * 1024
+    assert b"".join(chunks) == data
+
+
+def test_get_file_stream_serves_byte_range(s3_service):
+    data = os.urandom(4096)
+    s3_service.upload_file("result.csv", io.BytesIO(data))
+
+    file_stream = s3_service.get_file_stream("result.csv", "bytes=100-199")
+
+    assert file_stream.content_length == 100
+    assert file_stream.content_range == "bytes 100-199/4096"
+    assert b"".join(file_stream.iter_chunks()) == data[100:200]
+    with pytest.raises(InvalidRangeError):
+        s3_service.get_file_stream("result.csv", "bytes=5000-")
+    assert s3_service.get_file_stream("missing.csv") is None
+
+
+@pytest.fixture(params=["gzip", "zstd"])
+def compressed_s3_service(request, monkeypatch):
+    monkeypatch.setattr(settings, "S3_CONTENT_ENCODING", request.param)
+    with mock_aws():
+        service = S3Service(bucket_name=BUCKET_NAME)
+        service.s3_client.create_bucket(Bucket=BUCKET_NAME, CreateBucketConfiguration={"LocationConstraint": service.region_name})
+        yield service
+
+
+def make_csv(rows: int) -> bytes:
+    return b"".join(f"{i},{i * 2},{i % 7}\n".encode() for i in range(rows))
+
+
+def test_upload_file_compresses_with_content_encoding(compressed_s3_service):
+    data = make_csv(50000)
+
+    assert compressed_s3_service.upload_file("result.csv", io.BytesIO(data))
+
+    response = compressed_s3_service.s3_client.head_object(Bucket=BUCKET_NAME, Key="result.csv")
+    assert response["ContentEncoding"] == compressed_s3_service.content_encoding
+    assert response["ContentLength"] < len(data) / 2
+    assert compressed_s3_service.get_file_data("result.csv") == data
+
+    downloaded = io.BytesIO()
+    assert compressed_s3_service.download_file("result.csv", downloaded)
+    assert downloaded.getvalue() == data
+
+
+def test_uncompressed_objects_are_still_readable(compressed_s3_service):
+    # 압축 도입 이전 객체 또는 presigned URL로 직접 업로드된 원본
+    data = make_csv(1000)
+    compressed_s3_service.s3_client.put_object(Bucket=BUCKET_NAME, Key="legacy.csv", Body=data)
+
+    assert compressed_s3_service.get_file_data("legacy.csv") == data
+    downloaded = io.BytesIO()
+    assert compressed_s3_service.download_file("legacy.csv", downloaded)
+    assert downloaded.getvalue() == data
+    file_stream = compressed_s3_service.get_file_stream("legacy.csv", "bytes=0-9")
+    assert file_stream.content_encoding is None
+    assert b"".join(file_stream.iter_chunks()) == data[:10]
+
+
+def test_get_file_stream_passes_through_or_decodes_by_accept_encoding(compressed_s3_service):
+    data = make_csv(20000)
+    encoding = compressed_s3_service.content_encoding
+    compressed_s3_service.upload_file("result.csv", io.BytesIO(data))
+    stored_size = compressed_s3_service.head_file("result.csv")["size"]
+
+    file_stream = compressed_s3_service.get_file_stream("result.csv", accept_encoding=f"br, {encoding};q=0.5")
+    assert file_stream.content_encoding == encoding
+    assert file_stream.content_length == stored_size
+    assert len(b"".join(file_stream.iter_chunks())) == stored_size
+
+    # 압축을 받을 수 없는 클라이언트에는 Range를 무시하고 전체를 풀어서 전달
+    file_stream = compressed_s3_service.get_file_stream("result.csv", "bytes=0-9", accept_encoding=f"{encoding};q=0")
+    assert file_stream.content_encoding is None
+    assert file_stream.content_length is None
+    assert file_stream.content_range is None
+    assert file_stream.etag.startswith("W/")
+    assert b"".join(file_stream.iter_chunks()) == data
+
+
+def flaky(func, failures: int):
+    """처음 failures번은 연결 오류를 발생시키는 함수"""
+    calls = []
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        if len(calls) <= failures:
+            raise EndpointConnectionError(endpoint_url="http://s3")
+        return func(*args, **kwargs)
+
+    wrapper.calls = calls
+    return wrapper
+
+
+def test_upload_file_retries_transient_errors(s3_service, monkeypatch):
+    s3_service.retry_policy = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.01)
+    upload_fileobj = flaky(s3_service.s3_client.upload_fileobj, failures=2)
+    monkeypatch.setattr(s3_service.s3_client, "upload_fileobj", upload_fileobj)
+    data = os.urandom(1024)
+
+    # 실패한 시도에서 읽은 만큼 되돌려서 다시 업로드
+    assert s3_service.upload_file("result.csv", io.BytesIO(data))
+
+    assert len(upload_fileobj.calls) == 3
+    assert s3_service.get_file_data("result.csv") == data
+    put_metrics = s3_service.get_metrics()["operations"]["put"]
+    assert put_metrics["calls"] == 3
+    assert put_metrics["failures"] == 2
+    assert put_metrics["retries"] == 2
+    assert put_metrics["latency_seconds"]["count"] == 3
+    assert s3_service.get_metrics()["circuit_breaker"]["state"] == "closed"
+
+
+def test_upload_file_fails_after_max_attempts_or_deadline(s3_service, monkeypatch):
+    upload_fileobj = flaky(s3_service.s3_client.upload_fileobj, failures=10)
+    monkeypatch.setattr(s3_service.s3_client, "upload_fileobj", upload_fileobj)
+
+    s3_service.retry_policy = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.01)
+    assert not s3_service.upload_file("result.csv", io.BytesIO(b"data"))
+    assert len(upload_fileobj.calls) == 3
+
+    # 다음 시도까지 기다리면 기한을 넘기는 경우 재시도하지 않음
+    s3_service.retry_policy = RetryPolicy(max_attempts=10, base_delay=1.0, max_delay=1.0, deadline=0.5)
+    assert not s3_service.upload_file("result.csv", io.BytesIO(b"data"))
+    assert len(upload_fileobj.calls) == 4
+    assert s3_service.head_file("result.csv") is None
+
+
+def test_upload_file_verifies_stored_size(s3_service, monkeypatch):
+    head_object = s3_service.s3_client.head_object
+    monkeypatch.setattr(s3_service.s3_client, "head_object", lambda **kwargs: {**head_object(**kwargs), "ContentLength": 0})
+
+    assert not s3_service.upload_file("result.csv", io.BytesIO(b"data"))
+
+
+def test_circuit_breaker_fails_fast_while_s3_is_degraded(s3_service, monkeypatch):
+    now = [0.0]
+    s3_service.retry_policy = RetryPolicy(max_attempts=1)
+    s3_service.circuit_breaker = CircuitBreaker("s3", failure_threshold=2, reset_timeout=30, clock=lambda: now[0])
+    s3_service.upload_file("result.csv", io.BytesIO(b"data"))
+    get_object = flaky(s3_service.s3_client.get_object, failures=2)
+    monkeypatch.setattr(s3_service.s3_client, "get_object", get_object)
+
+    for _ in range(2):
+        with pytest.raises(EndpointConnectionError):
+            s3_service.get_file_stream("result.csv")
+    assert s3_service.get_metrics()["circuit_breaker"]["state"] == "open"
+
+    # 서킷이 열려 있는 동안에는 요청을 보내지 않음
+    with pytest.raises(CircuitOpenError):
+        s3_service.get_file_stream("result.csv")
+    assert not s3_service.upload_file("other.csv", io.BytesIO(b"data"))
+    assert s3_service.head_file("result.csv") is None
+    assert len(get_object.calls) == 2
+    assert s3_service.get_metrics()["operations"]["get"]["rejected"] == 1
+
+    # 대기 시간이 지나면 시험 호출이 성공해 다시 닫힘
+    now[0] = 31
+    assert b"".join(s3_service.get_file_stream("result.csv").iter_chunks()) == b"data"
+    assert s3_service.get_metrics()["circuit_breaker"]["state"] == "closed"
+
+
+def test_missing_objects_do_not_open_circuit(s3_service):
+    s3_service.circuit_breaker = CircuitBreaker("s3", failure_threshold=1)
+
+    for _ in range(3):
+        assert s3_service.head_file("missing.csv") is None
+
+    assert s3_service.get_metrics()["circuit_breaker"]["state"] == "closed"
+
+
+def upload_sessions(s3_service, diagnosis_ids):
+    for diagnosis_id in diagnosis_ids:
+        for kind in ("original", "processed"):
+            s3_service.s3_client.put_object(Bucket=BUCKET_NAME, Key=f"diagnosis/{diagnosis_id}/{kind}/result.csv", Body=b"data")
+
+
+def test_list_objects_paginates_lazily(s3_service, monkeypatch):
+    upload_sessions(s3_service, range(1, 6))
+    s3_service.list_page_size = 3
+    list_objects_v2 = flaky(s3_service.s3_client.list_objects_v2, failures=0)
+    monkeypatch.setattr(s3_service.s3_client, "list_objects_v2", list_objects_v2)
+
+    objects = s3_service.list_objects("diagnosis/")
+    assert next(objects)["key"] == "diagnosis/1/original/result.csv"
+    # 필요한 페이지만 요청함
+    assert len(list_objects_v2.calls) == 1
+
+    keys = ["diagnosis/1/original/result.csv"] + [item["key"] for item in objects]
+    assert keys == sorted(f"diagnosis/{diagnosis_id}/{kind}/result.csv" for diagnosis_id in range(1, 6) for kind in ("original", "processed"))
+    assert len(list_objects_v2.calls) == 4
+    assert [item["key"] for item in s3_service.list_objects("diagnosis/", start_after="diagnosis/4/original/result.csv")] == [
+        "diagnosis/4/processed/result.csv",
+        "diagnosis/5/original/result.csv",
+        "diagnosis/5/processed/result.csv",
+    ]
+
+
+def test_list_objects_raises_instead_of_truncating(s3_service, monkeypatch):
+    upload_sessions(s3_service, range(1, 3))
+    s3_service.list_page_size = 2
+    s3_service.retry_policy = RetryPolicy(max_attempts=1)
+    list_objects_v2 = s3_service.s3_client.list_objects_v2
+
+    def fail_on_next_page(**kwargs):
+        if "ContinuationToken" in kwargs:
+            raise EndpointConnectionError(endpoint_url="http://s3")
+        return list_objects_v2(**kwargs)
+
+    monkeypatch.setattr(s3_service.s3_client, "list_objects_v2", fail_on_next_page)
+
+    objects = s3_service.list_objects("diagnosis/")
+    assert len([next(objects), next(objects)]) == 2
+    with pytest.raises(EndpointConnectionError):
+        next(objects)
+
+
+def test_list_prefixes_lists_diagnosis_directories(s3_service):
+    upload_sessions(s3_service, (1, 2, 10))
+    s3_service.s3_client.put_object(Bucket=BUCKET_NAME, Key="diagnosis/readme.txt", Body=b"data")
+    s3_service.list_page_size = 2
+
+    assert list(s3_service.list_prefixes("diagnosis/")) == ["diagnosis/1/", "diagnosis/10/", "diagnosis/2/"]
+    assert list(s3_service.list_prefixes("diagnosis/", start_after="diagnosis/10/")) == ["diagnosis/2/"]
+    assert list(s3_service.list_prefixes("diagnosis/1/")) == ["diagnosis/1/original/", "diagnosis/1/processed/"]
+    assert [item["key"] for item in s3_service.list_objects("diagnosis/", delimiter="/")] == ["diagnosis/readme.txt"]
+
+
+def test_delete_objects_in_batches(s3_service, monkeypatch):
+    monkeypatch.setattr("app.services.s3_service.DELETE_BATCH_SIZE", 3)
+    upload_sessions(s3_service, range(1, 5))
+    delete_objects = flaky(s3_service.s3_client.delete_objects, failures=0)
+    monkeypatch.setattr(s3_service.s3_client, "delete_objects", delete_objects)
+
+    # 목록을 지연 조회하면서 삭제 (없는 객체는 삭제된 것으로 봄)
+    keys = (item["key"] for item in s3_service.list_objects("diagnosis/") if not item["key"].startswith("diagnosis/4/"))
+    assert s3_service.delete_objects([*keys, "diagnosis/missing.csv"]) == []
+
+    assert len(delete_objects.calls) == 3
+    assert [item["key"] for item in s3_service.list_objects()] == ["diagnosis/4/original/result.csv", "diagnosis/4/processed/result.csv"]
+
+
+def test_delete_objects_returns_failed_keys(s3_service, monkeypatch):
+    upload_sessions(s3_service, (1,))
+    s3_service.retry_policy = RetryPolicy(max_attempts=1)
+    monkeypatch.setattr(s3_service.s3_client, "delete_objects", flaky(s3_service.s3_client.delete_objects, failures=1))
+    keys = [item["key"] for item in s3_service.list_objects()]
+
+    assert s3_service.delete_objects(keys) == keys
+    assert s3_service.delete_objects(keys) == []
+
+
+def test_head_files_returns_metadata_in_input_order(s3_service):
+    upload_sessions(s3_service, range(1, 21))
+    s3_service.head_batch_concurrency = 4
+    file_paths = [f"diagnosis/{diagnosis_id}/processed/result.csv" for diagnosis_id in range(20, 0, -1)] + ["diagnosis/missing.csv"]
+
+    results = list(s3_service.head_files(iter(file_paths)))
+
+    assert [file_path for file_path, _ in results] == file_paths
+    assert all(metadata["size"] == 4 for _, metadata in results[:-1])
+    assert results[-1][1] is None
+
+
+def test_file_stream_fills_cache_while_streaming(s3_service, tmp_path):
+    s3_service.file_cache = FileCache(str(tmp_path / "cache"), max_size=10 * MB)
+    data = os.urandom(MB + 123)
+    s3_service.upload_file("processed.csv", io.BytesIO(data))
+
+    # 캐시에 없으면 저장소를 조회하지 않고 None
+    assert s3_service.get_cached_file("processed.csv") is None
+
+    # Range 요청은 캐시에 기록하지 않음
+    file_stream = s3_service.get_file_stream("processed.csv", "bytes=0-9")
+    assert b"".join(file_stream.iter_chunks()) == data[:10]
+    assert s3_service.get_cached_file("processed.csv") is None
+
+    # 전체 다운로드를 기다리지 않고 스트림을 바로 반환하고, 끝까지 전달한 뒤 캐시에 저장
+    file_stream = s3_service.get_file_stream("processed.csv")
+    chunks = file_stream.iter_chunks()
+    first = next(chunks)
+    assert s3_service.get_cached_file("processed.csv") is None
+    assert first + b"".join(chunks) == data
+    cached_file = s3_service.get_cached_file("processed.csv")
+    assert cached_file.etag == file_stream.etag
+    with open(cached_file.path, "rb") as f:
+        assert f.read() == data
+
+
+def test_shutdown_stops_transfer_executors(s3_service):
+    s3_service.shutdown()
+
+    with pytest.raises(RuntimeError):
+        s3_service._upload_executor.submit(print)
+    with pytest.raises(RuntimeError):
+        s3_service._head_executor.submit(print)
@@ -0,0 +1,101 @@
+import asyncio
+import os
+import tempfile
+import threading
+
+from app.core.task_executor import TaskExecutor
+from app.dtos.diagnosis_dto import DiagnosisTypeDTO
+from app.services.diagnosis_result_process import DiagnosisResultProcessor, preprocess_file
+import pandas as pd
+import pytest
+from tests.utils import make_result_csv
+
+
+def test_run_io_executes_off_event_loop():
+    executor = TaskExecutor(process_workers=0, thread_workers=2)
+
+    async def run():
+        return await executor.run_io(threading.get_ident), threading.get_ident()
+
+    try:
+        worker_thread, loop_thread = asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    assert worker_thread != loop_thread
+    assert executor.get_metrics()["io"]["completed"] == 1
+
+
+def test_run_cpu_preprocesses_in_worker_process(tmp_path):
+    executor = TaskExecutor(process_workers=1, thread_workers=1)
+    file = make_result_csv(1_000, seed=6)
+    source = tmp_path / "source.csv"
+    source.write_bytes(file)
+    processor = DiagnosisResultProcessor(chunk_rows=100)
+
+    try:
+        output_path, parquet_path, score = asyncio.run(executor.run_cpu(preprocess_file, processor, DiagnosisTypeDTO.BALANCEBALL, str(source)))
+    finally:
+        executor.shutdown()
+
+    expected_file, expected_score = processor.preprocess(DiagnosisTypeDTO.BALANCEBALL, file)
+    with open(output_path, "rb") as f:
+        assert f.read() == expected_file
+    os.remove(output_path)
+    assert len(pd.read_parquet(parquet_path)) == 1000
+    os.remove(parquet_path)
+    assert score == expected_score
+
+    cpu_metrics = executor.get_metrics()["cpu"]
+    assert cpu_metrics["completed"] == 1
+    assert cpu_metrics["busy_seconds"] > 0
+
+
+def test_failed_task_is_counted_and_raised():
+    executor = TaskExecutor(process_workers=0, thread_workers=1)
+
+    try:
+        with pytest.raises(ValueError):
+            asyncio.run(executor.run_io(int, "not a number"))
+    finally:
+        executor.shutdown()
+
+    io_metrics = executor.get_metrics()["io"]
+    assert io_metrics["failed"] == 1
+    assert io_metrics["queue_depth"] == 0
+    assert io_metrics["running"] == 0
+
+
+def test_queue_depth_reflects_waiting_tasks():
+    executor = TaskExecutor(process_workers=0, thread_workers=1)
+    release = threading.Event()
+    snapshots = []
+
+    async def run():
+        tasks = [asyncio.ensure_future(executor.run_io(release.wait, 5)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        snapshots.append(executor.get_metrics()["io"])
+        release.set()
+        await asyncio.gather(*tasks)
+
+    try:
+        asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    assert snapshots[0]["running"] == 1
+    assert snapshots[0]["queue_depth"] == 2
+    assert executor.get_metrics()["io"]["completed"] == 3
+
+
+def test_preprocess_file_removes_output_on_failure(tmp_path, monkeypatch):
+    source = tmp_path / "broken.csv"
+    source.write_bytes(b"current_time,Score,State\nnot-a-time,0,0\n")
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(output_dir))
+
+    with pytest.raises(ValueError):
+        preprocess_file(DiagnosisResultProcessor(), DiagnosisTypeDTO.BALANCEBALL, str(source))
+
+    assert os.listdir(output_dir) == []
@@ -0,0 +1,53 @@
+from contextlib import contextmanager
+from typing import Any, Iterator, List
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def make_states(rows: int, rng: np.random.Generator) -> np.ndarray:
+    """성공 시 1 증가, 실패 시 0으로 초기화되는 State 시퀀스 생성"""
+    step = rng.choice([0, 1, -1], size=rows, p=[0.98, 0.015, 0.005])
+    step[0] = 0
+    success = np.cumsum(step > 0)
+    segment = np.cumsum(step < 0)
+    segment_base = success[np.searchsorted(segment, segment)]
+    return success - segment_base
+
+
+def make_result_csv(rows: int, seed: int = 0) -> bytes:
+    """VR 클라이언트 결과 형식의 합성 CSV 생성"""
+    rng = np.random.default_rng(seed)
+
+    # 60~90fps 간격의 타임스탬프
+    offsets = np.cumsum(rng.integers(11, 17, size=rows)) - 11
+    timestamps = np.datetime64("2025-01-24T14:24:44.905") + offsets.astype("timedelta64[ms]")
+    current_time = np.char.replace(np.datetime_as_string(timestamps, unit="ms"), "T", " ")
+
+    state = make_states(rows, rng)
+    data = {
+        "Rotation_X": rng.random(rows).round(7),
+        "Rotation_Y": rng.random(rows).round(7),
+        "Rotation_Z": rng.random(rows).round(7),
+        "current_time": current_time,
+        "Score": np.cumsum(np.diff(state, prepend=0) > 0),
+        "State": state,
+    }
+    return pd.DataFrame(data).to_csv(index=False).encode("utf-8")
+
+
+@contextmanager
+def capture_statements(engine: Engine, with_parameters: bool = False) -> Iterator[List[Any]]:
+    """블록 안에서 실행된 SQL 문 목록 수집 (with_parameters이면 (SQL 문, 파라미터) 목록)"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters) if with_parameters else statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
@@ -6,6 +6,7 @@ from api_clients.base_client import BaseClient
 from api_clients.schemas import (
     ApiResponse,
     DiagnosisRecordListResponse,
+    DiagnosisRecordPage,
     DiagnosisRecordResponse,
 )
 from config import get_settings
@@ -14,6 +15,14 @@ import pandas as pd
 
 settings = get_settings()
 
+# 진단 기록 목록 페이지 크기 및 다음 페이지 커서 헤더
+RECORD_PAGE_SIZE = 50
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# 진단 파일 형식 (parquet은 텍스트 파싱 없이 바로 DataFrame으로 읽음, csv는 내보내기용)
+FILE_FORMAT_PARQUET = "parquet"
+FILE_FORMAT_CSV = "csv"
+
 
 class DiagnosisRecordClient(BaseClient):
     """진단 기록 관련 API를 호출하는 클라이언트 클래스"""
@@ -31,22 +40,28 @@ class DiagnosisRecordClient(BaseClient):
         """
         self._token = token
 
-    def get_patient_diagnosis_records(self, patient_id: int, start_date: datetime, end_date: datetime) -> ApiResponse:
-        """환자의 진단 기록 목록을 조회합니다.
+    def get_patient_diagnosis_records(
+        self, patient_id: int, start_date: datetime, end_date: datetime, limit: int = RECORD_PAGE_SIZE, cursor: Optional[str] = None
+    ) -> ApiResponse:
+        """환자의 진단 기록 목록을 한 페이지씩 조회합니다. (최신순)
 
         Args:
             patient_id: 환자 ID
             start_date: 조회 시작 날짜
             end_date: 조회 종료 날짜
+            limit: 페이지 크기
+            cursor: 이전 페이지의 next_cursor (첫 페이지는 None)
 
         Returns:
-            ApiResponse: API 응답 (성공 시 data=List[DiagnosisRecordListResponse])
+            ApiResponse: API 응답 (성공 시 data=DiagnosisRecordPage)
         """
         if not self._token:
             return ApiResponse(success=False, error="인증 토큰이 필요합니다")
 
         try:
-            params = {"patient_id": patient_id, "start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
+            params = {"patient_id": patient_id, "start_date": start_date.isoformat(), "end_date": end_date.isoformat(), "limit": limit}
+            if cursor:
+                params["cursor"] = cursor
             headers = {"Authorization": f"Bearer {self._token}"}
 
             response = self.session.get(f"{self.diagnosis_record_url}/list", params=params, headers=headers, timeout=self.timeout)
@@ -67,7 +82,8 @@ class DiagnosisRecordClient(BaseClient):
                     print(f"레코드 변환 오류: {str(e)}, 데이터: {record_data}")
                     # 오류가 있어도 계속 진행
 
-            return ApiResponse(success=True, data=records)
+            next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            return ApiResponse(success=True, data=DiagnosisRecordPage(records=records, next_cursor=next_cursor))
         except Exception as e:
             error_details = str(e)
             return ApiResponse(success=False, error=f"진단 기록 목록 조회 중 오류: {type(e).__name__}, {error_details}", details=error_details)
@@ -93,11 +109,14 @@ class DiagnosisRecordClient(BaseClient):
             error_details = str(e)
             return ApiResponse(success=False, error=f"진단 기록 메타데이터 조회 중 오류: {type(e).__name__}", details=error_details)
 
-    def download_diagnosis_file(self, diagnosis_id: int) -> Tuple[Optional[str], Optional[pd.DataFrame]]:
-        """특정 진단 기록의 CSV 파일을 다운로드합니다.
+    def download_diagnosis_file(self, diagnosis_id: int, file_format: str = FILE_FORMAT_PARQUET) -> Tuple[Optional[str], Optional[pd.DataFrame]]:
+        """특정 진단 기록의 전처리 파일을 다운로드합니다.
+
+        기본적으로 Parquet으로 받으며, Parquet이 없는 이전 기록은 CSV로 받습니다.
 
         Args:
             diagnosis_id: 진단 ID
+            file_format: 파일 형식 (parquet 또는 csv)
 
         Returns:
             Tuple[Optional[str], Optional[pd.DataFrame]]: (파일명, DataFrame) 튜플 또는 오류 시 (None, None)
@@ -110,10 +129,14 @@ class DiagnosisRecordClient(BaseClient):
 
             response = self.session.get(
                 f"{self.diagnosis_record_url}/{diagnosis_id}/file",
+                params={"format": file_format},
                 headers=headers,
                 stream=True,
                 timeout=None,  # 파일 다운로드는 시간이 오래 걸릴 수 있음
             )
+            if response.status_code == 404 and file_format == FILE_FORMAT_PARQUET:
+                response.close()
+                return self.download_diagnosis_file(diagnosis_id, FILE_FORMAT_CSV)
             response.raise_for_status()
 
             # 파일명 추출
@@ -122,9 +145,9 @@ class DiagnosisRecordClient(BaseClient):
             if "filename=" in content_disposition:
                 filename = content_disposition.split("filename=")[1].strip('"')
 
-            # CSV 파일을 DataFrame으로 변환
-            csv_content = response.content
-            df = pd.read_csv(io.BytesIO(csv_content))
+            # 파일을 DataFrame으로 변환
+            content = io.BytesIO(response.content)
+            df = pd.read_parquet(content) if file_format == FILE_FORMAT_PARQUET else pd.read_csv(content)
 
             return filename, df
         except Exception as e:
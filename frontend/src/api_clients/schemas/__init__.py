@@ -12,6 +12,7 @@ from .diagnosis_schema import (
     DiagnosisCreateResponse,
     DiagnosisLiveResponse,
     DiagnosisRecordListResponse,
+    DiagnosisRecordPage,
     DiagnosisRecordResponse,
 )
 from .patient_schema import PatientCreate, PatientResponse, PatientUpdate
@@ -1,5 +1,6 @@
 from datetime import datetime
 from enum import StrEnum, auto
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -57,6 +58,13 @@ class DiagnosisRecordListResponse(BaseModel):
     created_at: datetime = Field(..., description="진단 생성 시간")
 
 
+class DiagnosisRecordPage(BaseModel):
+    """진단 기록 목록 한 페이지"""
+
+    records: List[DiagnosisRecordListResponse] = Field(default_factory=list, description="진단 기록 목록 (최신순)")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 None)")
+
+
 class DiagnosisRecordResponse(BaseModel):
     """진단 기록 상세 응답"""
 
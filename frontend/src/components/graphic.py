@@ -71,7 +71,9 @@ def report(df: pd.DataFrame, file_name: str, content_type: str, fps: float) -> N
     st.caption("환자 데이터 파일")
     st.dataframe(df)
 
-    st.download_button("CSV 파일 다운로드", data=df.to_csv(index=False), file_name=file_name)
+    # 분석용 Parquet으로 받은 경우에도 CSV로 내보냄
+    csv_file_name = f"{os.path.splitext(file_name)[0]}.csv" if file_name else None
+    st.download_button("CSV 파일 다운로드", data=df.to_csv(index=False), file_name=csv_file_name)
 
     # st.markdown(print_clustering_result())
 
@@ -90,16 +90,20 @@ def render_diagnosis_record_list(patient_id: int, start_date: datetime, end_date
     record_client = get_diagnosis_record_client()
     record_client.set_token(st.session_state.access_token)
 
-    # 진단 기록 목록 조회
-    response = record_client.get_patient_diagnosis_records(patient_id, start_date, end_date)
-
-    if not response.success or not response.data:
-        st.info("조회된 진단 기록이 없습니다.")
-        if response.error:
-            st.error(f"오류: {response.error}")
-        return
-
-    records = response.data
+    # 진단 기록 목록 조회 (첫 페이지만 조회하고, 이후 페이지는 "더 보기"를 누를 때 조회)
+    query_key = (patient_id, start_date, end_date)
+    page_state = st.session_state.get("diagnosis_record_pages")
+    if page_state is None or page_state["query_key"] != query_key:
+        response = record_client.get_patient_diagnosis_records(patient_id, start_date, end_date)
+        if not response.success or not response.data.records:
+            st.info("조회된 진단 기록이 없습니다.")
+            if response.error:
+                st.error(f"오류: {response.error}")
+            return
+        page_state = {"query_key": query_key, "records": response.data.records, "next_cursor": response.data.next_cursor}
+        st.session_state.diagnosis_record_pages = page_state
+
+    records = page_state["records"]
 
     # 기록 목록 표시 및 선택 컴포넌트
     st.write("### 진단 데이터 목록")
@@ -116,6 +120,15 @@ def render_diagnosis_record_list(patient_id: int, start_date: datetime, end_date
     # 선택 컴포넌트
     selected_option = st.selectbox("진단 선택", options=options)
 
+    if page_state["next_cursor"] and st.button("이전 기록 더 보기"):
+        response = record_client.get_patient_diagnosis_records(patient_id, start_date, end_date, cursor=page_state["next_cursor"])
+        if response.success:
+            page_state["records"] = records + response.data.records
+            page_state["next_cursor"] = response.data.next_cursor
+            st.rerun()
+        else:
+            st.error(f"오류: {response.error}")
+
     if selected_option:
         selected_id = id_map[selected_option]
         # 선택된 기록의 상세 정보 표시